@@ -0,0 +1,193 @@
+"""Multi-instrument and walk-forward batch backtests.
+
+A batch spec (YAML) lists the instruments to run the configured strategy on
+and, optionally, rolling walk-forward windows::
+
+    instruments:
+      MES: {data: data/MES.csv}                  # tick specs from INSTRUMENT_SPECS
+      NQ:  {data: data/NQ.csv, tick_value: 5.0}  # or given explicitly
+      ES:
+        data: data/ES.csv
+        overrides: {risk.stop_loss_ticks: 8}     # per-instrument config overrides
+    walk_forward:
+      window: 50000   # bars per window
+      step: 25000     # defaults to `window` (non-overlapping)
+
+Each instrument's price data is loaded once in the parent and published with
+`core.shared_frame.SharedFrame`. Pool workers attach to the shared blocks in
+their initializer and run `BacktestEngine` on zero-copy views of each
+(instrument, window) slice, so no DataFrame is ever pickled per task. Every
+task runs with its instrument's `exec.symbol` / `tick_size` / `tick_value`.
+"""
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from app.sweep import SUMMARY_KEYS, apply_overrides
+from core.backtest_engine import BacktestEngine
+from core.data_loader import load_price_data
+from core.risk_engine import RiskEngine
+from core.shared_frame import SharedFrame
+from core.signal_cache import SignalCache
+from core.signal_engine import SignalEngine
+
+# CME contract specs: (tick_size, tick_value in USD)
+INSTRUMENT_SPECS = {
+    "ES": (0.25, 12.5),
+    "MES": (0.25, 1.25),
+    "NQ": (0.25, 5.0),
+    "MNQ": (0.25, 0.5),
+}
+
+# Per-process state populated by `_init_worker`
+_WORKER_CONFIG = None
+_WORKER_FRAMES: Dict[str, SharedFrame] = {}
+_WORKER_OPTIONS: Dict[str, Any] = {}
+
+
+def instrument_overrides(symbol: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Config overrides (dotted paths) that run the strategy on `symbol`."""
+    tick_size, tick_value = INSTRUMENT_SPECS.get(symbol.upper(), (None, None))
+    tick_size = entry.get("tick_size", tick_size)
+    tick_value = entry.get("tick_value", tick_value)
+    if tick_size is None or tick_value is None:
+        raise ValueError(f"Instrument '{symbol}' needs tick_size and tick_value (no built-in spec)")
+    overrides = {"exec.symbol": symbol, "exec.tick_size": float(tick_size), "exec.tick_value": float(tick_value)}
+    overrides.update(entry.get("overrides") or {})
+    return overrides
+
+
+def walk_forward_windows(n: int, window: Optional[int] = None, step: Optional[int] = None) -> List[Tuple[int, int]]:
+    """Return `(start, stop)` bar ranges of length `window` every `step` bars.
+
+    Without `window` the whole series is a single window. A trailing partial
+    window is dropped unless it is the only one.
+    """
+    if not window or window >= n:
+        return [(0, n)]
+    step = step or window
+    windows = [(start, start + window) for start in range(0, n - window + 1, step)]
+    return windows or [(0, n)]
+
+
+def _init_worker(config, specs, options):
+    global _WORKER_CONFIG, _WORKER_FRAMES, _WORKER_OPTIONS
+    _WORKER_CONFIG = config
+    _WORKER_OPTIONS = options
+    _WORKER_FRAMES = {symbol: SharedFrame.attach(spec) for symbol, spec in specs.items()}
+
+
+def _run_task(task: Dict[str, Any]) -> Dict[str, Any]:
+    cfg = apply_overrides(_WORKER_CONFIG, task["overrides"])
+    data = _WORKER_FRAMES[task["instrument"]].frame(task["start"], task["stop"])
+    with contextlib.redirect_stdout(io.StringIO()):
+        risk_engine = RiskEngine(cfg.risk)
+        signal_engine = SignalEngine(cfg.strategy)
+        backtester = BacktestEngine(cfg, signal_engine, risk_engine, None, signal_cache=_WORKER_OPTIONS.get("signal_cache"))
+        result = backtester.run(
+            data,
+            initial_balance=_WORKER_OPTIONS.get("initial_balance", 1000.0),
+            simulation=_WORKER_OPTIONS.get("simulation", "vectorized"),
+        )
+    row = {"instrument": task["instrument"], "window": task["window"], "start": task["start"], "stop": task["stop"]}
+    if "date" in data.columns and len(data):
+        row["start_date"] = data["date"].iloc[0]
+        row["end_date"] = data["date"].iloc[-1]
+    row.update({k: result[k] for k in SUMMARY_KEYS})
+    return row
+
+
+def summarize_batch(runs: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate per-window runs into one row per instrument."""
+    wins = runs["win_rate"].fillna(0) * runs["num_trades"]
+    grouped = runs.assign(_wins=wins).groupby("instrument", sort=True)
+    table = pd.DataFrame({
+        "windows": grouped.size(),
+        "num_trades": grouped["num_trades"].sum(),
+        "total_pnl": grouped["total_pnl"].sum(),
+        "mean_window_pnl": grouped["total_pnl"].mean(),
+        "worst_window_pnl": grouped["total_pnl"].min(),
+        "profitable_windows": grouped["total_pnl"].apply(lambda s: float((s > 0).mean())),
+    })
+    trades = table["num_trades"].where(table["num_trades"] > 0)
+    table["win_rate"] = grouped["_wins"].sum() / trades
+    table["avg_pnl"] = table["total_pnl"] / trades
+    return table
+
+
+def run_batch(config, spec: Dict[str, Any], data_source: Optional[str] = None, max_workers: Optional[int] = None,
+              initial_balance: float = 1000.0, simulation: str = "vectorized", signal_cache: bool = True) -> Dict[str, pd.DataFrame]:
+    """Run every (instrument, window) in `spec` in parallel.
+
+    Returns ``{"runs": one row per window, "by_instrument": aggregates,
+    "by_window": total_pnl pivoted window x instrument}``. `data_source` is
+    used for instruments whose entry has no `data` path.
+    """
+    instruments = spec.get("instruments") or {}
+    if not instruments:
+        raise ValueError("Batch spec needs at least one entry under `instruments`")
+    wf = spec.get("walk_forward") or {}
+
+    shared: Dict[str, SharedFrame] = {}
+    try:
+        tasks = []
+        for symbol, entry in instruments.items():
+            entry = entry or {}
+            overrides = instrument_overrides(symbol, entry)
+            apply_overrides(config, overrides)  # fail fast on bad paths before loading data
+            source = entry.get("data", data_source)
+            if not source:
+                raise ValueError(f"Instrument '{symbol}' has no `data` path")
+            shared[symbol] = SharedFrame.create(load_price_data(source))
+            windows = walk_forward_windows(len(shared[symbol]), wf.get("window"), wf.get("step"))
+            for w, (start, stop) in enumerate(windows):
+                tasks.append({"instrument": symbol, "window": w, "start": start, "stop": stop, "overrides": overrides})
+
+        max_workers = max_workers or os.cpu_count() or 1
+        total_mb = sum(frame.nbytes for frame in shared.values()) / 1e6
+        print(f"Running batch: {len(tasks)} runs over {len(shared)} instruments on {max_workers} workers "
+              f"({total_mb:.1f} MB shared)")
+        options = {"initial_balance": initial_balance, "simulation": simulation,
+                   "signal_cache": SignalCache() if signal_cache else None}
+        specs = {symbol: frame.spec for symbol, frame in shared.items()}
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(config, specs, options)) as pool:
+            rows = list(pool.map(_run_task, tasks))
+    finally:
+        for frame in shared.values():
+            frame.unlink()
+
+    runs = pd.DataFrame(rows)
+    return {
+        "runs": runs,
+        "by_instrument": summarize_batch(runs),
+        "by_window": runs.pivot(index="window", columns="instrument", values="total_pnl"),
+    }
+
+
+def save_batch(results: Dict[str, pd.DataFrame], strategy_name: str = "unknown") -> str:
+    """Write the batch tables under `results/` and return the run directory."""
+    from datetime import datetime
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    run_dir = f"results/batch_{strategy_name}_{timestamp}"
+    os.makedirs(run_dir, exist_ok=True)
+    results["runs"].to_csv(f"{run_dir}/runs.csv", index=False)
+    results["by_instrument"].to_csv(f"{run_dir}/by_instrument.csv")
+    results["by_window"].to_csv(f"{run_dir}/by_window.csv")
+    return run_dir
+
+
+def load_batch_spec(path: str) -> Dict[str, Any]:
+    """Load a batch spec (instruments + optional walk_forward) from a YAML file."""
+    import yaml
+
+    with open(path, "r") as f:
+        spec = yaml.safe_load(f) or {}
+    if not isinstance(spec, dict) or not isinstance(spec.get("instruments"), dict):
+        raise ValueError(f"Batch spec in {path} must have an `instruments` mapping")
+    return spec
@@ -0,0 +1,217 @@
+"""Monte Carlo / seed-ensemble backtests.
+
+Runs the configured strategy many times and reports the distribution of the
+results instead of a single number:
+
+- ``"seeds"``: the price data stays fixed and every run passes its own seed to
+  the strategy. Only strategies with ``RANDOM_SIGNALS`` vary with the seed;
+  for the others (and the fallback signals) every run would repeat the same
+  backtest, so `run_ensemble` warns and runs a ``"bootstrap"`` ensemble
+  instead (``"random_walk"`` without price data).
+- ``"bootstrap"``: every run gets a moving-block bootstrap resample of the
+  price data (`core.monte_carlo.bootstrap_paths`).
+- ``"random_walk"``: every run gets a synthetic random-walk path, the data
+  `BacktestEngine.run` falls back to without data.
+
+Runs are processed in batches of `batch_size`. Each batch draws from its own
+`numpy.random.Generator`, spawned from one `SeedSequence(seed)`, so batches
+are independent of each other and of the worker that runs them, and results
+only depend on ``(seed, runs, batch_size)``. A batch generates all its paths
+in one call, runs the strategy per path and simulates every path together
+with `core.monte_carlo.simulate_paths`. With `max_workers` > 1 the batches are
+spread over a `ProcessPoolExecutor`.
+
+The simulation is the single-position engine with exact fills (``fill``
+settings are rejected), matching ``--simulation vectorized`` run for run.
+"""
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.backtest_engine import trade_params
+from core.bars import build_views
+from core.data_loader import load_price_data
+from core.fill_model import FillModel
+from core.instrumentation import METRICS
+from core.monte_carlo import (RESULT_KEYS, bootstrap_paths, path_frame, price_arrays, random_walk_paths,
+                              simulate_paths, stack_signals)
+from core.risk_engine import RiskEngine
+from core.signal_engine import SignalEngine
+from strategies.registry import get_strategy
+
+ENSEMBLE_KINDS = ("seeds", "bootstrap", "random_walk")
+
+DISTRIBUTION_KEYS = ("total_pnl", "win_rate", "max_drawdown", "max_drawdown_pct", "num_trades", "ending_balance")
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Bars per synthetic path when there is no price data (same as `BacktestEngine.run`)
+DEFAULT_RANDOM_WALK_BARS = 10000
+
+# Per-process state populated by `_init_worker`
+_WORKER_CONFIG = None
+_WORKER_DATA = None
+_WORKER_OPTIONS: Dict[str, Any] = {}
+
+
+def _init_worker(config, data, options):
+    global _WORKER_CONFIG, _WORKER_DATA, _WORKER_OPTIONS
+    _WORKER_CONFIG = config
+    _WORKER_DATA = data
+    _WORKER_OPTIONS = options
+
+
+def _views(frame: pd.DataFrame) -> Optional[dict]:
+    """``data.timeframes`` views of one path (None when none are configured or it has no timestamps)."""
+    data_cfg = _WORKER_CONFIG.data
+    if not data_cfg.timeframes or not ("date" in frame.columns or "timestamp" in frame.columns):
+        return None
+    return build_views(frame, data_cfg.timeframes, base_timeframe=data_cfg.base_timeframe)
+
+
+def _signals(signal_engine, frame: pd.DataFrame, system, seed: Optional[int] = None,
+             timeframes: Optional[dict] = None):
+    """Signals of one path, called as `BacktestEngine.run(frame, seed=seed)` calls the configured strategy."""
+    if timeframes:
+        return signal_engine.generate_signals(frame, system=system, seed=seed, timeframes=timeframes)
+    return signal_engine.generate_signals(frame, system=system, seed=seed)
+
+
+def _run_batch(task) -> pd.DataFrame:
+    first_run, size, seed_seq = task
+    config = _WORKER_CONFIG
+    options = _WORKER_OPTIONS
+    kind = options["kind"]
+    rng = np.random.default_rng(seed_seq)
+    run_seeds = [int(s) for s in seed_seq.generate_state(size, np.uint64) >> np.uint64(1)]
+    # Engines announce themselves on construction; keep worker output quiet.
+    with contextlib.redirect_stdout(io.StringIO()):
+        risk_engine = RiskEngine(_WORKER_CONFIG.risk)
+        signal_engine = SignalEngine(_WORKER_CONFIG.strategy)
+
+    data = _WORKER_DATA
+    dates = None
+    if kind == "seeds":
+        frame = data if data is not None else path_frame(random_walk_paths(np.random.default_rng(42), 1, DEFAULT_RANDOM_WALK_BARS), 0)
+        prices = price_arrays(frame)
+        views = _views(frame)
+        frames = (_signals(signal_engine, frame, config, s, views) for s in run_seeds)
+    else:
+        if kind == "bootstrap":
+            paths = bootstrap_paths(rng, data, size, options["block"])
+            if "date" in data.columns:
+                dates = data["date"].to_numpy()  # resampled paths keep the original timestamps
+        else:
+            paths = random_walk_paths(rng, size, options["bars"])
+        prices = {col: paths[col] for col in ("close", "high", "low")}
+
+        def path_signals():
+            for p, s in enumerate(run_seeds):
+                frame = path_frame(paths, p, dates)
+                yield _signals(signal_engine, frame, config, s, _views(frame))
+
+        frames = path_signals()
+
+    n_bars = prices["close"].shape[-1]
+    with METRICS.timer("ensemble.signals"):
+        signals = stack_signals(frames, n_bars)
+    with METRICS.timer("ensemble.simulate"):
+        results = simulate_paths(prices, signals, risk_engine, trade_params(_WORKER_CONFIG), options["initial_balance"])
+    METRICS.count("ensemble.runs", size)
+    table = pd.DataFrame({"run": np.arange(first_run, first_run + size), "seed": run_seeds})
+    for key in RESULT_KEYS:
+        table[key] = results[key]
+    return table
+
+
+def random_signals(config) -> bool:
+    """Whether the configured strategy's signals depend on the seed (``RANDOM_SIGNALS``)."""
+    name = getattr(config.strategy, "name", None)
+    if not name:
+        return False
+    try:
+        return get_strategy(name).random_signals
+    except ModuleNotFoundError:
+        return False  # the engine falls back to its deterministic signals
+
+
+def summarize_ensemble(runs: pd.DataFrame) -> pd.DataFrame:
+    """Distribution of each `DISTRIBUTION_KEYS` metric over the runs: mean, std, min, quantiles, max."""
+    values = runs[list(DISTRIBUTION_KEYS)].astype("float64")
+    table = pd.DataFrame({"mean": values.mean(), "std": values.std(), "min": values.min()})
+    for q in QUANTILES:
+        table[f"p{round(q * 100)}"] = values.quantile(q)
+    table["max"] = values.max()
+    table.index.name = "metric"
+    return table
+
+
+def run_ensemble(config, runs: int, kind: str = "seeds", data_source: Optional[str] = None,
+                 data: Optional[pd.DataFrame] = None, seed: Optional[int] = None, initial_balance: float = 1000.0,
+                 batch_size: int = 256, max_workers: Optional[int] = 1, block: int = 100,
+                 bars: int = DEFAULT_RANDOM_WALK_BARS) -> Dict[str, Any]:
+    """Run `runs` backtests of the configured strategy as an ensemble of `kind` (see `ENSEMBLE_KINDS`).
+
+    Returns ``{"runs": one row per run, "distribution": summarize_ensemble(runs),
+    "loss_probability": share of runs with total_pnl < 0, "kind": the kind that
+    ran}``. `block` is the bootstrap block length in bars, `bars` the
+    random-walk path length. A ``"seeds"`` ensemble of a strategy without
+    random signals runs as ``"bootstrap"`` (``"random_walk"`` without data).
+    """
+    if kind not in ENSEMBLE_KINDS:
+        raise ValueError(f"Unknown ensemble kind '{kind}', expected one of {ENSEMBLE_KINDS}")
+    if runs < 1:
+        raise ValueError("An ensemble needs at least one run")
+    if data is None and data_source:
+        data = load_price_data(data_source)
+    if data is not None:
+        data = data.reset_index(drop=True)
+    if kind == "seeds" and not random_signals(config):
+        fallback = "bootstrap" if data is not None else "random_walk"
+        print(f"Warning: strategy '{getattr(config.strategy, 'name', None) or 'fallback'}' has no random signals, "
+              f"so every seed would repeat the same backtest; running a {fallback} ensemble instead")
+        kind = fallback
+    if kind == "bootstrap" and data is None:
+        raise ValueError("Bootstrap ensembles need price data")
+    if not FillModel.from_config(config).is_exact(data if data is not None and kind != "random_walk" else pd.DataFrame()):
+        raise ValueError("Ensembles simulate exact fills; remove the `fill` settings (and ask columns) to run one")
+
+    batch_size = max(1, int(batch_size))
+    starts = range(0, runs, batch_size)
+    children = np.random.SeedSequence(seed).spawn(len(starts))
+    tasks = [(start, min(batch_size, runs - start), child) for start, child in zip(starts, children)]
+    options = {"kind": kind, "initial_balance": initial_balance, "block": block, "bars": bars}
+
+    max_workers = max_workers or os.cpu_count() or 1
+    print(f"Running {kind} ensemble: {runs} runs in {len(tasks)} batches on {max_workers} workers")
+    if max_workers == 1 or len(tasks) == 1:
+        _init_worker(config, data, options)
+        tables = [_run_batch(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(config, data, options)) as pool:
+            tables = list(pool.map(_run_batch, tasks))
+
+    table = pd.concat(tables, ignore_index=True)
+    return {
+        "runs": table,
+        "distribution": summarize_ensemble(table),
+        "loss_probability": float((table["total_pnl"] < 0).mean()),
+        "kind": kind,
+    }
+
+
+def save_ensemble(results: Dict[str, Any], strategy_name: str = "unknown") -> str:
+    """Write the per-run and distribution tables under `results/` and return the run directory."""
+    from datetime import datetime
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    run_dir = f"results/ensemble_{strategy_name}_{timestamp}"
+    os.makedirs(run_dir, exist_ok=True)
+    results["runs"].to_csv(f"{run_dir}/runs.csv", index=False)
+    results["distribution"].to_csv(f"{run_dir}/distribution.csv")
+    return run_dir
@@ -0,0 +1,122 @@
+"""Backtest report artifacts: trades table, stats, equity curves and charts.
+
+Reporting is a separate stage from the backtest itself. `write_report` saves
+``trades.csv`` and ``stats.txt`` and, unless `plot=False`, renders the equity
+charts. The equity curve is the result ledger's own
+`core.trade_ledger.TradeLedger.equity` and exit dates are looked up by
+indexing the already loaded price frame with the `exit_idx` array, so nothing
+is re-read or iterated row by row.
+
+matplotlib is imported only when a chart is rendered, and only through the
+object-oriented Figure / Agg canvas API (no pyplot global state), so charts can
+be drawn on the `ReportWriter` background thread while the caller moves on.
+"""
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from core.trade_ledger import TradeLedger
+
+STATS_KEYS = ("num_trades", "total_pnl", "win_rate", "avg_pnl", "max_drawdown", "max_drawdown_pct", "exposure",
+              "ending_balance", "trades_per_day", "trades_per_week")
+
+
+def exit_dates(trades_df: pd.DataFrame, data: Optional[pd.DataFrame]) -> Optional[pd.DatetimeIndex]:
+    """Exit timestamp of every trade, or None when `data` has no usable `date` column."""
+    if data is None or "date" not in data.columns or trades_df.empty or "exit_idx" not in trades_df.columns:
+        return None
+    exit_idx = trades_df["exit_idx"].to_numpy(dtype="int64")
+    if exit_idx.max() >= len(data):
+        return None
+    return pd.DatetimeIndex(pd.to_datetime(data["date"].to_numpy()[exit_idx]))
+
+
+def _config_dict(config):
+    if hasattr(config, "model_dump"):
+        return config.model_dump()
+    return config
+
+
+def _save_chart(path: str, x, y, label: str, title: str, xlabel: str):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 5))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.plot(x, y, label=label)
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel("Equity")
+    ax.legend()
+    if xlabel == "Date":
+        fig.autofmt_xdate()
+    fig.savefig(path)
+
+
+def render_equity_charts(run_dir: str, equity: np.ndarray, dates: Optional[pd.DatetimeIndex] = None) -> list:
+    """Draw the equity curve by trade number (and by exit date if known); return the paths."""
+    paths = []
+    path = f"{run_dir}/equity_curve_by_trade.png"
+    _save_chart(path, np.arange(len(equity)), equity, "Equity Curve (by trade #)", "Backtest Equity Curve (by trade #)", "Trade #")
+    paths.append(path)
+    if dates is not None:
+        path = f"{run_dir}/equity_curve_by_time.png"
+        _save_chart(path, dates, equity[1:], "Equity Curve (by exit date)", "Backtest Equity Curve (by exit date)", "Date")
+        paths.append(path)
+    return paths
+
+
+def write_report(result: dict, run_dir: str, config=None, data: Optional[pd.DataFrame] = None,
+                 initial_balance: Optional[float] = None, plot: bool = True, timestamp: Optional[str] = None) -> dict:
+    """Write the artifacts for one backtest `result` into `run_dir`; return their paths."""
+    import yaml
+
+    os.makedirs(run_dir, exist_ok=True)
+    if initial_balance is None:
+        initial_balance = result.get("initial_balance", 1000.0)
+    trades = result.get("ledger", result["trades"])
+    if not isinstance(trades, TradeLedger):
+        trades = TradeLedger.from_records(trades)  # e.g. a plain list of trade dicts
+    trades_df = trades.to_frame()
+    paths = {}
+
+    paths["trades"] = f"{run_dir}/trades.csv"
+    trades_df.to_csv(paths["trades"], index=False)
+
+    stats = {k: result.get(k) for k in STATS_KEYS}
+    stats["timestamp"] = timestamp
+    paths["stats"] = f"{run_dir}/stats.txt"
+    with open(paths["stats"], "w") as f:
+        for k, v in stats.items():
+            f.write(f"{k}: {v}\n")
+        if config is not None:
+            f.write("\nConfig details:\n")
+            yaml.safe_dump(_config_dict(config), f, default_flow_style=False)
+
+    if plot:
+        paths["charts"] = render_equity_charts(run_dir, trades.equity(initial_balance), exit_dates(trades_df, data))
+    return paths
+
+
+class ReportWriter:
+    """Runs `write_report` on a single background thread.
+
+    `submit` returns a Future right away; `close` waits for pending reports.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, *args, **kwargs) -> Future:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report")
+        return self._executor.submit(write_report, *args, **kwargs)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
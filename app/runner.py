@@ -2,10 +2,12 @@ from core.risk_engine import RiskEngine
 from core.signal_engine import SignalEngine
 from core.execution_engine import ExecutionEngine
 from core.backtest_engine import BacktestEngine
-from core.data_loader import load_price_data
+from core.data_loader import load_price_data, iter_price_chunks, time_window
+from core.signal_cache import SignalCache
+from app.reporting import ReportWriter
 
 class TradingSystemRunner:
-    def __init__(self, config):
+    def __init__(self, config, signal_cache=True):
         print("\n++ Initializing Trading System ++")
         self.config = config
         self.risk_engine = RiskEngine(config.risk)
@@ -17,96 +19,114 @@ class TradingSystemRunner:
         # strategy module or downstream code.
         self.signal_engine = SignalEngine(config.strategy)
         self.execution_engine = ExecutionEngine(config.exec)
-        self.backtester = BacktestEngine(config, self.signal_engine, self.risk_engine, self.execution_engine)
+        self.backtester = BacktestEngine(config, self.signal_engine, self.risk_engine, self.execution_engine,
+                                         signal_cache=SignalCache() if signal_cache else None)
+        self.reporter = ReportWriter()
+        self.report_future = None
 
-    def run_backtest(self, data_source=None):
-        import os
-        import pandas as pd
-        import matplotlib.pyplot as plt
-        from datetime import datetime
+    def run_backtest(self, data_source=None, chunk_size=None, report=True, plot=True, initial_balance=1000.0,
+                     simulation="vectorized", start=None, end=None):
+        """Run the configured backtest and hand the result to the report stage.
+
+        `start` / `end` restrict the run to the bars with ``start <= time < end``;
+        a `core.price_store.PriceStore` source only reads that window.
+
+        Reports (trades.csv, stats.txt and, if `plot`, equity charts) are
+        written to ``results/<strategy>_<timestamp>/`` by a background
+        `ReportWriter`; call `close()` to wait for them.
+        """
         print("\n++ Running Backtest ++")
-        data = load_price_data(data_source)
-        result = self.backtester.run(data)
-        print(f"\n✅ Backtest complete:\n{result}")
-
-        # Assume results directory already exists
-
-        # Save results in a unique subfolder per run
-
-        strategy_name = getattr(self.config.strategy, 'name', 'unknown')
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        run_dir = f"results/{strategy_name}_{timestamp}"
-        os.makedirs(run_dir, exist_ok=True)
-
-        # Save trades to CSV
-        trades_df = pd.DataFrame(result['trades'])
-        csv_path = f"{run_dir}/trades.csv"
-        trades_df.to_csv(csv_path, index=False)
-        print(f"Trades saved to {csv_path}")
-
-        # Save summary stats and config details to a text file
-        stats = {
-            'num_trades': result.get('num_trades'),
-            'total_pnl': result.get('total_pnl'),
-            'win_rate': result.get('win_rate'),
-            'avg_pnl': result.get('avg_pnl'),
-            'ending_balance': result.get('ending_balance'),
-            'trades_per_day': result.get('trades_per_day'),
-            'trades_per_week': result.get('trades_per_week'),
-            'timestamp': timestamp
-        }
-        stats_path = f"{run_dir}/stats.txt"
-        with open(stats_path, 'w') as f:
-            for k, v in stats.items():
-                f.write(f"{k}: {v}\n")
-            f.write("\nConfig details:\n")
-            import yaml
-            yaml.dump(self.config, f, default_flow_style=False)
-        print(f"Stats and config saved to {stats_path}")
-
-        # Plot both equity curves: by trade number and by exit date (if available)
-        import pandas as pd
-        initial_balance = self.backtester.run.__defaults__[2]
-        # By trade number
-        equity_trade = [initial_balance]
-        for t in result['trades']:
-            equity_trade.append(equity_trade[-1] + t['pnl'])
-        plt.figure(figsize=(10, 5))
-        plt.plot(equity_trade, label='Equity Curve (by trade #)')
-        plt.title('Backtest Equity Curve (by trade #)')
-        plt.xlabel('Trade #')
-        plt.ylabel('Equity')
-        plt.legend()
-        chart_path_trade = f"{run_dir}/equity_curve_by_trade.png"
-        plt.savefig(chart_path_trade)
-        plt.close()
-        print(f"Equity curve (by trade #) saved to {chart_path_trade}")
-
-        # By exit date (if possible)
-        equity_time = [initial_balance]
-        dates = []
-        if not trades_df.empty and 'exit_idx' in trades_df.columns and 'pnl' in trades_df.columns:
-            data_for_dates = load_price_data(data_source)
-            if 'date' in data_for_dates.columns:
-                for _, t in trades_df.iterrows():
-                    idx = int(t['exit_idx'])
-                    dates.append(data_for_dates.loc[idx, 'date'])
-                    equity_time.append(equity_time[-1] + t['pnl'])
-                equity_time = equity_time[1:]
-                dates = pd.to_datetime(dates)
-                plt.figure(figsize=(10, 5))
-                plt.plot(dates, equity_time, label='Equity Curve (by exit date)')
-                plt.title('Backtest Equity Curve (by exit date)')
-                plt.xlabel('Date')
-                plt.ylabel('Equity')
-                plt.legend()
-                chart_path_time = f"{run_dir}/equity_curve_by_time.png"
-                plt.savefig(chart_path_time)
-                plt.close()
-                print(f"Equity curve (by exit date) saved to {chart_path_time}")
+        if chunk_size and data_source:
+            if simulation != "vectorized":
+                raise ValueError("Chunked backtests only support the single-position 'vectorized' simulation")
+            # Stream the file in bounded blocks; the full frame is never loaded
+            data = None
+            result = self.backtester.run_chunked(iter_price_chunks(data_source, chunk_size, start=start, end=end),
+                                                 initial_balance=initial_balance)
+        else:
+            data = load_price_data(data_source, start=start, end=end)
+            # Cached views belong to the whole source, not to a window of it
+            windowed = start is not None or end is not None
+            result = self.backtester.run(data, initial_balance=initial_balance, simulation=simulation,
+                                         timeframes=self._timeframe_views(data, None if windowed else data_source))
+        summary = {k: v for k, v in result.items() if k not in ('trades', 'ledger')}
+        print(f"\n✅ Backtest complete:\n{summary}")
+
+        if report:
+            from datetime import datetime
 
+            strategy_name = getattr(self.config.strategy, 'name', 'unknown')
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            run_dir = f"results/{strategy_name}_{timestamp}"
+            self.report_future = self.reporter.submit(result, run_dir, config=self.config, data=data,
+                                                      plot=plot, timestamp=timestamp)
+            self.report_future.add_done_callback(self._report_done)
         return result
 
-    def run_live(self):
-        raise NotImplementedError("Live trading integration not implemented yet.")
+    def _timeframe_views(self, data, data_source):
+        """Higher-timeframe views of `data` for ``data.timeframes``, cached alongside the source file."""
+        data_cfg = getattr(self.config, "data", None)
+        if not getattr(data_cfg, "timeframes", None):
+            return None
+        from core.bars import build_views
+
+        return build_views(data, data_cfg.timeframes, source=data_source, base_timeframe=data_cfg.base_timeframe)
+
+    @staticmethod
+    def _report_done(future):
+        try:
+            paths = future.result()
+        except Exception as e:
+            print(f"Report generation failed: {e}")
+            return
+        print(f"Trades saved to {paths['trades']}")
+        print(f"Stats and config saved to {paths['stats']}")
+        for chart in paths.get('charts', []):
+            print(f"Equity curve saved to {chart}")
+
+    def close(self):
+        """Wait for pending reports."""
+        self.reporter.close()
+
+    def run_live(self, data_source=None, speed=None, start=None, end=None):
+        """Run the event-driven live loop.
+
+        Live mode is replay-only: there is no broker market data feed, so
+        `data_source` (a price file) is required and is replayed bar by bar
+        through the strategy's `on_live_tick`, with orders routed to a
+        simulated ExecutionEngine. With `start` the replay begins there, and
+        the strategy is first warmed up on the bars before it (its declared
+        ``LOOKBACK``, see `BacktestEngine.lookback`).
+        """
+        import asyncio
+        from core.live_engine import LiveEngine, ReplayFeed
+
+        if data_source is None:
+            raise ValueError("Live mode only replays a price file (there is no broker market data feed yet); "
+                             "pass `data_source`")
+        module = self.signal_engine.strategy_module
+        if module is None or not callable(getattr(module, "on_live_tick", None)):
+            raise ValueError("Live mode needs a strategy module that implements `on_live_tick`.")
+
+        feed, warmup = ReplayFeed(data_source, speed=speed), None
+        if start is not None or end is not None:
+            data = load_price_data(data_source)
+            first = len(time_window(data, None, start)) if start is not None else 0
+            last = len(time_window(data, None, end)) if end is not None else len(data)
+            warmup = data.iloc[max(0, first - self.backtester.lookback()):first]
+            feed = ReplayFeed(speed=speed, data=data.iloc[first:max(first, last)])
+
+        print("\n++ Running Live (replay) ++")
+        engine = LiveEngine(
+            self.config,
+            module,
+            self.risk_engine,
+            ExecutionEngine(mode='backtest'),
+            feed,
+            strategy_kwargs=self.signal_engine.strategy_kwargs(module.on_live_tick),
+            warmup=warmup,
+        )
+        stats = asyncio.run(engine.run())
+        print(f"\n✅ Live replay complete:\n{stats}")
+        return stats
 
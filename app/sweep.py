@@ -0,0 +1,174 @@
+"""Parameter sweep / grid search over `SystemConfig` overrides.
+
+A grid maps dotted config paths to lists of candidate values, e.g.::
+
+    risk.stop_loss_ticks: [4, 5, 6]
+    risk.risk_to_reward: [2, 3]
+    strategy.params.rsi_entry: [30, 40]
+
+Every combination is backtested in a `ProcessPoolExecutor`. Each worker loads
+the price data once (in the pool initializer) and reuses it for all the
+combinations it receives; no plotting or file output happens per combination.
+With `signal_cache` (default) strategy signals go through
+`core.signal_cache.SignalCache`, so combinations that only change risk /
+execution settings reuse one signal run. The caller gets back one results
+table ranked by `rank_by`.
+"""
+import contextlib
+import copy
+import io
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from core.backtest_engine import BacktestEngine
+from core.bars import build_views
+from core.data_loader import load_price_data
+from core.risk_engine import RiskEngine
+from core.signal_cache import SignalCache
+from core.signal_engine import SignalEngine
+from strategies.registry import get_strategy
+
+SUMMARY_KEYS = ("num_trades", "total_pnl", "win_rate", "avg_pnl", "ending_balance")
+
+# Per-process state populated by `_init_worker`
+_WORKER_CONFIG = None
+_WORKER_DATA = None
+_WORKER_VIEWS = None
+_WORKER_OPTIONS: Dict[str, Any] = {}
+
+
+def expand_grid(grid: Dict[str, Iterable[Any]]) -> List[Dict[str, Any]]:
+    """Return the cartesian product of `grid` as a list of override dicts."""
+    keys = list(grid)
+    values = [list(v) if isinstance(v, (list, tuple)) else [v] for v in grid.values()]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+def apply_overrides(config, overrides: Dict[str, Any]):
+    """Return a deep copy of `config` with dotted-path `overrides` applied.
+
+    Path segments address model attributes or mapping keys, so both
+    `risk.stop_loss_ticks` and `strategy.params.rsi_entry` work.
+    """
+    cfg = copy.deepcopy(config)
+    for path, value in overrides.items():
+        *parents, leaf = path.split(".")
+        target = cfg
+        for part in parents:
+            if isinstance(target, dict):
+                target = target.setdefault(part, {})
+            else:
+                child = getattr(target, part)
+                if child is None:
+                    child = {}
+                    setattr(target, part, child)
+                target = child
+        if isinstance(target, dict):
+            target[leaf] = value
+        elif hasattr(target, leaf):
+            setattr(target, leaf, value)
+        else:
+            raise KeyError(f"Unknown config path '{path}'")
+    return cfg
+
+
+def untunable_params(config, grid: Dict[str, Iterable[Any]]) -> Dict[str, List[str]]:
+    """``strategy.params.*`` keys of `grid` that the swept strategies don't declare as tunable, by strategy."""
+    names = grid.get("strategy.name", [getattr(config.strategy, "name", None)])
+    names = names if isinstance(names, (list, tuple)) else [names]
+    params = [path.split(".", 2)[2] for path in grid if path.startswith("strategy.params.")]
+    unused = {}
+    for name in names:
+        try:
+            handle = get_strategy(name) if name else None
+        except ModuleNotFoundError:
+            continue
+        missing = [p for p in params if handle is None or p not in handle.params]
+        if missing:
+            unused[name or "fallback"] = missing
+    return unused
+
+
+def _init_worker(config, data_source, options):
+    global _WORKER_CONFIG, _WORKER_DATA, _WORKER_VIEWS, _WORKER_OPTIONS
+    _WORKER_CONFIG = config
+    _WORKER_OPTIONS = options
+    with contextlib.redirect_stdout(io.StringIO()):
+        _WORKER_DATA = load_price_data(data_source)
+    # Higher-timeframe views are built (or loaded from the price cache) once per worker
+    if config.data.timeframes:
+        _WORKER_VIEWS = build_views(_WORKER_DATA, config.data.timeframes, source=data_source,
+                                    base_timeframe=config.data.base_timeframe)
+
+
+def _run_combination(overrides: Dict[str, Any]) -> Dict[str, Any]:
+    cfg = apply_overrides(_WORKER_CONFIG, overrides)
+    # Engines announce themselves on construction; keep worker output quiet.
+    with contextlib.redirect_stdout(io.StringIO()):
+        risk_engine = RiskEngine(cfg.risk)
+        signal_engine = SignalEngine(cfg.strategy)
+        backtester = BacktestEngine(cfg, signal_engine, risk_engine, None, signal_cache=_WORKER_OPTIONS.get("signal_cache"))
+        result = backtester.run(
+            _WORKER_DATA,
+            initial_balance=_WORKER_OPTIONS.get("initial_balance", 1000.0),
+            simulation=_WORKER_OPTIONS.get("simulation", "vectorized"),
+            timeframes=_WORKER_VIEWS if cfg.data == _WORKER_CONFIG.data else None,
+        )
+    row = dict(overrides)
+    row.update({k: result[k] for k in SUMMARY_KEYS})
+    return row
+
+
+def run_sweep(config, grid: Dict[str, Iterable[Any]], data_source: Optional[str] = None, max_workers: Optional[int] = None,
+              rank_by: str = "total_pnl", ascending: bool = False, initial_balance: float = 1000.0,
+              simulation: str = "vectorized", chunksize: Optional[int] = None, signal_cache: bool = True) -> pd.DataFrame:
+    """Backtest every combination in `grid` in parallel and return a ranked table."""
+    combos = expand_grid(grid)
+    if not combos:
+        return pd.DataFrame(columns=list(grid) + list(SUMMARY_KEYS))
+    apply_overrides(config, combos[0])  # fail fast on bad paths before starting workers
+    for name, params in untunable_params(config, grid).items():
+        print(f"Warning: strategy '{name}' has no tunable {params}; combinations differing only there repeat its signals")
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(combos) // (max_workers * 4))
+    options = {"initial_balance": initial_balance, "simulation": simulation,
+               "signal_cache": SignalCache() if signal_cache else None}
+
+    print(f"Running sweep: {len(combos)} combinations on {max_workers} workers")
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(config, data_source, options)) as pool:
+        rows = list(pool.map(_run_combination, combos, chunksize=chunksize))
+
+    table = pd.DataFrame(rows)
+    table = table.sort_values(rank_by, ascending=ascending, kind="mergesort").reset_index(drop=True)
+    table.index.name = "rank"
+    return table
+
+
+def save_sweep(table: pd.DataFrame, strategy_name: str = "unknown") -> str:
+    """Write the ranked sweep table under `results/` and return its path."""
+    from datetime import datetime
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    run_dir = f"results/sweep_{strategy_name}_{timestamp}"
+    os.makedirs(run_dir, exist_ok=True)
+    csv_path = f"{run_dir}/results.csv"
+    table.to_csv(csv_path)
+    return csv_path
+
+
+def load_grid(path: str) -> Dict[str, List[Any]]:
+    """Load a sweep grid (dotted path -> list of values) from a YAML file."""
+    import yaml
+
+    with open(path, "r") as f:
+        grid = yaml.safe_load(f) or {}
+    if not isinstance(grid, dict):
+        raise ValueError(f"Sweep grid in {path} must be a mapping of config paths to value lists")
+    return grid
@@ -0,0 +1,94 @@
+"""Peak memory of one backtest run, per strategy.
+
+Every measurement runs in a fresh interpreter: it builds the synthetic OHLCV
+frame (`benchmarks.synthetic`), resets the kernel's peak-RSS counter
+(``/proc/self/clear_refs``) and runs `BacktestEngine.run` on the frame. The
+reported overhead is the run's peak RSS above the RSS with the frame loaded,
+also as a multiple of the frame's own size::
+
+    python -m benchmarks.bench_memory
+    python -m benchmarks.bench_memory --bars 10000000 --strategy rsi_reversal
+    python -m benchmarks.bench_memory --repo /path/to/other/checkout   # same run on another revision
+
+Linux only (reads /proc/self/status).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = r"""
+import contextlib, gc, io, json, sys, time
+opts = json.loads(sys.argv[1])
+
+def status(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) * 1024
+    raise RuntimeError(field + " not in /proc/self/status")
+
+from benchmarks.synthetic import generate_ohlcv
+from config.loader import load_config
+from core.backtest_engine import BacktestEngine
+from core.risk_engine import RiskEngine
+from core.signal_engine import SignalEngine
+
+config = load_config("config/settings.yaml")
+data = generate_ohlcv(opts["bars"], seed=opts["seed"], with_dates=True)
+with contextlib.redirect_stdout(io.StringIO()):
+    engine = BacktestEngine(config, SignalEngine(config.strategy), RiskEngine(config.risk), None)
+    engine.run(data.iloc[:1000], strategy=opts["strategy"], seed=opts["seed"])  # imports, lazy setup
+gc.collect()
+with open("/proc/self/clear_refs", "w") as f:
+    f.write("5")
+base = status("VmRSS")
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    result = engine.run(data, strategy=opts["strategy"], seed=opts["seed"], simulation=opts["simulation"])
+seconds = time.perf_counter() - start
+print(json.dumps({"base": base, "peak": status("VmHWM"), "frame": int(data.memory_usage(deep=True).sum()),
+                  "seconds": seconds, "num_trades": result["num_trades"]}))
+"""
+
+
+def measure(repo: str, strategy: str, bars: int, seed: int, simulation: str) -> dict:
+    """Run one backtest in a fresh interpreter inside `repo` and return its memory figures."""
+    opts = json.dumps({"strategy": strategy, "bars": bars, "seed": seed, "simulation": simulation})
+    env = dict(os.environ, PYTHONPATH=repo)
+    proc = subprocess.run([sys.executable, "-c", _CHILD, opts], cwd=repo, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{strategy} run failed:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bars", type=int, default=2_000_000)
+    parser.add_argument("--strategy", action="append", help="strategy to run (repeatable; default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--simulation", default="vectorized")
+    parser.add_argument("--repo", default=ROOT, help="checkout to import the engine from (default: this one)")
+    args = parser.parse_args(argv)
+
+    if args.strategy:
+        strategies = args.strategy
+    else:
+        sys.path.insert(0, args.repo)
+        from strategies.registry import available
+
+        strategies = available()
+
+    print(f"{args.bars:,} bars, {args.simulation} simulation, engine from {os.path.abspath(args.repo)}")
+    for name in strategies:
+        r = measure(args.repo, name, args.bars, args.seed, args.simulation)
+        extra = r["peak"] - r["base"]
+        print(f"  {name:<16} frame {r['frame'] / 2**20:7.1f} MiB  peak +{extra / 2**20:7.1f} MiB "
+              f"({extra / r['frame']:.2f}x frame)  {r['seconds']:.2f} s  {r['num_trades']} trades")
+
+
+if __name__ == "__main__":
+    main()
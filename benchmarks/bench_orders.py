@@ -0,0 +1,71 @@
+"""Order submission against the local mock broker.
+
+Starts `core.mock_tradovate.MockTradovateServer` with a simulated network
+latency, queues a burst of bracket orders through `OrderManager` and flushes
+them, once with coalescing and once sending every order on its own. Reports
+wall time, broker requests per endpoint, the broker's service times and the
+final local order states, and checks every order ended up working with both
+bracket legs at the mock::
+
+    python -m benchmarks.bench_orders
+    python -m benchmarks.bench_orders --orders 200 --levels 5 --latency 0.02
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from core.execution_engine import ExecutionEngine
+from core.mock_tradovate import MockTradovateServer
+from core.order_manager import OrderManager
+
+
+def burst(n: int, levels: int, symbol: str = "MESZ5"):
+    """`n` one-lot bracket buys spread over `levels` distinct entry / exit levels."""
+    for i in range(n):
+        entry = 5000.0 + (i % levels) * 0.25
+        yield {"symbol": symbol, "action": "Buy", "quantity": 1, "orderType": "Market",
+               "sl": entry - 1.25, "tp": entry + 3.75}
+
+
+def run(n: int, levels: int, latency: float, coalesce: bool, workers: int) -> dict:
+    with MockTradovateServer(latency=latency) as server, contextlib.redirect_stdout(io.StringIO()):
+        engine = ExecutionEngine(mode="paper", base_url=server.base_url, order_workers=workers)
+        try:
+            manager = OrderManager(engine, coalesce=coalesce)
+            for order in burst(n, levels):
+                manager.submit(order)
+            start = time.perf_counter()
+            manager.flush()
+            elapsed = time.perf_counter() - start
+        finally:
+            engine.close()
+        stats = manager.stats()
+        working = [m for m in manager.orders.values() if m.status == "working"]
+        assert len(working) == n, f"{n - len(working)} orders not working: {stats}"
+        assert all(len(m.bracket_ids) == 2 for m in working), "bracket legs missing"
+        contracts = sum(o.get("orderQty", 0) for o in server.orders if "parentId" not in o)
+        assert contracts == n, f"broker received {contracts} contracts for {n} orders"
+        return {"seconds": elapsed, "book": stats, "requests": dict(server.request_counts), "broker": server.stats()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=100)
+    parser.add_argument("--levels", type=int, default=10, help="distinct bracket levels in the burst")
+    parser.add_argument("--latency", type=float, default=0.01, help="mock broker latency per request (seconds)")
+    parser.add_argument("--workers", type=int, default=4, help="ExecutionEngine order workers")
+    args = parser.parse_args(argv)
+
+    for coalesce in (False, True):
+        result = run(args.orders, args.levels, args.latency, coalesce, args.workers)
+        book = result["book"]
+        print(f"coalesce={coalesce}: {args.orders} orders in {book['requests']} requests "
+              f"({book['coalesced']} coalesced), {result['seconds']:.3f} s")
+        print(f"  broker requests: {result['requests']}")
+        for path, s in result["broker"].items():
+            print(f"  {path:<28}{s['count']:>6}  mean {s['mean_ms']:.2f} ms  p50 {s['p50_ms']:.2f} ms  max {s['max_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""CLI startup profile via ``python -X importtime``.
+
+Runs ``main.py`` with the given arguments in a fresh interpreter, then reports
+wall time, total import time, the slowest top-level imports, and whether any
+heavy dependency was loaded::
+
+    python -m benchmarks.bench_startup                      # main.py --dry-run
+    python -m benchmarks.bench_startup -- --help
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("pandas", "numpy", "matplotlib", "requests")
+
+
+def import_profile(main_args):
+    """Return (wall seconds, [(cumulative_us, depth, module)]) for one `main.py` run."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "main.py", *main_args], cwd=ROOT,
+                          capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(cumulative), depth, name.strip()))
+    return wall, rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("main_args", nargs="*", default=["--dry-run"], help="arguments passed to main.py")
+    args = parser.parse_args(argv)
+
+    wall, rows = import_profile(args.main_args)
+    top_level = sorted((r for r in rows if r[1] == 0), reverse=True)
+    print(f"main.py {' '.join(args.main_args)}: {wall:.3f} s wall, "
+          f"{sum(r[0] for r in top_level) / 1e6:.3f} s importing {len(rows)} modules")
+    for cumulative, _, name in top_level[:args.top]:
+        print(f"  {cumulative / 1e3:>9.1f} ms  {name}")
+    loaded = sorted({name for _, _, name in rows if name.split(".")[0] in HEAVY_MODULES and "." not in name})
+    print(f"heavy modules loaded: {', '.join(loaded) if loaded else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Parity check and benchmark for the array-based strategy implementations.
+
+Compares `strategies.rsi_cooldown` against the original per-row loop
+implementation and its pandas `compute_rsi` (kept here as a reference, which
+read its settings from the system config; the strategy takes them as
+`strategy.params`) on synthetic OHLCV data. For `strategies.simple_random`,
+which now makes a single geometric draw for its entry bar from its own
+`numpy.random.Generator` instead of one `random.random()` per row, it checks the output layout against the
+original implementation, seed reproducibility, that global RNG state is left
+alone, and the entry-bar distribution. Strategies return only their signal
+columns, which are compared against the same columns of the references (the
+`sl` / `tp` / `stop_loss_ticks` columns as floats). Then times both against
+the references.
+
+    python -m benchmarks.bench_strategies                # 1M bars, references on 100k
+    python -m benchmarks.bench_strategies --full         # references on 1M bars too (slow)
+"""
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from benchmarks.synthetic import generate_ohlcv
+from strategies import rsi_cooldown, simple_random
+
+
+def compute_rsi(series, period=14):
+    """The original pandas RSI the reference loop used (before `core.indicators`)."""
+    delta = series.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    rs = gain / loss
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+
+def reference_rsi_cooldown(df, system=None, entry_prob=0.02, seed=None):
+    """Original row-by-row rsi_cooldown implementation."""
+    np.random.seed(seed or 42)
+    df = df.copy()
+    df['rsi'] = compute_rsi(df['close'], period=14)
+    df['signal'] = 0
+    df['sl'] = np.nan
+    df['tp'] = np.nan
+
+    rsi_entry = getattr(system, 'rsi_entry', 30) if system else 30
+    rsi_exit = getattr(system, 'rsi_exit', 70) if system else 70
+    sl_type = getattr(system, 'sl_type', 'ticks') if system else 'ticks'
+    sl_value = getattr(system, 'sl_value', 1) if system else 1
+    tp_type = getattr(system, 'tp_type', 'ticks') if system else 'ticks'
+    tp_value = getattr(system, 'tp_value', 2) if system else 2
+    tick_size = getattr(system.exec, 'tick_size', 0.25) if system and hasattr(system, 'exec') else 0.25
+    cooldown_bars = getattr(system, 'cooldown_bars', 10) if system else 10
+
+    last_sl_idx = -cooldown_bars - 1
+
+    for i in range(1, len(df)):
+        if i - last_sl_idx <= cooldown_bars:
+            continue
+        if df.loc[i, 'rsi'] < rsi_entry:
+            df.at[i, 'signal'] = 1
+            entry = df.loc[i, 'close']
+            if sl_type == 'ticks':
+                sl = entry - sl_value * tick_size
+            elif sl_type == 'percent':
+                sl = entry * (1 - sl_value / 100)
+            elif sl_type == 'dollar':
+                sl = entry - sl_value
+            else:
+                sl = entry - sl_value * tick_size
+            if tp_type == 'ticks':
+                tp = entry + tp_value * tick_size
+            elif tp_type == 'percent':
+                tp = entry * (1 + tp_value / 100)
+            elif tp_type == 'dollar':
+                tp = entry + tp_value
+            else:
+                tp = entry + tp_value * tick_size
+            df.at[i, 'sl'] = sl
+            df.at[i, 'tp'] = tp
+        if df.loc[i, 'rsi'] > rsi_exit:
+            df.at[i, 'signal'] = 0
+        if i > 1 and df.at[i-1, 'signal'] == 1 and df.at[i-1, 'close'] <= df.at[i-1, 'sl']:
+            last_sl_idx = i
+    return df
+
+
+def reference_simple_random(data, system=None, entry_prob=0.02, seed=None):
+    """Original iterrows-based simple_random implementation."""
+    if seed is not None:
+        random.seed(seed)
+
+    df = data.copy()
+    df = df.reset_index(drop=True)
+    df["signal"] = 0
+    df["sl"] = pd.NA
+    df["tp"] = pd.NA
+    df["stop_loss_ticks"] = pd.NA
+
+    in_position = False
+    stop_loss_ticks_cfg = getattr(system.risk, "stop_loss_ticks", 20) if system is not None else 20
+    rr_cfg = getattr(system.risk, "risk_to_reward", 2.0) if system is not None else 2.0
+    tick_size = getattr(system.exec, "tick_size", 0.25) if system is not None else 0.25
+
+    for i, row in df.iterrows():
+        if in_position:
+            continue
+        if random.random() < entry_prob:
+            entry = float(row.close)
+            df.at[i, "signal"] = 1
+            df.at[i, "sl"] = entry - stop_loss_ticks_cfg * tick_size
+            df.at[i, "tp"] = entry + stop_loss_ticks_cfg * tick_size * rr_cfg
+            df.at[i, "stop_loss_ticks"] = stop_loss_ticks_cfg
+            in_position = True
+    return df
+
+
+def _cooldown_systems():
+    exec_cfg = SimpleNamespace(tick_size=0.25)
+    risk_cfg = SimpleNamespace(stop_loss_ticks=8, risk_to_reward=2.0)
+    return {
+        'defaults': None,
+        'percent sl/tp': SimpleNamespace(exec=exec_cfg, risk=risk_cfg, sl_type='percent', sl_value=0.1, tp_type='percent', tp_value=0.2),
+        'entry > exit': SimpleNamespace(exec=exec_cfg, risk=risk_cfg, rsi_entry=55, rsi_exit=45),
+        'stop at entry (cooldown fires)': SimpleNamespace(exec=exec_cfg, risk=risk_cfg, rsi_entry=45, sl_value=0, cooldown_bars=7),
+        'dollar, fractional cooldown': SimpleNamespace(exec=exec_cfg, risk=risk_cfg, rsi_entry=45, sl_type='dollar', sl_value=-1, tp_type='dollar', tp_value=3, cooldown_bars=2.5),
+    }
+
+
+def _assert_columns_equal(new: pd.DataFrame, reference: pd.DataFrame):
+    """`new` (signal columns only) against the same columns of a reference frame."""
+    expected = reference[list(new.columns)]
+    expected = expected.apply(lambda col: col if col.name == "signal" else pd.to_numeric(col).astype("float64"))
+    assert_frame_equal(new, expected)
+
+
+def _cooldown_params(system) -> dict:
+    """The reference's settings on `system` as the `strategy.params` rsi_cooldown now takes."""
+    return {k: getattr(system, k) for k in rsi_cooldown.PARAMS if hasattr(system, k)}
+
+
+def check_parity(n: int):
+    df = generate_ohlcv(n)
+    # Quarter ticks sum exactly; cent prices round on every step, like real data
+    for prices, frame in (("0.25 ticks", df), ("cents", generate_ohlcv(n, seed=1, tick_size=0.01))):
+        for label, system in _cooldown_systems().items():
+            _assert_columns_equal(rsi_cooldown.generate_signals(frame, system=system, **_cooldown_params(system)),
+                                  reference_rsi_cooldown(frame, system=system))
+            print(f"rsi_cooldown parity OK ({label}, {prices})")
+    system = _cooldown_systems()['percent sl/tp']
+    # No entry: same columns as the original implementation
+    _assert_columns_equal(simple_random.generate_signals(df, system=system, entry_prob=0.0, seed=1),
+                          reference_simple_random(df, system=system, entry_prob=0.0, seed=1))
+    random.seed(99)
+    np.random.seed(99)
+    py_state, np_state = random.getstate(), np.random.get_state()
+    for seed in (1, 7):
+        for prob in (0.0005, 0.02):
+            new = simple_random.generate_signals(df, system=system, entry_prob=prob, seed=seed)
+            assert_frame_equal(new, simple_random.generate_signals(df, system=system, entry_prob=prob, seed=seed))
+            entries = np.flatnonzero(new["signal"].to_numpy())
+            assert len(entries) <= 1, "more than one entry"
+            for i in entries:
+                entry = float(df["close"].iat[i])
+                assert new.at[i, "sl"] == entry - system.risk.stop_loss_ticks * system.exec.tick_size
+                assert new.at[i, "tp"] == entry + system.risk.stop_loss_ticks * system.exec.tick_size * system.risk.risk_to_reward
+    assert random.getstate() == py_state and np.all(np.random.get_state()[1] == np_state[1]), "global RNG state touched"
+    # The first entry bar of a per-row Bernoulli(p) scan has mean (1 - p) / p
+    prob = 0.02
+    first = [int(np.flatnonzero(simple_random.generate_signals(df.iloc[:2000], entry_prob=prob, seed=s)["signal"].to_numpy())[0])
+             for s in range(2000)]
+    expected = (1 - prob) / prob
+    assert abs(np.mean(first) - expected) < 0.1 * expected, f"mean entry bar {np.mean(first):.1f}, expected {expected:.1f}"
+    print("simple_random checks OK")
+
+
+def _time(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def benchmark(n: int, reference_n: int):
+    df = generate_ohlcv(n)
+    ref_df = df.iloc[:reference_n]
+    print(f"\n{'strategy':<16}{'impl':<12}{'bars':>10}{'seconds':>10}{'bars/sec':>14}")
+    for name, new_fn, ref_fn in (
+        ('rsi_cooldown', rsi_cooldown.generate_signals, reference_rsi_cooldown),
+        ('simple_random', simple_random.generate_signals, reference_simple_random),
+    ):
+        for impl, fn, frame in (('array', new_fn, df), ('reference', ref_fn, ref_df)):
+            secs = _time(fn, frame, system=None, seed=1)
+            print(f"{name:<16}{impl:<12}{len(frame):>10}{secs:>10.3f}{len(frame) / secs:>14,.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bars", type=int, default=1_000_000)
+    parser.add_argument("--parity-bars", type=int, default=20_000)
+    parser.add_argument("--full", action="store_true", help="time the reference loops on --bars as well")
+    args = parser.parse_args(argv)
+
+    check_parity(args.parity_bars)
+    benchmark(args.bars, args.bars if args.full else min(args.bars, 100_000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Check that ensemble members match single backtests.
+
+Runs a small ensemble of every kind for each strategy under `strategies/` on
+synthetic OHLCV data and asserts that every run equals
+``BacktestEngine.run(path, seed=run_seed, simulation="vectorized")`` of the
+configured strategy on the same path: the data itself for ``"seeds"``, and the
+resampled / random-walk path rebuilt from the batch's spawned `SeedSequence`
+for ``"bootstrap"`` / ``"random_walk"`` (which is also what a ``"seeds"``
+ensemble of a strategy without random signals runs). The risk settings of the config
+(``risk.stop_loss_ticks``, ``risk.risk_to_reward``, ...) reach the strategy in
+both::
+
+    python -m benchmarks.check_ensemble
+    python -m benchmarks.check_ensemble --bars 5000 --runs 12
+    python benchmarks/check_ensemble.py
+
+Exits non-zero on the first mismatch.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+if __package__ in (None, ""):  # run as `python benchmarks/check_ensemble.py`
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.ensemble import ENSEMBLE_KINDS, run_ensemble
+from app.sweep import apply_overrides
+from benchmarks.synthetic import generate_ohlcv
+from config.loader import load_config
+from core.backtest_engine import BacktestEngine
+from core.monte_carlo import RESULT_KEYS, bootstrap_paths, path_frame, random_walk_paths
+from core.risk_engine import RiskEngine
+from core.signal_engine import SignalEngine
+from strategies.registry import available
+
+INITIAL_BALANCE = 1000.0
+BLOCK = 50
+
+
+def member_paths(kind: str, data, runs: int, batch_size: int, seed: int, bars: int):
+    """The price path of every ensemble run, drawn as `app.ensemble._run_batch` draws them."""
+    if kind == "seeds":
+        return [data] * runs
+    starts = range(0, runs, batch_size)
+    frames = []
+    for start, child in zip(starts, np.random.SeedSequence(seed).spawn(len(starts))):
+        size = min(batch_size, runs - start)
+        rng = np.random.default_rng(child)
+        if kind == "bootstrap":
+            paths, dates = bootstrap_paths(rng, data, size, BLOCK), data["date"].to_numpy()
+        else:
+            paths, dates = random_walk_paths(rng, size, bars), None
+        frames.extend(path_frame(paths, p, dates) for p in range(size))
+    return frames
+
+
+def check(config, data, kind: str, runs: int, batch_size: int, seed: int):
+    """Assert every run of a `kind` ensemble matches the engine; returns (total trades, kind that ran)."""
+    bars = len(data)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = run_ensemble(config, runs, kind=kind, data=data, seed=seed, initial_balance=INITIAL_BALANCE,
+                               batch_size=batch_size, block=BLOCK, bars=bars)
+        table, kind = results["runs"], results["kind"]
+        engine = BacktestEngine(config, SignalEngine(config.strategy), RiskEngine(config.risk), None)
+        frames = member_paths(kind, data, runs, batch_size, seed, bars)
+        for row, frame in zip(table.itertuples(index=False), frames):
+            result = engine.run(frame, initial_balance=INITIAL_BALANCE, seed=int(row.seed), simulation="vectorized")
+            member = {key: getattr(row, key) for key in RESULT_KEYS}
+            expected = {key: result[key] for key in RESULT_KEYS}
+            assert np.allclose(list(member.values()), list(expected.values()), rtol=1e-9, atol=1e-9), \
+                f"{kind} run {row.run} differs from the engine run:\n{member}\n{expected}"
+    return int(table["num_trades"].sum()), kind
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bars", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=6)
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--config", default="config/settings.yaml")
+    args = parser.parse_args(argv)
+
+    base = apply_overrides(load_config(args.config), {"risk.max_open_positions": 1})
+    data = generate_ohlcv(args.bars, seed=args.seed, with_dates=True)
+    for strategy in available():
+        config = apply_overrides(base, {"strategy.name": strategy})
+        for kind in ENSEMBLE_KINDS:
+            trades, ran = check(config, data, kind, args.runs, args.batch_size, args.seed)
+            label = kind if ran == kind else f"{kind} -> {ran}"
+            print(f"  {strategy:<16}{label:<24}{trades:>6} trades  OK")
+    print("ensemble runs match the engine")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Parity check of the backtest simulation modes.
+
+Runs every strategy under `strategies/` plus the SignalEngine fallback signals
+on synthetic OHLCV data with each simulation mode and asserts that the
+``"vectorized"`` engine and the one-position ``"multi"`` engine return the same
+trades and summary dict as the reference per-bar ``"loop"``. Each strategy is
+checked under a few risk / fill settings (report-only, blocking and scaling
+drawdown limits, and a spread / slippage / gap-fill model). The loop only
+models exact fills, so with the fill model ``"multi"`` is checked against
+``"vectorized"``::
+
+    python -m benchmarks.check_parity
+    python -m benchmarks.check_parity --bars 20000 --seed 3
+    python benchmarks/check_parity.py
+
+The same checks run as unit tests in ``tests/test_backtest_parity.py``.
+
+Exits non-zero on the first mismatch.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+if __package__ in (None, ""):  # run as `python benchmarks/check_parity.py`
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.sweep import apply_overrides
+from benchmarks.synthetic import generate_ohlcv
+from config.loader import load_config
+from core.backtest_engine import BacktestEngine
+from core.fill_model import FillModel
+from core.risk_engine import RiskEngine
+from core.signal_engine import SignalEngine
+from strategies.registry import available
+
+SETTINGS = {
+    "defaults": {},
+    "drawdown block": {"risk.max_drawdown": 0.5, "risk.drawdown_mode": "block"},
+    "drawdown scale": {"risk.max_drawdown": 0.5, "risk.drawdown_mode": "scale"},
+    "fill model": {"fill.spread_ticks": 1.0, "fill.slippage_ticks": 0.5, "fill.gap_fills": True,
+                   "fill.same_bar": "nearest"},
+}
+
+
+def run_modes(config, data, strategy, seed: int, modes) -> dict:
+    """Backtest result per simulation mode for `strategy` (None: SignalEngine fallback)."""
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for mode in modes:
+            signal_engine = SignalEngine(config.strategy if strategy else None)
+            engine = BacktestEngine(config, signal_engine, RiskEngine(config.risk), None)
+            results[mode] = engine.run(data, strategy=strategy, seed=seed, simulation=mode)
+    return results
+
+
+def check(config, data, strategy, seed: int) -> int:
+    modes = ("loop", "vectorized", "multi") if FillModel.from_config(config).is_exact(data) else ("vectorized", "multi")
+    results = run_modes(config, data, strategy, seed, modes)
+    reference = results[modes[0]]
+    for mode in modes[1:]:
+        result = results[mode]
+        assert result["trades"] == reference["trades"], f"{mode} trades differ from {modes[0]}"
+        summary = {k: v for k, v in result.items() if k not in ("trades", "ledger")}
+        expected = {k: v for k, v in reference.items() if k not in ("trades", "ledger")}
+        assert summary == expected, f"{mode} summary differs from {modes[0]}:\n{summary}\n{expected}"
+    return reference["num_trades"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bars", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--config", default="config/settings.yaml")
+    args = parser.parse_args(argv)
+
+    base = apply_overrides(load_config(args.config), {"risk.max_open_positions": 1})
+    data = generate_ohlcv(args.bars, seed=args.seed, with_dates=True)
+    for label, overrides in SETTINGS.items():
+        config = apply_overrides(base, overrides)
+        for strategy in available() + [None]:
+            trades = check(config, data, strategy, args.seed)
+            print(f"  {strategy or 'fallback':<16}{label:<18}{trades:>6} trades  OK")
+    print("simulation modes agree")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Backtest benchmark suite.
+
+Times each stage of a backtest separately on reproducible synthetic datasets
+and records peak memory, then writes machine-readable results so runs from
+different commits can be compared::
+
+    python -m benchmarks.run_benchmarks                       # 10k and 1m bars
+    python -m benchmarks.run_benchmarks --sizes 10k,1m,10m
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/<older>.json
+
+Stages:
+- ``load_csv``: `load_price_data` parsing the CSV (cache disabled)
+- ``load_cache_build`` / ``load_cache_hit``: first and repeated cached loads
+- ``signals:<strategy>``: `generate_signals` for every module under `strategies/`
+- ``simulate:vectorized``, ``simulate:multi`` (and ``simulate:loop`` up to `--loop-max-bars`)
+- ``report``: `app.reporting.write_report` without charts
+
+Each stage is timed without tracing; its peak traced allocation
+(`tracemalloc`, which includes NumPy buffers) comes from a separate run so
+tracing overhead never leaks into the timings.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from app.reporting import write_report
+from benchmarks.synthetic import SIZES, ensure_csv
+from config.loader import load_config
+from core.backtest_engine import BacktestEngine
+from core.data_loader import load_price_data
+from core.risk_engine import RiskEngine
+from core.signal_engine import SignalEngine, attach_signals
+from strategies.registry import available, get_strategy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(HERE, ".data")
+RESULTS_DIR = os.path.join(HERE, "results")
+
+
+def strategy_modules():
+    """Names of every strategy module under `strategies/` (helpers excluded)."""
+    return available()
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+class StageRunner:
+    def __init__(self, repeat: int = 1, memory: bool = True):
+        self.repeat = repeat
+        self.memory = memory
+        self.results = {}
+
+    def run(self, name: str, fn, setup=None):
+        """Time `fn()` (best of `repeat`), then measure its peak allocation; returns fn's result."""
+        best = float("inf")
+        result = None
+        for _ in range(self.repeat):
+            if setup:
+                setup()
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                result = fn()
+                best = min(best, time.perf_counter() - start)
+        entry = {"seconds": best}
+        if self.memory:
+            if setup:
+                setup()
+            tracemalloc.start()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    fn()
+                entry["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+            finally:
+                tracemalloc.stop()
+        self.results[name] = entry
+        mem = f"{entry['peak_mb']:>10.1f} MB" if "peak_mb" in entry else ""
+        print(f"  {name:<28}{best:>10.4f} s{mem}")
+        return result
+
+
+def bench_size(label: str, n: int, config, args) -> dict:
+    print(f"\n== {label}: {n:,} bars ==")
+    csv_path = ensure_csv(n, DATA_DIR, seed=args.seed)
+    stages = StageRunner(repeat=args.repeat, memory=not args.no_memory)
+    cache_dir = tempfile.mkdtemp(prefix="bench_cache_")
+    try:
+        data = stages.run("load_csv", lambda: load_price_data(csv_path, use_cache=False))
+        stages.run("load_cache_build", lambda: load_price_data(csv_path, cache_dir=cache_dir),
+                   setup=lambda: shutil.rmtree(cache_dir, ignore_errors=True))
+        stages.run("load_cache_hit", lambda: load_price_data(csv_path, cache_dir=cache_dir))
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    signals = {}
+    for name in strategy_modules():
+        mod = get_strategy(name)
+        signals[name] = stages.run(f"signals:{name}", lambda: attach_signals(data, mod.generate_signals(data, system=config, seed=args.seed)))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = BacktestEngine(config, SignalEngine(config.strategy), RiskEngine(config.risk), None)
+    frame = signals[args.strategy]
+    trades, _ = stages.run("simulate:vectorized", lambda: engine._simulate_vectorized(frame, 1000.0))
+    multi, _ = stages.run("simulate:multi", lambda: engine._simulate_multi(frame, 1000.0))
+    if getattr(config.risk, "max_open_positions", 1) == 1:
+        assert multi == trades, "multi-position simulation with one slot disagrees with single-position"
+    if n <= args.loop_max_bars:
+        loop_trades, _ = stages.run("simulate:loop", lambda: engine._simulate_loop(frame, 1000.0))
+        assert trades == loop_trades, "vectorized and loop simulations disagree"
+
+    out_dir = tempfile.mkdtemp(prefix="bench_report_")
+    try:
+        result = {"trades": trades}
+        stages.run("report", lambda: write_report(result, out_dir, data=data, initial_balance=1000.0, plot=False))
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+    return {"bars": n, "num_trades": len(trades), "stages": stages.results}
+
+
+def compare(current: dict, baseline_path: str, threshold: float) -> int:
+    """Print stage-by-stage changes vs a previous results file; return the number of regressions."""
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+    print(f"\nComparison against {baseline_path} (commit {baseline.get('commit')}), threshold {threshold:.0%}")
+    regressions = 0
+    for size, result in current["sizes"].items():
+        base = baseline.get("sizes", {}).get(size)
+        if not base:
+            continue
+        for stage, entry in result["stages"].items():
+            old = base["stages"].get(stage)
+            if not old:
+                continue
+            for metric in ("seconds", "peak_mb"):
+                if metric not in entry or metric not in old or old[metric] <= 0:
+                    continue
+                change = entry[metric] / old[metric] - 1
+                flag = ""
+                # ignore timer / allocator noise on tiny stages
+                floor = 5e-3 if metric == "seconds" else 1.0
+                if change > threshold and entry[metric] - old[metric] > floor:
+                    flag = "  REGRESSION"
+                    regressions += 1
+                print(f"  {size:<5}{stage:<28}{metric:<9}{old[metric]:>12.4f} -> {entry[metric]:>12.4f} ({change:+.1%}){flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10k,1m", help=f"comma separated subset of {','.join(SIZES)}")
+    parser.add_argument("--config", default="config/settings.yaml")
+    parser.add_argument("--strategy", default="rsi_reversal", help="strategy whose signals feed the simulation stages")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions per stage (best is kept)")
+    parser.add_argument("--loop-max-bars", type=int, default=10_000, help="largest size to run the reference loop on")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory runs")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>_<timestamp>.json)")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown / growth flagged as regression")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    commit = _git_commit()
+    results = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "sizes": {},
+    }
+    for label in args.sizes.split(","):
+        label = label.strip().lower()
+        if label not in SIZES:
+            parser.error(f"unknown size '{label}' (choose from {', '.join(SIZES)})")
+        results["sizes"][label] = bench_size(label, SIZES[label], config, args)
+    results["max_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output} (max RSS {results['max_rss_mb']:.0f} MB)")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"{regressions} regression(s) detected")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Reproducible synthetic OHLCV data for benchmarks.
+
+Prices follow a tick-rounded random walk with bar highs/lows a few ticks
+around the close, on a 1-minute timestamp grid. The same `(n, seed)` always
+produces the same frame.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+
+
+def generate_ohlcv(n: int, seed: int = 0, start: str = "2020-01-01", freq: str = "1min", tick_size: float = 0.25,
+                   with_dates: bool = False) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 4000 + np.round(np.cumsum(rng.standard_normal(n)) * (1 / tick_size)) * tick_size
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    df = pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + rng.integers(0, 5, n) * tick_size,
+        'low': np.minimum(open_, close) - rng.integers(0, 5, n) * tick_size,
+        'close': close,
+        'volume': rng.integers(100, 1000, n),
+    })
+    if with_dates:
+        df.insert(0, 'date', pd.date_range(start, periods=n, freq=freq))
+    return df
+
+
+def ensure_csv(n: int, directory: str, seed: int = 0) -> str:
+    """Write the synthetic dataset for `(n, seed)` as CSV once and return its path."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"ohlcv_{n}_{seed}.csv")
+    if not os.path.exists(path):
+        tmp = f"{path}.tmp"
+        generate_ohlcv(n, seed=seed, with_dates=True).to_csv(tmp, index=False)
+        os.replace(tmp, path)
+    return path
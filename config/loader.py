@@ -1,6 +1,8 @@
+import re
+
 import yaml
-from pydantic import BaseModel
-from typing import Literal, Optional, Dict, Any
+from pydantic import BaseModel, field_validator
+from typing import Literal, Optional, Dict, Any, List
 
 class RiskConfig(BaseModel):
     risk_per_trade: float
@@ -8,6 +10,12 @@ class RiskConfig(BaseModel):
     stop_loss_ticks: int
     max_drawdown: float
     max_position_size: int
+    # Enforce max_drawdown: "block" new entries or "scale" them down (None: report only)
+    drawdown_mode: Optional[Literal["block", "scale"]] = None
+    # Concurrent positions for the "multi" simulation mode
+    max_open_positions: int = 1
+    # Allow stacking positions in the same direction (False: at most one per direction)
+    pyramiding: bool = True
 
 class ExecutionConfig(BaseModel):
     mode: Literal["backtest", "live"]
@@ -16,6 +24,41 @@ class ExecutionConfig(BaseModel):
     tick_value: float
     tick_size: float
 
+class FillConfig(BaseModel):
+    # Synthetic bid/ask spread in ticks around OHLC prices (ignored when the data has ask columns)
+    spread_ticks: float = 0.0
+    # Adverse slippage in ticks on market entries, stop exits and end-of-data closes
+    slippage_ticks: float = 0.0
+    # Exits whose level the bar opens through fill at the open
+    gap_fills: bool = False
+    # Winner when SL and TP are both touched in one bar: "sl", "tp" or the level "nearest" the open
+    same_bar: Literal["sl", "tp", "nearest"] = "sl"
+    # Lower-timeframe bars (with a `date` column) scanned to settle same-bar SL / TP touches
+    intrabar_data: Optional[str] = None
+
+_TIMEFRAME = re.compile(r"^\d+\s*(s|m|min|h|d)$")
+
+class DataConfig(BaseModel):
+    # Higher timeframes aggregated from the base bars for strategies (see core.bars), e.g. ["5m", "1h"]
+    timeframes: List[str] = []
+    # Width of the base bars, e.g. "1m" (inferred from the `date` column when unset)
+    base_timeframe: Optional[str] = None
+
+    @field_validator("timeframes")
+    @classmethod
+    def _check_timeframes(cls, value):
+        for tf in value:
+            if not _TIMEFRAME.match(str(tf).strip().lower()):
+                raise ValueError(f"unknown timeframe '{tf}', expected e.g. '5m', '15m', '1h' or '1d'")
+        return value
+
+    @field_validator("base_timeframe")
+    @classmethod
+    def _check_base(cls, value):
+        if value is not None and not _TIMEFRAME.match(str(value).strip().lower()):
+            raise ValueError(f"unknown timeframe '{value}', expected e.g. '1m'")
+        return value
+
 class StrategyConfig(BaseModel):
         """Flexible strategy descriptor.
 
@@ -47,6 +90,8 @@ class SystemConfig(BaseModel):
     risk: RiskConfig
     exec: ExecutionConfig
     strategy: StrategyConfig
+    fill: FillConfig = FillConfig()
+    data: DataConfig = DataConfig()
 
 
 def load_config(path: str = "config/settings.yaml") -> SystemConfig:
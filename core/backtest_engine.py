@@ -1,69 +1,515 @@
 """Clean BacktestEngine implementation.
 
-Loads a strategy from `strategies.<name>` (if requested) or falls back to
-the provided `signal_engine`. Simulates trades by forward-scanning each
+Loads a strategy from `strategies.<name>` through `strategies.registry` (if
+requested) or falls back to the provided `signal_engine`. Simulates trades by forward-scanning each
 entry for SL / TP hits and returns a summary and the trade list.
+
+Simulation modes:
+- ``"vectorized"`` (default): pulls the price / signal columns into NumPy
+  arrays once, resolves each exit with a batched first-crossing search and
+  prices all entry / exit fills of a block in one array pass.
+- ``"loop"``: the original row-by-row reference implementation.
+  Both single-position modes produce identical trades and summaries.
+- ``"multi"``: concurrent positions (up to ``risk.max_open_positions``, with
+  same-direction stacking controlled by ``risk.pyramiding``). Open positions
+  sit in a heap keyed by exit bar; with ``max_open_positions: 1`` it matches
+  the single-position modes trade for trade.
+
+Entry and exit prices come from `core.fill_model.FillModel` (config
+``fill``): bid/ask quotes, spread, slippage, gap fills and same-bar SL / TP
+resolution. With the default config fills are the exact close / SL / TP
+prices, which is the only model the ``"loop"`` reference implements.
 """
-from typing import Optional
-import importlib
+from typing import Iterable, Optional
+import heapq
+import time
+import numpy as np
 import pandas as pd
 
+from core.bars import build_views
+from core.fill_model import FillModel
+from core.instrumentation import METRICS
+from core.signal_engine import attach_signals, strategy_inputs
+from core.trade_ledger import TradeLedger
+from strategies.registry import get_strategy
+
+
+SIMULATION_MODES = ("vectorized", "loop", "multi")
+
+# Bars of the previous chunk prepended to the next one in `run_chunked` when
+# the strategy doesn't declare a `LOOKBACK`
+DEFAULT_CHUNK_LOOKBACK = 500
+
+# First window scanned for an exit; doubled on every miss so long holding
+# periods cost O(log n) NumPy calls instead of one Python step per bar.
+_FIRST_TOUCH_BLOCK = 64
+
+
+def _column(df: pd.DataFrame, col: str, default=np.nan) -> np.ndarray:
+    """Return `col` as a read-only float64 array (missing column -> `default` everywhere).
+
+    float64 columns are returned without a copy and a missing column is a
+    zero-stride broadcast, so only columns that need converting allocate.
+    """
+    if col not in df.columns:
+        return np.broadcast_to(np.float64(default), (len(df),))
+    series = df[col]
+    if series.dtype == np.float64:
+        return series.to_numpy()
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _signal_column(df: pd.DataFrame) -> np.ndarray:
+    """The ``signal`` column as int64 (missing / NaN -> 0), without a copy when it already is one."""
+    if "signal" in df.columns and df["signal"].dtype == np.int64:
+        return df["signal"].to_numpy()
+    return np.nan_to_num(_column(df, "signal", 0.0), nan=0.0).astype("int64")
+
+
+def _fill_nan(values: np.ndarray, fallback: np.ndarray) -> np.ndarray:
+    """`values` with NaNs replaced by `fallback` (no copy when there are none)."""
+    missing = np.isnan(values)
+    return np.where(missing, fallback, values) if missing.any() else values
+
+
+def first_touch(high: np.ndarray, low: np.ndarray, start: int, sig: int, sl: float, tp: float):
+    """Find the first bar at or after `start` where SL or TP is touched.
+
+    Returns ``(index, reason)`` with reason ``'sl'`` or ``'tp'``; SL wins when
+    both levels are touched on the same bar. Returns ``(-1, None)`` if neither
+    level is reached before the end of the arrays.
+    """
+    n = len(high)
+    pos = start
+    block = _FIRST_TOUCH_BLOCK
+    while pos < n:
+        end = min(n, pos + block)
+        if sig > 0:
+            sl_hit = low[pos:end] <= sl
+            tp_hit = high[pos:end] >= tp
+        else:
+            sl_hit = high[pos:end] >= sl
+            tp_hit = low[pos:end] <= tp
+        hit = sl_hit | tp_hit
+        k = int(hit.argmax())
+        if hit[k]:
+            return pos + k, ("sl" if sl_hit[k] else "tp")
+        pos = end
+        block *= 2
+    return -1, None
+
+
+def chunk_seed(seed: Optional[int], offset: int) -> Optional[int]:
+    """Seed of the chunk starting at global bar `offset` of a chunked run seeded with `seed`.
+
+    Derived with `numpy.random.SeedSequence`, so chunks of a random-signal
+    strategy draw independently of each other instead of all repeating the
+    draws of the first one. None (fresh entropy per chunk) stays None.
+    """
+    if seed is None:
+        return None
+    return int(np.random.SeedSequence([seed, offset]).generate_state(1, np.uint64)[0] >> np.uint64(1))
+
+
+def trade_params(system):
+    """Return (default stop_loss_ticks, risk_to_reward, tick_size, tick_value) from config."""
+    return (
+        getattr(system.risk, "stop_loss_ticks", 20),
+        float(getattr(system.risk, "risk_to_reward", 2.0)),
+        float(getattr(system.exec, "tick_size", 0.25)),
+        # Use MES tick value from config (default 1.25)
+        float(getattr(system.exec, "tick_value", 1.25)),
+    )
+
+
+class _SimState:
+    """Mutable simulation state carried across blocks of bars."""
+
+    def __init__(self, initial_balance: float):
+        self.balance = float(initial_balance)
+        self.trades = TradeLedger()
+        self.open = None       # currently open position, if any
+        self.next_free = 0     # first global bar allowed to open a new trade
+        self.offset = 0        # global index of the next block's first bar
+        self.last_exit = None  # end-of-data exit price by direction
+
 
 class BacktestEngine:
-    def __init__(self, system, signal_engine, risk_engine, execution_engine):
+    def __init__(self, system, signal_engine, risk_engine, execution_engine, signal_cache=None):
         self.system = system
         self.signal_engine = signal_engine
         self.risk_engine = risk_engine
         self.execution_engine = execution_engine
+        # Optional `core.signal_cache.SignalCache`: strategy signals are reused
+        # across runs with the same data, strategy code / params and seed
+        self.signal_cache = signal_cache
+        self.fill_model = FillModel.from_config(system)
+
+    def _strategy_handle(self, strategy: Optional[str] = None):
+        """Registry handle of `strategy`, or of the signal engine's module (None without one)."""
+        if strategy:
+            return get_strategy(strategy)
+        return getattr(self.signal_engine, "handle", None)
 
-    def _load_strategy_module(self, name: str):
-        return importlib.import_module(f"strategies.{name}")
+    def _strategy_params(self, strategy: Optional[str] = None) -> dict:
+        if strategy or not hasattr(self.signal_engine, "params"):
+            return {}
+        return self.signal_engine.params()
 
-    def run(self, data: Optional[pd.DataFrame] = None, strategy: Optional[str] = None, initial_balance: float = 1000.0, entry_prob: float = 0.02, seed: Optional[int] = None):
+    def lookback(self, strategy: Optional[str] = None) -> int:
+        """Warm-up bars for chunked / live runs: the strategy's `LOOKBACK`, else `DEFAULT_CHUNK_LOOKBACK`."""
+        handle = self._strategy_handle(strategy)
+        bars = handle.lookback(self._strategy_params(strategy)) if handle is not None else None
+        return DEFAULT_CHUNK_LOOKBACK if bars is None else bars
+
+    def run(self, data: Optional[pd.DataFrame] = None, strategy: Optional[str] = None, initial_balance: float = 1000.0, entry_prob: float = 0.02, seed: Optional[int] = None, simulation: str = "vectorized",
+            timeframes: Optional[dict] = None):
         """Run backtest using either a strategy module or the signal_engine.
 
         If `data` is None, generates a random walk DataFrame for demonstration.
-        Returns a dict containing summary metrics and the raw trades list.
+        `simulation` selects the exit-resolution engine (see `SIMULATION_MODES`).
+        `timeframes` are prebuilt `core.bars` views of `data` (e.g. from the
+        price cache); by default the views in ``data.timeframes`` are built here.
+        Returns a dict containing summary metrics, the trades as a list of dicts
+        under ``"trades"`` and the same trades as a `TradeLedger` under ``"ledger"``.
         """
+        if simulation not in SIMULATION_MODES:
+            raise ValueError(f"Unknown simulation mode '{simulation}', expected one of {SIMULATION_MODES}")
+
         if data is None:
-            # Generate random walk OHLCV data
-            import numpy as np
-            np.random.seed(seed or 42)
-            n = 10000  # number of bars
-            price = 100 + np.cumsum(np.random.randn(n))
-            df = pd.DataFrame({
-                'open': price + np.random.uniform(-0.5, 0.5, n),
-                'high': price + np.random.uniform(0, 1, n),
-                'low': price - np.random.uniform(0, 1, n),
-                'close': price,
-                'volume': np.random.randint(100, 1000, n)
-            })
+            # Random-walk OHLCV demo data from a private Generator (no global reseeding)
+            from core.monte_carlo import path_frame, random_walk_paths
+
+            rng = np.random.default_rng(42 if seed is None else seed)
+            df = path_frame(random_walk_paths(rng, 1, 10000), 0)
         else:
-            df = data.copy().reset_index(drop=True)
-        """Run backtest using either a strategy module or the signal_engine.
+            # Read-only from here on (strategies return new columns), so there is no defensive copy
+            default_index = isinstance(data.index, pd.RangeIndex) and data.index.start == 0 and data.index.step == 1
+            df = data if default_index else data.reset_index(drop=True)
+
+        start = time.perf_counter()
+        with METRICS.timer("backtest.signals"):
+            if timeframes is None and data is not None:
+                timeframes = self._timeframe_views(df)
+            df = self._generate_signals(df, strategy, entry_prob, seed, timeframes)
+
+        with METRICS.timer("backtest.simulate"):
+            if simulation == "loop":
+                trades, balance = self._simulate_loop(df, initial_balance)
+            elif simulation == "multi":
+                trades, balance = self._simulate_multi(df, initial_balance)
+            else:
+                trades, balance = self._simulate_vectorized(df, initial_balance)
+        self._record_throughput(len(df), time.perf_counter() - start)
+        return self._summarize(trades, balance, initial_balance, len(df))
+
+    def run_chunked(self, chunks: Iterable[pd.DataFrame], strategy: Optional[str] = None, initial_balance: float = 1000.0, entry_prob: float = 0.02, seed: Optional[int] = None, lookback: Optional[int] = None):
+        """Run a backtest over an iterable of consecutive price chunks.
+
+        Signals for each chunk are generated on the chunk prefixed with the
+        last `lookback` bars of the previous one, so rolling indicators are
+        warmed up exactly as in a single-frame run as long as `lookback` covers
+        their window. By default it is the strategy's declared `LOOKBACK`
+        (see `lookback`). Higher-timeframe views are built per frame, so the first
+        one of each may start part-way through a bar. An open position is carried across chunk boundaries.
+        Peak memory is bounded by the chunk size (plus the trade list), not the
+        dataset size. `entry_idx` / `exit_idx` are global bar positions.
 
-        Returns a dict containing summary metrics and the raw trades list.
+        Strategies with ``RANDOM_SIGNALS`` are called once per chunk with a
+        per-chunk seed (`chunk_seed` of `seed` and the chunk's first global
+        bar), so their draws, and the results, depend on the chunking and are
+        not comparable to a single-frame run; ``simple_random`` places up to one
+        entry per chunk instead of one per run.
+
+        Use `core.data_loader.iter_price_chunks` to stream a file.
         """
+        if lookback is None:
+            lookback = self.lookback(strategy)
+        handle = self._strategy_handle(strategy)
+        random_signals = handle is not None and handle.random_signals
+        if random_signals:
+            print(f"Warning: strategy '{handle.name}' draws random signals per chunk; "
+                  "chunked results aren't comparable to a single-frame run")
+        state = _SimState(initial_balance)
+        self.risk_engine.reset(float(initial_balance))
+        carry = None
+        start = time.perf_counter()
+        for chunk in chunks:
+            if len(chunk) == 0:
+                continue
+            chunk = chunk.reset_index(drop=True)
+            if carry is not None and len(carry):
+                frame = pd.concat([carry, chunk], ignore_index=True)
+            else:
+                frame = chunk
+            with METRICS.timer("backtest.signals"):
+                frame_seed = chunk_seed(seed, state.offset) if random_signals else seed
+                signals = self._generate_signals(frame, strategy, entry_prob, frame_seed, self._timeframe_views(frame))
+            warmup = len(frame) - len(chunk)
+            with METRICS.timer("backtest.simulate"):
+                self._simulate_arrays(self._arrays(signals.iloc[warmup:]), state)
+            carry = chunk.iloc[-lookback:] if lookback > 0 else None
+
+        self._close_open_position(state)
+        self._record_throughput(state.offset, time.perf_counter() - start)
+        return self._summarize(state.trades, state.balance, initial_balance, state.offset)
 
+    def _record_throughput(self, bars: int, seconds: float):
+        METRICS.count("backtest.bars", bars)
+        if seconds > 0:
+            METRICS.gauge("backtest.bars_per_sec", bars / seconds)
 
-        # generate signals
+    def _timeframe_views(self, df: pd.DataFrame) -> Optional[dict]:
+        """`core.bars` views of `df` for the configured ``data.timeframes`` (None when there are none)."""
+        data_cfg = getattr(self.system, "data", None)
+        timeframes = getattr(data_cfg, "timeframes", None)
+        if not timeframes:
+            return None
+        with METRICS.timer("backtest.timeframes"):
+            return build_views(df, timeframes, base_timeframe=getattr(data_cfg, "base_timeframe", None))
+
+    def _generate_signals(self, df: pd.DataFrame, strategy: Optional[str], entry_prob: float, seed: Optional[int],
+                          timeframes: Optional[dict] = None) -> pd.DataFrame:
         if strategy:
-            mod = self._load_strategy_module(strategy)
-            # validate strategy interface (raises on error)
-            try:
-                from strategies.base import validate_strategy
+            handle = get_strategy(strategy)  # imported and validated once per process
+            inputs = strategy_inputs(df, handle)
+            extra = {"timeframes": timeframes} if timeframes and handle.accepts_timeframes else {}
+            generate = lambda: handle.generate_signals(inputs, system=self.system, entry_prob=entry_prob, seed=seed, **extra)
+            if self.signal_cache is None:
+                return attach_signals(df, generate())
+            out = self.signal_cache.signals(handle.module, inputs, generate, system=self.system, seed=seed,
+                                            entry_prob=entry_prob, timeframes=extra.get("timeframes"))
+            return attach_signals(df, out)
 
-                validate_strategy(mod)
-            except Exception:
-                # re-raise with context
-                raise
+        handle = getattr(self.signal_engine, "handle", None)
+        extra = {"timeframes": timeframes} if timeframes else {}
+        generate = lambda: self.signal_engine.generate_signals(df, system=self.system, entry_prob=entry_prob, seed=seed,
+                                                               **extra)
+        if self.signal_cache is None or handle is None:
+            return generate()
+        # SignalEngine adds the accepted `strategy.params`; the key covers only the columns it hands the strategy
+        params = handle.kwargs(self.signal_engine.params())
+        passed = timeframes if timeframes and handle.accepts_timeframes else None
+        return attach_signals(df, self.signal_cache.signals(handle.module, df, generate, system=self.system, params=params,
+                                                            seed=seed, entry_prob=entry_prob, timeframes=passed,
+                                                            inputs=strategy_inputs(df, handle)))
 
-            df = mod.generate_signals(df, system=self.system, entry_prob=entry_prob, seed=seed)
-        else:
-            df = self.signal_engine.generate_signals(df)
+    def _trade_params(self):
+        return trade_params(self.system)
+
+    def _arrays(self, df: pd.DataFrame) -> dict:
+        """Pull the columns the simulation needs into contiguous float / int arrays,
+        plus the fill model's per-bar quote arrays."""
+        close = _column(df, "close")
+        arrays = {
+            "close": close,
+            "high": _fill_nan(_column(df, "high"), close),
+            "low": _fill_nan(_column(df, "low"), close),
+            "signal": _signal_column(df),
+            "sl": _column(df, "sl"),
+            "tp": _column(df, "tp"),
+            "stop_loss_ticks": _column(df, "stop_loss_ticks"),
+        }
+        arrays.update(self.fill_model.prepare(df, arrays))
+        return arrays
+
+    def _exit(self, arrays: dict, start: int, sig: int, sl: float, tp: float):
+        """First SL / TP fill at or after bar `start`: ``(index, reason, price)``, or ``(-1, None, None)``."""
+        fill = self.fill_model
+        high, low = fill.exit_side(arrays, sig)
+        j, reason = first_touch(high, low, start, sig, sl, tp)
+        if j < 0:
+            return -1, None, None
+        reason = fill.resolve(arrays, j, sig, sl, tp, reason)
+        return j, reason, fill.exit_price(arrays, j, 1 if sig > 0 else -1, reason, sl, tp)
+
+    def _simulate_vectorized(self, df: pd.DataFrame, initial_balance: float):
+        """Array-backed simulation; same semantics as `_simulate_loop`."""
+        state = _SimState(initial_balance)
+        self.risk_engine.reset(float(initial_balance))
+        if len(df):
+            self._simulate_arrays(self._arrays(df), state)
+            self._close_open_position(state)
+        return state.trades, state.balance
+
+    def _simulate_arrays(self, arrays: dict, state: "_SimState"):
+        """Advance `state` over one block of bars (global offset `state.offset`).
+
+        Which entries trade and where they exit doesn't depend on position
+        sizes, so the block runs in three steps: entry levels for every signal
+        bar and the chain of trades (one `first_touch` search each) are found
+        first, then all their fills are priced in one pass over the trades,
+        then the trades are sized and booked in order. An entry blocked by a
+        drawdown limit leaves nothing open, so equity can't change and every
+        later entry of the block is blocked too.
+        """
+        default_ticks, rr, tick_size, tick_value = self._trade_params()
+        fill = self.fill_model
+        signal = arrays["signal"]
+        offset = state.offset
+        n = len(signal)
+
+        # A position carried in from the previous block keeps scanning here
+        if state.open is not None:
+            pos = state.open
+            j, reason, exit_price = self._exit(arrays, 0, pos["sig"], pos["sl"], pos["tp"])
+            if j >= 0:
+                self._close_position(state, offset + j, reason, exit_price)
+
+        if state.open is None:
+            candidates = np.flatnonzero(signal)
+            candidates = candidates[candidates >= state.next_free - offset]
+            sig = signal[candidates]
+            direction = np.where(sig > 0, 1, -1)
+            entry = fill.entry_prices(arrays, candidates, direction)
+            ticks_col = arrays["stop_loss_ticks"][candidates]
+            ticks = np.where(np.isnan(ticks_col), default_ticks, ticks_col).astype("int64")
+            sl_col, tp_col = arrays["sl"][candidates], arrays["tp"][candidates]
+            sl = np.where(np.isnan(sl_col), entry - ticks * tick_size * direction, sl_col)
+            tp = np.where(np.isnan(tp_col), entry + ticks * tick_size * rr * direction, tp_col)
+
+            # The chain of trades: each entry waits for the previous exit
+            chosen, exits, touched_sl = [], [], []
+            k = 0
+            while k < len(candidates):
+                i = int(candidates[k])
+                high, low = fill.exit_side(arrays, int(sig[k]))
+                j, reason = first_touch(high, low, i + 1, int(sig[k]), float(sl[k]), float(tp[k]))
+                chosen.append(k)
+                exits.append(j)
+                touched_sl.append(reason == "sl")
+                if j < 0:
+                    break  # still open at the end of the block
+                k = int(np.searchsorted(candidates, j + 1))
+
+            # Fills of every trade in one pass
+            chosen = np.asarray(chosen, dtype="int64")
+            exits = np.asarray(exits, dtype="int64")
+            closed = exits >= 0
+            c, j = chosen[closed], exits[closed]
+            is_sl = fill.resolve_exits(arrays, j, direction[c], sl[c], tp[c], np.asarray(touched_sl, dtype=bool)[closed])
+            exit_price = fill.exit_prices(arrays, j, direction[c], is_sl, sl[c], tp[c])
+
+            for t, k in enumerate(chosen):
+                pos_size = self.risk_engine.calculate_position_size(state.balance, int(ticks[k]), tick_value=tick_value)
+                pos_size = self.risk_engine.apply_limits(pos_size)
+                if pos_size <= 0:
+                    # drawdown limit: this and every later entry of the block is blocked
+                    for later in range(k + 1, len(candidates)):
+                        self.risk_engine.apply_limits(self.risk_engine.calculate_position_size(
+                            state.balance, int(ticks[later]), tick_value=tick_value))
+                    break
+                risk = pos_size * int(ticks[k]) * tick_value
+                self.risk_engine.on_open(pos_size, risk)
+                state.open = {"entry_idx": offset + int(candidates[k]), "sig": int(sig[k]), "entry": float(entry[k]),
+                              "sl": float(sl[k]), "tp": float(tp[k]), "pos_size": pos_size, "risk": risk}
+                if closed[t]:  # only the last trade can still be open, so `t` also indexes the closed ones
+                    self._close_position(state, offset + int(exits[t]), "sl" if is_sl[t] else "tp",
+                                         float(exit_price[t]))
+
+        state.offset += n
+        state.last_exit = {1: fill.close_price(arrays, n - 1, 1), -1: fill.close_price(arrays, n - 1, -1)}
+
+    def _simulate_multi(self, df: pd.DataFrame, initial_balance: float):
+        """Simulation with concurrent positions.
 
+        Every signal bar is an entry candidate. Its exit doesn't depend on
+        other positions, so it is resolved with `first_touch` as soon as the
+        entry is accepted and the position is pushed on a heap keyed by exit
+        bar. Before each candidate, positions that exited on an earlier bar
+        are popped and booked (in exit order), so sizing sees the realized
+        balance. Cost is one heap operation per candidate / trade plus the
+        exit scans, independent of how many positions overlap.
+
+        Unlike the single-position engine, fills are priced per accepted
+        trade: with a drawdown limit, whether a candidate is accepted depends
+        on the balance realized by earlier exits, and a later exit can lift
+        the block again, so the trades can't be planned ahead of pricing.
+        """
+        max_open = max(1, int(getattr(self.system.risk, "max_open_positions", 1) or 1))
+        pyramiding = bool(getattr(self.system.risk, "pyramiding", True))
+        default_ticks, rr, tick_size, tick_value = self._trade_params()
+        self.risk_engine.reset(float(initial_balance))
+        trades = TradeLedger()
+        balance = float(initial_balance)
+        if not len(df):
+            return trades, balance
+
+        fill = self.fill_model
+        arrays = self._arrays(df)
+        signal = arrays["signal"]
+        sl_col, tp_col, ticks_col = arrays["sl"], arrays["tp"], arrays["stop_loss_ticks"]
+        n = len(signal)
+        pending = []                  # heap of (exit_idx, entry order, position)
+        open_by_direction = {1: 0, -1: 0}
+
+        def release(before):
+            nonlocal balance
+            while pending and pending[0][0] < before:
+                exit_idx, _, pos = heapq.heappop(pending)
+                pnl = (pos["exit"] - pos["entry"]) * pos["sig"] * pos["pos_size"] * (tick_value / tick_size)
+                balance += pnl
+                self.risk_engine.on_close(pos["pos_size"], pnl, pos["risk"])
+                open_by_direction[pos["direction"]] -= 1
+                trades.append(pos["entry_idx"], exit_idx, pos["entry"], pos["exit"], pnl, pos["pos_size"], pos["exit_reason"])
+
+        for i in np.flatnonzero(signal):
+            i = int(i)
+            release(i)
+            if len(pending) >= max_open:
+                continue
+            sig = int(signal[i])
+            direction = 1 if sig > 0 else -1
+            if not pyramiding and open_by_direction[direction]:
+                continue
+            entry_price = fill.entry_price(arrays, i, direction)
+            stop_loss_ticks = int(default_ticks if np.isnan(ticks_col[i]) else ticks_col[i])
+            sl = entry_price - stop_loss_ticks * tick_size * direction if np.isnan(sl_col[i]) else float(sl_col[i])
+            tp = entry_price + stop_loss_ticks * tick_size * rr * direction if np.isnan(tp_col[i]) else float(tp_col[i])
+            pos_size = self.risk_engine.calculate_position_size(balance, stop_loss_ticks, tick_value=tick_value)
+            pos_size = self.risk_engine.apply_limits(pos_size)
+            if pos_size <= 0:
+                continue
+            risk = pos_size * stop_loss_ticks * tick_value
+            self.risk_engine.on_open(pos_size, risk)
+
+            j, reason, exit_price = self._exit(arrays, i + 1, sig, sl, tp)
+            if j < 0:
+                j, exit_price = n - 1, fill.close_price(arrays, n - 1, direction)
+            open_by_direction[direction] += 1
+            heapq.heappush(pending, (j, i, {
+                "entry_idx": i, "sig": sig, "direction": direction, "entry": entry_price, "exit": exit_price,
+                "exit_reason": reason, "pos_size": pos_size, "risk": risk,
+            }))
+
+        release(n)
+        return trades, balance
+
+    def _close_position(self, state: "_SimState", exit_idx: int, exit_reason: Optional[str], exit_price: float):
+        _, _, tick_size, tick_value = self._trade_params()
+        pos = state.open
+        # MES PnL: (exit - entry) * contracts * (tick_value / tick_size)
+        pnl = (exit_price - pos["entry"]) * pos["sig"] * pos["pos_size"] * (tick_value / tick_size)
+        state.balance += pnl
+        self.risk_engine.on_close(pos["pos_size"], pnl, pos["risk"])
+        state.trades.append(pos["entry_idx"], exit_idx, pos["entry"], exit_price, pnl, pos["pos_size"], exit_reason)
+        state.open = None
+        state.next_free = exit_idx + 1
+
+    def _close_open_position(self, state: "_SimState"):
+        """Close a position still open at the end of data on the last close."""
+        if state.open is not None:
+            direction = 1 if state.open["sig"] > 0 else -1
+            self._close_position(state, state.offset - 1, None, state.last_exit[direction])
+
+    def _simulate_loop(self, df: pd.DataFrame, initial_balance: float):
+        """Reference row-by-row simulation kept for parity checks (exact fills only)."""
+        if not self.fill_model.is_exact(df):
+            raise ValueError("The 'loop' simulation only models exact close / SL / TP fills; "
+                             "use 'vectorized' or 'multi' with a fill model or bid/ask data")
         trades = []
         balance = float(initial_balance)
+        self.risk_engine.reset(balance)
         i = 0
         n = len(df)
 
@@ -88,21 +534,18 @@ class BacktestEngine:
             # Use MES tick value from config (default 1.25)
             tick_value = float(getattr(self.system.exec, "tick_value", 1.25))
             pos_size = self.risk_engine.calculate_position_size(balance, stop_loss_ticks, tick_value=tick_value)
+            pos_size = self.risk_engine.apply_limits(pos_size)
+            if pos_size <= 0:
+                i += 1
+                continue
+            risk = pos_size * stop_loss_ticks * tick_value
+            self.risk_engine.on_open(pos_size, risk)
 
             # default exit to last row
             exit_price = float(df.iloc[-1].close)
             exit_idx = n - 1
 
             exit_reason = None
-            # print(f"\n[DEBUG] New trade: idx={i}, sig={sig}, entry={entry_price:.2f}, sl={sl:.2f}, tp={tp:.2f}, pos_size={pos_size}")
-            # # Print price action for this trade
-            # for j in range(i + 1, min(i + 21, n)):
-            #     fut = df.iloc[j]
-            #     low = _get(fut, "low", fut.close)
-            #     high = _get(fut, "high", fut.close)
-            #     close = _get(fut, "close", fut.close)
-            #     print(f"  idx={j} high={high:.2f} low={low:.2f} close={close:.2f}")
-            # print("  ... (showing up to 20 bars after entry)")
             for j in range(i + 1, n):
                 fut = df.iloc[j]
                 low = _get(fut, "low", fut.close)
@@ -134,6 +577,7 @@ class BacktestEngine:
             # MES PnL: (exit - entry) * contracts * (tick_value / tick_size)
             pnl = (exit_price - entry_price) * sig * pos_size * (tick_value / tick_size)
             balance += pnl
+            self.risk_engine.on_close(pos_size, pnl, risk)
 
             # Win is True if pnl > 0, else False
             win = pnl > 0
@@ -152,14 +596,16 @@ class BacktestEngine:
             # move to the next bar after the exit
             i = exit_idx + 1
 
-        total_pnl = sum(t["pnl"] for t in trades)
-        wins = sum(1 for t in trades if t["win"]) if trades else 0
+        return trades, balance
 
-        return {
-            "num_trades": len(trades),
-            "total_pnl": total_pnl,
-            "win_rate": wins / len(trades) if trades else 0.0,
-            "avg_pnl": total_pnl / len(trades) if trades else 0.0,
-            "ending_balance": balance,
-            "trades": trades,
-        }
+    def _summarize(self, trades, balance, initial_balance, total_bars=None):
+        """Summary metrics plus the trades, as trade dicts (``"trades"``) and a `TradeLedger` (``"ledger"``)."""
+        if not isinstance(trades, TradeLedger):
+            trades = TradeLedger.from_records(trades)
+        summary = {"initial_balance": float(initial_balance)}
+        summary.update(trades.stats(initial_balance, total_bars))
+        summary["ending_balance"] = balance
+        summary["blocked_entries"] = self.risk_engine.blocked_entries
+        summary["trades"] = trades.tolist()
+        summary["ledger"] = trades
+        return summary
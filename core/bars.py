@@ -0,0 +1,293 @@
+"""Higher-timeframe bar aggregates (5m, 15m, 1h, ...) built from the base bars.
+
+`build_views(df, ["5m", "1h"])` aggregates the base bars (generic OHLCV or the
+Kibot bid/ask frame, ask columns included) into one `TimeframeView` per
+timeframe. Bars are grouped into fixed, epoch-aligned buckets of the
+timeframe's width using the ``date`` (or ``timestamp``) column, with whole-array
+``reduceat`` calls: open / close are the first / last base values, high / low
+the NaN-ignoring max / min, volume the sum. Empty buckets produce no bar.
+
+Each view maps the base bars back to its bars:
+
+- ``bucket[i]``: the higher-timeframe bar that *contains* base bar ``i``. That
+  bar is still forming at ``i``, so reading its values at ``i`` looks ahead.
+- ``closed[i]``: the last higher-timeframe bar that is complete when base bar
+  ``i`` closes (-1 before the first one). A bucket is complete once a base bar
+  ending at or after the bucket's end has been seen, or once a bar of a later
+  bucket arrives. Values read through ``closed`` (see `TimeframeView.align`)
+  are what a live system would have known, so they are safe to forward-fill.
+
+With a file `source` the aggregates and index maps are stored as derived
+entries of the source in `core.price_cache.PriceCache`, so they are built
+once per file version and memory-mapped afterwards.
+
+`BarAggregator` builds the same bars incrementally, one base bar at a time in
+O(1), for live feeds: after feeding base bars ``0..i`` its completed bars
+equal ``view.bars[:view.closed[i] + 1]``.
+"""
+import re
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+_TIMEFRAME_RE = re.compile(r"^(\d+)\s*(s|m|min|h|d)$")
+_UNIT_NS = {"s": 1_000_000_000, "m": 60_000_000_000, "min": 60_000_000_000, "h": 3_600_000_000_000,
+            "d": 86_400_000_000_000}
+
+# How each column is aggregated; columns the base frame doesn't have are skipped
+AGGREGATIONS = {
+    "open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum",
+    "ask_open": "first", "ask_high": "max", "ask_low": "min", "ask_close": "last",
+}
+
+_INITIAL_CAPACITY = 1024
+
+
+def timeframe_ns(timeframe: str) -> int:
+    """Width of `timeframe` ("30s", "5m", "15min", "1h", "1d") in nanoseconds."""
+    match = _TIMEFRAME_RE.match(str(timeframe).strip().lower())
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f"Unknown timeframe '{timeframe}', expected e.g. '5m', '1h' or '1d'")
+    return int(match.group(1)) * _UNIT_NS[match.group(2)]
+
+
+def bar_dates(df: pd.DataFrame) -> np.ndarray:
+    """Bar start times of `df` as int64 nanoseconds (from `date` or `timestamp`)."""
+    for col in ("date", "timestamp"):
+        if col in df.columns:
+            return pd.to_datetime(df[col].to_numpy()).to_numpy(dtype="datetime64[ns]").view("int64")
+    raise ValueError("Timeframe aggregation needs a 'date' or 'timestamp' column")
+
+
+def infer_base_ns(dates: np.ndarray) -> int:
+    """Typical spacing of `dates` (median positive gap), used as the base bar width."""
+    gaps = np.diff(dates)
+    gaps = gaps[gaps > 0]
+    if not len(gaps):
+        raise ValueError("Can't infer the base timeframe from fewer than two distinct bar times")
+    return int(np.median(gaps))
+
+
+class TimeframeView:
+    """Bars of one higher timeframe plus their index maps back to the base bars."""
+
+    def __init__(self, timeframe: str, bars: pd.DataFrame, bucket: np.ndarray, closed: np.ndarray, base_ns: int):
+        self.timeframe = timeframe
+        self.bars = bars
+        self.bucket = bucket
+        self.closed = closed
+        self.base_ns = int(base_ns)
+
+    def __len__(self) -> int:
+        return len(self.bars)
+
+    def __repr__(self) -> str:
+        return f"TimeframeView({self.timeframe}, bars={len(self.bars)}, base_bars={len(self.closed)})"
+
+    def align(self, column: str, closed: bool = True) -> np.ndarray:
+        """`column` of this timeframe as a base-length float array.
+
+        With `closed` (default) each base bar sees the last completed bar (NaN
+        before the first); otherwise it sees the bar containing it, which looks
+        ahead within that bar.
+        """
+        values = pd.to_numeric(self.bars[column], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        index = self.closed if closed else self.bucket
+        out = values[np.maximum(index, 0)] if len(values) else np.full(len(index), np.nan)
+        if closed:
+            out[index < 0] = np.nan
+        return out
+
+
+def aggregate(df: pd.DataFrame, timeframe: str, base_ns: Optional[int] = None) -> TimeframeView:
+    """Aggregate the base bars of `df` to `timeframe` (see the module docstring)."""
+    width = timeframe_ns(timeframe)
+    dates = bar_dates(df)
+    n = len(dates)
+    if n and np.any(np.diff(dates) < 0):
+        raise ValueError("Timeframe aggregation needs bars in time order")
+    if base_ns is None:
+        base_ns = infer_base_ns(dates) if n > 1 else width
+    if base_ns > width:
+        raise ValueError(f"Timeframe {timeframe} is shorter than the base bars")
+
+    ids = dates // width
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if n else np.empty(0, dtype="int64")
+    ends = np.r_[starts[1:], n].astype("int64")
+    columns = {"date": (ids[starts] * width).astype("datetime64[ns]")}
+    for col, how in AGGREGATIONS.items():
+        if col not in df.columns:
+            continue
+        values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        if not n:
+            columns[col] = values
+        elif how == "first":
+            columns[col] = values[starts]
+        elif how == "last":
+            columns[col] = values[ends - 1]
+        elif how == "max":
+            columns[col] = np.fmax.reduceat(values, starts)
+        elif how == "min":
+            columns[col] = np.fmin.reduceat(values, starts)
+        else:
+            columns[col] = np.add.reduceat(np.nan_to_num(values), starts)
+    bars = pd.DataFrame(columns)
+
+    bucket = np.repeat(np.arange(len(starts), dtype="int64"), ends - starts)
+    complete = dates + base_ns >= (ids + 1) * width
+    closed = np.where(complete, bucket, bucket - 1)
+    return TimeframeView(timeframe, bars, bucket, closed, base_ns)
+
+
+def _view_entry_names(timeframe: str, base_ns: int):
+    name = f"timeframe:{timeframe}:{base_ns}"
+    return name, f"{name}:index"
+
+
+def build_views(df: pd.DataFrame, timeframes: Iterable[str], source: Optional[str] = None,
+                base_timeframe: Optional[str] = None, use_cache: bool = True,
+                cache_dir: Optional[str] = None) -> Dict[str, TimeframeView]:
+    """One `TimeframeView` per entry of `timeframes` for the base bars `df`.
+
+    With a file `source` (the file `df` was loaded from) the views go through
+    the price cache.
+    """
+    timeframes = list(timeframes or ())
+    if not timeframes:
+        return {}
+    base_ns = timeframe_ns(base_timeframe) if base_timeframe else infer_base_ns(bar_dates(df))
+    cache = None
+    if source is not None and use_cache:
+        from core.price_cache import PriceCache
+
+        cache = PriceCache(cache_dir)
+    views = {}
+    for tf in timeframes:
+        bars_name, index_name = _view_entry_names(tf, base_ns)
+        if cache is not None:
+            bars, index = cache.get_derived(source, bars_name), cache.get_derived(source, index_name)
+            if bars is not None and index is not None and len(index) == len(df):
+                views[tf] = TimeframeView(tf, bars, index["bucket"].to_numpy(), index["closed"].to_numpy(), base_ns)
+                continue
+        view = aggregate(df, tf, base_ns)
+        if cache is not None:
+            cache.put_derived(source, bars_name, view.bars)
+            cache.put_derived(source, index_name, pd.DataFrame({"bucket": view.bucket, "closed": view.closed}))
+        views[tf] = view
+    return views
+
+
+class BarAggregator:
+    """Incremental `aggregate` for live feeds: O(1) per base bar.
+
+    Completed bars are kept in arrays that double in capacity as they fill;
+    `frame()` returns them as a DataFrame and `current` holds the bar that is
+    still forming. `base_ns` defaults to the first positive gap between bars.
+    """
+
+    _COLUMNS = ("date",) + tuple(AGGREGATIONS)
+
+    def __init__(self, timeframe: str, base_ns: Optional[int] = None):
+        self.timeframe = timeframe
+        self.width = timeframe_ns(timeframe)
+        self.base_ns = base_ns
+        self.current: Optional[dict] = None
+        self._bucket = None
+        self._last_date = None
+        self._size = 0
+        self._columns = None
+        self._data = {col: np.empty(_INITIAL_CAPACITY, dtype="int64" if col == "date" else "float64")
+                      for col in self._COLUMNS}
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _date_ns(bar: dict) -> int:
+        value = bar.get("date", bar.get("timestamp"))
+        if value is None:
+            raise ValueError("Live bars need a 'date' or 'timestamp' to be aggregated")
+        if isinstance(value, pd.Timestamp):
+            return value.value
+        if isinstance(value, (int, np.integer)):
+            return int(value)  # already nanoseconds
+        return pd.Timestamp(value).value
+
+    def update(self, bar: dict) -> Optional[dict]:
+        """Add one base bar; returns the higher-timeframe bar it completed, if any."""
+        date = self._date_ns(bar)
+        if self._last_date is not None:
+            if date < self._last_date:
+                raise ValueError("Bars must arrive in time order")
+            if self.base_ns is None and date > self._last_date:
+                self.base_ns = date - self._last_date
+        self._last_date = date
+        if self._columns is None:
+            self._columns = [col for col in AGGREGATIONS if col in bar]
+
+        completed = None
+        bucket = date // self.width
+        if self.current is not None and bucket != self._bucket:
+            completed = self._close()
+        if self.current is None:
+            self._bucket = bucket
+            self.current = current = {"date": bucket * self.width}
+            for col in self._columns:
+                value = bar[col]
+                value = np.nan if value is None else float(value)
+                current[col] = (0.0 if value != value else value) if AGGREGATIONS[col] == "sum" else value
+        else:
+            current = self.current
+            for col in self._columns:
+                value = bar[col]
+                value = np.nan if value is None else float(value)
+                if value != value:  # NaN: only "last" takes it
+                    if AGGREGATIONS[col] == "last":
+                        current[col] = value
+                    continue
+                how = AGGREGATIONS[col]
+                if how == "last":
+                    current[col] = value
+                elif how == "max":
+                    if not value <= current[col]:  # also replaces a NaN high
+                        current[col] = value
+                elif how == "min":
+                    if not value >= current[col]:
+                        current[col] = value
+                elif how == "sum":
+                    current[col] += value
+        if self.base_ns is not None and date + self.base_ns >= (bucket + 1) * self.width:
+            completed = self._close()
+        return completed
+
+    def _close(self) -> dict:
+        bar = self.current
+        if self._size == len(self._data["date"]):
+            for col, values in self._data.items():
+                grown = np.empty(len(values) * 2, dtype=values.dtype)
+                grown[:self._size] = values[:self._size]
+                self._data[col] = grown
+        for col in self._COLUMNS:
+            if col in bar:
+                self._data[col][self._size] = bar[col]
+        self._size += 1
+        self.current = None
+        return bar
+
+    def frame(self) -> pd.DataFrame:
+        """Completed bars, same columns as `aggregate(...).bars` (views, no copies)."""
+        columns = {"date": self._data["date"][:self._size].view("datetime64[ns]")}
+        for col in self._columns or ():
+            columns[col] = self._data[col][:self._size]
+        return pd.DataFrame(columns, copy=False)
+
+    def last(self) -> Optional[dict]:
+        """The most recent completed bar."""
+        if not self._size:
+            return None
+        i = self._size - 1
+        bar = {"date": int(self._data["date"][i])}
+        for col in self._columns or ():
+            bar[col] = float(self._data[col][i])
+        return bar
@@ -1,7 +1,25 @@
+import numpy as np
 import pandas as pd
 
-def load_price_data(source: str = None):
-    """Load data from CSV, database, or API."""
+from core.price_cache import PriceCache
+from core.price_store import PriceStore
+
+def load_price_data(source: str = None, use_cache: bool = True, cache_dir: str = None, start=None, end=None):
+    """Load data from CSV, database, or API.
+
+    File sources are parsed once and then served from the columnar
+    `PriceCache` (memory-mapped, read-only columns) until the file changes.
+    Pass `use_cache=False` to always re-parse the source. A `PriceStore`
+    directory is read directly from its segments.
+
+    `start` / `end` restrict the bars to ``start <= time < end`` (by the
+    ``date`` / ``timestamp`` column); a store only reads the segments in range.
+    """
+    if PriceStore.is_store(source):
+        df = PriceStore(source).read(start, end)
+        print(f"Loaded {len(df)} bars from price store {source}")
+        return df
+
     if source is None:
         # mock data for testing
         df = pd.DataFrame({
@@ -10,26 +28,103 @@ def load_price_data(source: str = None):
         df["timestamp"] = pd.date_range("2024-01-01", periods=len(df), freq="1min")
         print("Loaded mock price data")
         return df
+
+    cache = PriceCache(cache_dir) if use_cache else None
+    if cache is not None:
+        df = cache.get(source)
+        if df is not None:
+            print(f"Loaded cached price data for {source}")
+            return time_window(df, start, end)
+
+    df = _parse_price_file(source)
+    if cache is not None:
+        cache.put(source, df)
+    return time_window(df, start, end)
+
+
+def time_window(df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """Rows of time-ordered `df` with ``start <= time < end`` (a positional slice, no copy)."""
+    if start is None and end is None:
+        return df
+    from core.bars import bar_dates
+
+    dates = bar_dates(df)
+    lo = int(np.searchsorted(dates, pd.Timestamp(start).value, side="left")) if start is not None else 0
+    hi = int(np.searchsorted(dates, pd.Timestamp(end).value, side="left")) if end is not None else len(df)
+    return df.iloc[lo:max(lo, hi)]
+
+
+def iter_price_chunks(source: str, chunk_size: int = 100_000, use_cache: bool = True, cache_dir: str = None,
+                      start=None, end=None):
+    """Yield consecutive DataFrame blocks of at most `chunk_size` rows from `source`.
+
+    Price stores and cached sources are sliced from the memory-mapped columns;
+    otherwise the file is streamed with `pd.read_csv(chunksize=...)`, so only
+    one block is held in memory at a time. `start` / `end` as in `load_price_data`.
+    """
+    if PriceStore.is_store(source):
+        yield from PriceStore(source).iter_chunks(start, end, chunk_size)
+        return
+    if use_cache:
+        df = PriceCache(cache_dir).get(source)
+        if df is not None:
+            df = time_window(df, start, end)
+            for i in range(0, len(df), chunk_size):
+                yield df.iloc[i:i + chunk_size]
+            return
+
+    if _is_kibot_bidask(source):
+        chunks = (_kibot_to_ohlcv(chunk) for chunk in
+                  pd.read_csv(source, names=KIBOT_BIDASK_COLUMNS, header=None, dtype=_KIBOT_DTYPES, chunksize=chunk_size))
     else:
-        # If the file is the Kibot bid/ask 1min format (no header, 10 columns), assign names and map to OHLCV
-        if source.endswith("IVE_bidask1min.txt"):
-            colnames = [
-                'Date', 'Time',
-                'BidOpen', 'BidHigh', 'BidLow', 'BidClose',
-                'AskOpen', 'AskHigh', 'AskLow', 'AskClose'
-            ]
-            df = pd.read_csv(source, names=colnames, header=None)
-            # Use Bid prices for OHLCV
-            df = df.rename(columns={
-                'BidOpen': 'open',
-                'BidHigh': 'high',
-                'BidLow': 'low',
-                'BidClose': 'close'
-            })
-            df = df[['open', 'high', 'low', 'close']].copy()
-            df['volume'] = 1000  # dummy volume
-            return df
-
-
-        return pd.read_csv(source)
+        chunks = pd.read_csv(source, chunksize=chunk_size)
+    if start is None and end is None:
+        yield from chunks
+        return
+    from core.bars import bar_dates
+
+    end_ns = pd.Timestamp(end).value if end is not None else None
+    for chunk in chunks:
+        window = time_window(chunk, start, end)
+        if len(window):
+            yield window
+        if end_ns is not None and len(chunk) and bar_dates(chunk)[-1] >= end_ns:
+            break  # the rest of the file is past `end`
+
+
+# Columns of Kibot's headerless bid/ask 1-minute files (Date is MM/DD/YYYY, Time HH:MM)
+KIBOT_BIDASK_COLUMNS = [
+    'Date', 'Time',
+    'BidOpen', 'BidHigh', 'BidLow', 'BidClose',
+    'AskOpen', 'AskHigh', 'AskLow', 'AskClose'
+]
+_KIBOT_DTYPES = {'Date': str, 'Time': str}
+
+
+def _is_kibot_bidask(source: str) -> bool:
+    return source.endswith("IVE_bidask1min.txt")
+
+
+def _kibot_to_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    # Bid prices are the OHLC columns; the ask side is kept for `core.fill_model`.
+    # The format has no volume, so none is invented.
+    return pd.DataFrame({
+        'date': pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%m/%d/%Y %H:%M').to_numpy(),
+        'open': df['BidOpen'].to_numpy(),
+        'high': df['BidHigh'].to_numpy(),
+        'low': df['BidLow'].to_numpy(),
+        'close': df['BidClose'].to_numpy(),
+        'ask_open': df['AskOpen'].to_numpy(),
+        'ask_high': df['AskHigh'].to_numpy(),
+        'ask_low': df['AskLow'].to_numpy(),
+        'ask_close': df['AskClose'].to_numpy(),
+    })
+
+
+def _parse_price_file(source: str) -> pd.DataFrame:
+    # If the file is the Kibot bid/ask 1min format (no header, 10 columns), assign names and map to OHLCV
+    if _is_kibot_bidask(source):
+        df = pd.read_csv(source, names=KIBOT_BIDASK_COLUMNS, header=None, dtype=_KIBOT_DTYPES)
+        return _kibot_to_ohlcv(df)
 
+    return pd.read_csv(source)
@@ -1,10 +1,16 @@
 
-import requests
+import asyncio
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from core.instrumentation import METRICS
+from core.token_manager import DEFAULT_RENEW_MARGIN, TokenManager
+from core.tradovate_client import DEFAULT_RETRIES, DEFAULT_TIMEOUT, TradovateClient, tradovate_base_url
 
 
 class ExecutionEngine:
-    def __init__(self, mode='backtest', tradovate_username=None, tradovate_password=None, tradovate_app_id=None, tradovate_app_secret=None, tradovate_demo=True):
+    def __init__(self, mode='backtest', tradovate_username=None, tradovate_password=None, tradovate_app_id=None, tradovate_app_secret=None, tradovate_demo=True,
+                 base_url=None, timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_RETRIES, order_workers=4, token_renew_margin=DEFAULT_RENEW_MARGIN):
         print("Initializing Execution Engine")
         self.mode = mode  # 'backtest', 'paper', or 'live'
         self.tradovate_username = tradovate_username
@@ -12,24 +18,88 @@ class ExecutionEngine:
         self.tradovate_app_id = tradovate_app_id
         self.tradovate_app_secret = tradovate_app_secret
         self.tradovate_demo = tradovate_demo
-        self.access_token = None
-        self.account_id = None
+        # `base_url` overrides the demo/live endpoint (e.g. a local mock server)
+        self.base_url = base_url or tradovate_base_url(tradovate_demo)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.order_workers = order_workers
+        self.token_renew_margin = token_renew_margin
+        self.tokens = None  # TokenManager, created on authentication
+        self._client = None
+        self._order_executor = None
         if self.mode in ['paper', 'live']:
             self._tradovate_authenticate()
 
+    @property
+    def client(self) -> TradovateClient:
+        """Pooled keep-alive HTTP client, created on first use."""
+        if self._client is None:
+            self._client = TradovateClient(self.base_url, timeout=self.timeout, max_retries=self.max_retries,
+                                           pool_maxsize=max(10, self.order_workers))
+        return self._client
+
+    @property
+    def access_token(self):
+        # Cached by the TokenManager and renewed in the background
+        return self.tokens.token if self.tokens else None
+
+    @property
+    def account_id(self):
+        return self.tokens.account_id if self.tokens else None
+
     def execute(self, signals):
+        """Send one order; `sl` / `tp` prices in `signals` are attached as a broker-side bracket.
+
+        Returns the broker reply (``orderId``, plus ``oso1Id`` / ``oso2Id`` for
+        brackets), ``{'simulated': True}`` in backtest mode, or a dict with
+        ``errorText`` (and ``status`` for HTTP errors) if the order wasn't accepted.
+        """
         if self.mode == 'backtest':
             print(f"Simulating trade execution: {signals}")
+            return {'simulated': True}
         elif self.mode in ['paper', 'live']:
             print(f"Sending order to Tradovate API: {signals}")
-            self._tradovate_send_order(signals)
+            return self._tradovate_send_order(signals)
         else:
             print(f"Unknown mode: {self.mode}")
+            return {'errorText': f'unknown mode {self.mode}'}
 
-    def _tradovate_authenticate(self):
-        base_url = 'https://demo.tradovateapi.com/v1' if self.tradovate_demo else 'https://live.tradovateapi.com/v1'
-        auth_url = f'{base_url}/auth/accesstokenrequest'
-        payload = {
+    def cancel(self, order_id):
+        """Cancel a working order (for a bracket entry, the broker cancels its exits too)."""
+        if self.mode == 'backtest':
+            return {'simulated': True}
+        if not self.access_token:
+            return {'errorText': 'not authenticated'}
+        try:
+            response = self.client.cancel_order(self.access_token, order_id)
+        except Exception as e:
+            return {'errorText': str(e)}
+        if response.status_code != 200:
+            return {'errorText': response.text, 'status': response.status_code}
+        return response.json()
+
+    def submit(self, signals) -> Future:
+        """Execute `signals` on a background worker and return immediately with a Future."""
+        if self._order_executor is None:
+            self._order_executor = ThreadPoolExecutor(max_workers=self.order_workers, thread_name_prefix='order')
+        return self._order_executor.submit(self.execute, signals)
+
+    async def execute_async(self, signals):
+        """Awaitable `execute` that doesn't block the running event loop."""
+        return await asyncio.wrap_future(self.submit(signals))
+
+    def close(self):
+        if self.tokens is not None:
+            self.tokens.stop()
+        if self._order_executor is not None:
+            self._order_executor.shutdown(wait=True)
+            self._order_executor = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def _auth_payload(self):
+        return {
             'name': self.tradovate_username,
             'password': self.tradovate_password,
             'appId': self.tradovate_app_id,
@@ -38,47 +108,42 @@ class ExecutionEngine:
             'sec': self.tradovate_app_secret,
             'deviceId': f'device_{int(time.time())}'
         }
+
+    def _tradovate_authenticate(self):
+        tokens = TokenManager(self.client, self._auth_payload, renew_margin=self.token_renew_margin)
         try:
-            response = requests.post(auth_url, json=payload)
-            if response.status_code == 200:
-                data = response.json()
-                self.access_token = data.get('accessToken')
+            if tokens.start():
+                self.tokens = tokens
                 print("Tradovate authentication successful.")
-                # Get account id
-                self.account_id = self._tradovate_get_account_id(base_url)
-            else:
-                print(f"Tradovate authentication failed: {response.status_code} {response.text}")
         except Exception as e:
             print(f"Tradovate authentication error: {e}")
 
-    def _tradovate_get_account_id(self, base_url):
+    def _tradovate_get_account_id(self, base_url=None):
         if not self.access_token:
             print("No access token. Cannot get account id.")
             return None
-        headers = {'Authorization': f'Bearer {self.access_token}'}
-        try:
-            response = requests.get(f'{base_url}/account/list', headers=headers)
-            if response.status_code == 200:
-                accounts = response.json()
-                if accounts:
-                    print(f"Tradovate accounts: {accounts}")
-                    return accounts[0]['id']
-            else:
-                print(f"Failed to get Tradovate accounts: {response.status_code} {response.text}")
-        except Exception as e:
-            print(f"Error getting Tradovate account id: {e}")
-        return None
+        if self.tokens.account_id is None:
+            try:
+                self.tokens.account_id = self.tokens.fetch_account_id()
+            except Exception as e:
+                print(f"Error getting Tradovate account id: {e}")
+        return self.tokens.account_id
+
+    @staticmethod
+    def bracket_payload(signals) -> dict:
+        """`bracket1` (take-profit limit) / `bracket2` (stop-loss stop) for a `placeOSO` request."""
+        exit_action = 'Sell' if signals.get('action', 'Buy') == 'Buy' else 'Buy'
+        brackets = {}
+        if signals.get('tp') is not None:
+            brackets['bracket1'] = {'action': exit_action, 'orderType': 'Limit', 'price': signals['tp']}
+        if signals.get('sl') is not None:
+            brackets['bracket2'] = {'action': exit_action, 'orderType': 'Stop', 'stopPrice': signals['sl']}
+        return brackets
 
     def _tradovate_send_order(self, signals):
         if not self.access_token or not self.account_id:
             print("Tradovate not authenticated or account id missing.")
-            return
-        base_url = 'https://demo.tradovateapi.com/v1' if self.tradovate_demo else 'https://live.tradovateapi.com/v1'
-        order_url = f'{base_url}/order/placeorder'
-        headers = {
-            'Authorization': f'Bearer {self.access_token}',
-            'Content-Type': 'application/json'
-        }
+            return {'errorText': 'not authenticated'}
         # Example: signals should contain symbol, action, quantity, orderType, price, etc.
         # You must adapt this to your signal structure
         order_payload = {
@@ -92,11 +157,26 @@ class ExecutionEngine:
         }
         # Remove None values
         order_payload = {k: v for k, v in order_payload.items() if v is not None}
+        # Entry + SL / TP in one request, so the exits live at the broker
+        brackets = self.bracket_payload(signals)
+        order_payload.update(brackets)
         try:
-            response = requests.post(order_url, json=order_payload, headers=headers)
+            with METRICS.timer("orders.round_trip"):
+                if brackets:
+                    response = self.client.place_oso(self.access_token, order_payload)
+                else:
+                    response = self.client.place_order(self.access_token, order_payload)
             if response.status_code == 200:
+                METRICS.count("orders.sent")
                 print("Order sent to Tradovate successfully.")
-            else:
-                print(f"Tradovate order failed: {response.status_code} {response.text}")
+                return response.json()
+            METRICS.count("orders.failed")
+            if response.status_code == 401:
+                # Token rejected (expired/revoked): renew in the background
+                self.tokens.refresh_soon()
+            print(f"Tradovate order failed: {response.status_code} {response.text}")
+            return {'errorText': response.text, 'status': response.status_code}
         except Exception as e:
+            METRICS.count("orders.errors")
             print(f"Error sending Tradovate order: {e}")
+            return {'errorText': str(e)}
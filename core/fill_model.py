@@ -0,0 +1,255 @@
+"""Bid/ask-aware fill prices for the backtest engines.
+
+The engines detect SL / TP touches; `FillModel` decides what those touches
+(and the entries) fill at:
+
+- quotes: with ``ask_open`` .. ``ask_close`` columns (Kibot bid/ask files) the
+  OHLC columns are the bid. Longs buy the ask and exit against the bid, shorts
+  sell the bid and exit against the ask. Without ask columns the OHLC prices
+  are treated as mid and ``spread_ticks`` builds a synthetic spread around them.
+- slippage: ``slippage_ticks`` against the trade on market entries, stop exits
+  and end-of-data closes (take-profits are limit orders and fill at the level).
+- gaps: with ``gap_fills`` an exit level the bar opens through fills at the open.
+- same-bar SL and TP: ``same_bar`` picks the winner ("sl", "tp", or "nearest"
+  to the bar open). With ``intrabar_data`` (lower-timeframe bars with a ``date``
+  column) the sub-bars of the ambiguous bar are scanned first and the rule
+  only settles what they can't.
+
+All per-bar prices are built once per frame by `prepare()` with whole-column
+NumPy operations. Entry prices, same-bar resolution and exit prices are then
+computed over arrays of trades (`entry_prices`, `resolve_exits`,
+`exit_prices`): the single-position engine prices all trades of a block in one
+pass after its touch search. Only bars where both levels are touched and
+`intrabar_data` is set are settled one at a time, by scanning their sub-bars.
+With the default config the fills are the exact bar / level prices the
+engines always used.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from core.instrumentation import METRICS
+
+SAME_BAR_RULES = ("sl", "tp", "nearest")
+
+ASK_COLUMNS = ("ask_open", "ask_high", "ask_low", "ask_close")
+
+
+def _optional_column(df: pd.DataFrame, col: str) -> Optional[np.ndarray]:
+    if col not in df.columns:
+        return None
+    if df[col].dtype == np.float64:
+        return df[col].to_numpy()  # read-only view, no copy
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _dates(df: pd.DataFrame) -> Optional[np.ndarray]:
+    if "date" not in df.columns:
+        return None
+    return pd.to_datetime(df["date"].to_numpy()).to_numpy(dtype="datetime64[ns]").view("int64")
+
+
+def _both_touched(high: np.ndarray, low: np.ndarray, k: int, sig: int, sl: float, tp: float) -> bool:
+    if sig > 0:
+        return bool(low[k] <= sl and high[k] >= tp)
+    return bool(high[k] >= sl and low[k] <= tp)
+
+
+class FillModel:
+    def __init__(self, tick_size: float = 0.25, spread_ticks: float = 0.0, slippage_ticks: float = 0.0,
+                 gap_fills: bool = False, same_bar: str = "sl", intrabar: Optional[pd.DataFrame] = None):
+        if same_bar not in SAME_BAR_RULES:
+            raise ValueError(f"Unknown same_bar rule '{same_bar}', expected one of {SAME_BAR_RULES}")
+        self.tick_size = float(tick_size)
+        self.half_spread = float(spread_ticks) * self.tick_size / 2
+        self.slippage = float(slippage_ticks) * self.tick_size
+        self.gap_fills = bool(gap_fills)
+        self.same_bar = same_bar
+        self._intrabar = None
+        if intrabar is not None:
+            self.set_intrabar(intrabar)
+
+    @classmethod
+    def from_config(cls, system) -> "FillModel":
+        """Build the model from `system.fill` (absent -> exact fills)."""
+        fill = getattr(system, "fill", None)
+        model = cls(
+            tick_size=getattr(system.exec, "tick_size", 0.25),
+            spread_ticks=getattr(fill, "spread_ticks", 0.0),
+            slippage_ticks=getattr(fill, "slippage_ticks", 0.0),
+            gap_fills=getattr(fill, "gap_fills", False),
+            same_bar=getattr(fill, "same_bar", "sl"),
+        )
+        intrabar_source = getattr(fill, "intrabar_data", None)
+        if intrabar_source:
+            from core.data_loader import load_price_data
+
+            model.set_intrabar(load_price_data(intrabar_source))
+        return model
+
+    def set_intrabar(self, df: pd.DataFrame):
+        """Use `df` (lower-timeframe bars with a `date` column) to settle same-bar SL / TP touches."""
+        dates = _dates(df)
+        if dates is None:
+            raise ValueError("Intrabar data needs a 'date' column to be matched to bars")
+        order = np.argsort(dates, kind="stable")
+        sub = df.iloc[order] if np.any(order != np.arange(len(order))) else df
+        close = _optional_column(sub, "close")
+        if close is None:
+            raise ValueError("Intrabar data needs a 'close' column")
+        bars = {"close": close}
+        for col in ("high", "low"):
+            values = _optional_column(sub, col)
+            bars[col] = close if values is None else np.where(np.isnan(values), close, values)
+        self._intrabar = self._quote_arrays(sub, bars)
+        self._intrabar["date"] = dates[order]
+
+    def is_exact(self, df: pd.DataFrame) -> bool:
+        """True when every fill on `df` is the plain bar / level price (the loop reference's model)."""
+        return (self.half_spread == 0 and self.slippage == 0 and not self.gap_fills and self.same_bar == "sl"
+                and self._intrabar is None and "ask_close" not in df.columns)
+
+    # -- per-bar arrays -------------------------------------------------------------
+
+    def _quote_arrays(self, df: pd.DataFrame, bars: dict) -> dict:
+        """Bid / ask side arrays; aliases the (NaN-filled) bar arrays when there is no spread."""
+        close, high, low = bars["close"], bars["high"], bars["low"]
+        open_ = _optional_column(df, "open")
+        if open_ is None:
+            open_ = np.broadcast_to(np.nan, close.shape)
+        ask = [_optional_column(df, col) for col in ASK_COLUMNS]
+        if ask[3] is not None:
+            ask_open, ask_high, ask_low, ask_close = ask
+            ask_high = ask_close if ask_high is None else np.where(np.isnan(ask_high), ask_close, ask_high)
+            ask_low = ask_close if ask_low is None else np.where(np.isnan(ask_low), ask_close, ask_low)
+            if ask_open is None:
+                ask_open = np.full(len(close), np.nan)
+            bid = (open_, high, low, close)
+            ask = (ask_open, ask_high, ask_low, ask_close)
+        elif self.half_spread:
+            bid = tuple(a - self.half_spread for a in (open_, high, low, close))
+            ask = tuple(a + self.half_spread for a in (open_, high, low, close))
+        else:
+            bid = ask = (open_, high, low, close)
+        # longs exit by selling the bid, shorts by buying the ask
+        return {
+            "long_open": bid[0], "long_high": bid[1], "long_low": bid[2], "sell_close": bid[3],
+            "short_open": ask[0], "short_high": ask[1], "short_low": ask[2], "buy_close": ask[3],
+        }
+
+    def prepare(self, df: pd.DataFrame, bars: dict) -> dict:
+        """Per-bar fill arrays for `df`, given the engine's `close` / `high` / `low` arrays."""
+        arrays = self._quote_arrays(df, bars)
+        if self._intrabar is not None:
+            dates = _dates(df)
+            if dates is None:
+                raise ValueError("Intrabar fills need a 'date' column in the price data")
+            sub_dates = self._intrabar["date"]
+            start = np.searchsorted(sub_dates, dates, side="left")
+            end = np.empty_like(start)
+            end[:-1] = start[1:]
+            if len(dates):
+                width = dates[-1] - dates[-2] if len(dates) > 1 else 0
+                end[-1] = np.searchsorted(sub_dates, dates[-1] + width, side="left") if width else len(sub_dates)
+            arrays["intrabar_start"], arrays["intrabar_end"] = start, end
+        return arrays
+
+    # -- fills over trades ------------------------------------------------------------
+    #
+    # Every method below takes one trade (scalars) or many (equal-length arrays of
+    # bar indices, directions and levels) and prices them in whole-array steps.
+
+    @staticmethod
+    def exit_side(arrays: dict, sig: int):
+        """(high, low) arrays the exits of a `sig` position trigger on."""
+        if sig > 0:
+            return arrays["long_high"], arrays["long_low"]
+        return arrays["short_high"], arrays["short_low"]
+
+    def entry_prices(self, arrays: dict, idx, direction):
+        """Market entries at the close of bars `idx` (`direction` +1 long / -1 short)."""
+        return np.where(np.asarray(direction) > 0, arrays["buy_close"][idx] + self.slippage,
+                        arrays["sell_close"][idx] - self.slippage)
+
+    def entry_price(self, arrays: dict, i: int, direction: int) -> float:
+        """Market entry at the close of bar `i`."""
+        return float(self.entry_prices(arrays, i, direction))
+
+    def resolve_exits(self, arrays: dict, j, direction, sl, tp, is_sl) -> np.ndarray:
+        """Whether each `first_touch` exit at bars `j` is the stop (`is_sl`, as reported by
+        `first_touch`, which says 'sl' when both levels are touched), after the same-bar rule."""
+        is_sl = np.asarray(is_sl, dtype=bool)
+        if self.same_bar == "sl" and self._intrabar is None:
+            return is_sl
+        j, direction = np.asarray(j), np.asarray(direction)
+        sl, tp = np.asarray(sl, dtype="float64"), np.asarray(tp, dtype="float64")
+        long = direction > 0
+        high = np.where(long, arrays["long_high"][j], arrays["short_high"][j])
+        low = np.where(long, arrays["long_low"][j], arrays["short_low"][j])
+        both = is_sl & np.where(long, (low <= sl) & (high >= tp), (high >= sl) & (low <= tp))
+        if not both.any():
+            return is_sl
+        METRICS.count("fills.same_bar", int(np.count_nonzero(both)))
+        resolved = np.array(is_sl, ndmin=1)
+        undecided = np.array(both, ndmin=1)
+        if self._intrabar is not None:
+            # Only the ambiguous bars are scanned, one sub-bar range each
+            for t in np.flatnonzero(undecided):
+                reason = self._intrabar_reason(arrays, int(np.ravel(j)[t]), int(np.ravel(direction)[t]),
+                                               float(np.ravel(sl)[t]), float(np.ravel(tp)[t]))
+                if reason is not None:
+                    METRICS.count("fills.intrabar_resolved")
+                    resolved[t] = reason == "sl"
+                    undecided[t] = False
+        if self.same_bar == "nearest":
+            # Assume the bar trades from its open to the nearer level first (ties and unknown opens: SL)
+            o = np.where(long, arrays["long_open"][j], arrays["short_open"][j])
+            sl_dist = np.where(long, o - sl, sl - o)
+            tp_dist = np.where(long, tp - o, o - tp)
+            nearest_sl = np.array(~((sl_dist > 0) & (tp_dist < sl_dist)), ndmin=1)
+            resolved[undecided] = nearest_sl[undecided]
+        else:
+            resolved[undecided] = self.same_bar == "sl"
+        return resolved.reshape(is_sl.shape)
+
+    def _intrabar_reason(self, arrays: dict, j: int, sig: int, sl: float, tp: float) -> Optional[str]:
+        """Which level the sub-bars of bar `j` reach first (None if they can't tell)."""
+        from core.backtest_engine import first_touch
+
+        lo, hi = int(arrays["intrabar_start"][j]), int(arrays["intrabar_end"][j])
+        sub_high, sub_low = self.exit_side(self._intrabar, sig)
+        sub_high, sub_low = sub_high[lo:hi], sub_low[lo:hi]
+        k, sub_reason = first_touch(sub_high, sub_low, 0, sig, sl, tp)
+        if k >= 0 and not _both_touched(sub_high, sub_low, k, sig, sl, tp):
+            return sub_reason
+        return None
+
+    def resolve(self, arrays: dict, j: int, sig: int, sl: float, tp: float, reason: Optional[str]) -> Optional[str]:
+        """Exit reason at bar `j` for one `first_touch` result."""
+        if reason != "sl":
+            return reason
+        return "sl" if self.resolve_exits(arrays, j, 1 if sig > 0 else -1, sl, tp, True) else "tp"
+
+    def exit_prices(self, arrays: dict, j, direction, is_sl, sl, tp):
+        """Fills of SL (`is_sl`) / TP exits at bars `j`: the level, adjusted for gaps and, on
+        stops, slippage."""
+        direction = np.asarray(direction)
+        level = np.where(is_sl, sl, tp)
+        if self.gap_fills:
+            o = np.where(direction > 0, arrays["long_open"][j], arrays["short_open"][j])
+            gap = (o - level) * direction
+            level = np.where(np.where(is_sl, gap < 0, gap > 0), o, level)
+        return np.where(is_sl, level - direction * self.slippage, level)
+
+    def exit_price(self, arrays: dict, j: int, direction: int, reason: Optional[str], sl: float, tp: float) -> float:
+        """Fill of one exit at bar `j`: see `exit_prices`; the closing quote when `reason` is None."""
+        if reason is None:
+            return self.close_price(arrays, j, direction)
+        return float(self.exit_prices(arrays, j, direction, reason == "sl", sl, tp))
+
+    def close_price(self, arrays: dict, j: int, direction: int) -> float:
+        """Market exit at the close of bar `j`."""
+        if direction > 0:
+            return float(arrays["sell_close"][j]) - self.slippage
+        return float(arrays["buy_close"][j]) + self.slippage
@@ -0,0 +1,314 @@
+"""Shared technical indicators in batch and streaming form.
+
+Every indicator comes in two flavours that produce identical numbers:
+
+- a vectorized batch function (`sma`, `ema`, `rsi`, `atr`, `rolling_min`,
+  `rolling_max`) for backtests over a full series, and
+- a stateful class (`SMA`, `EMA`, `RSI`, `ATR`, `RollingMin`, `RollingMax`)
+  whose `update(...)` costs O(1) per bar (amortized O(1) for min/max), for
+  live trading via a strategy's `on_live_tick` hook.
+
+Batch functions accept a pandas Series (returning a Series on the same index)
+or any array-like (returning a NumPy array). Values are NaN until `period`
+bars have been seen. A NaN input is handled as pandas does: windows that
+contain it are NaN (it never poisons later values); EMAs carry on across it.
+
+Simple moving averages are `pandas.Series.rolling(period).mean()`: a
+compensated (Kahan) sum over the window, adding the bar that enters and
+subtracting the one that leaves, so the error doesn't grow with the length of
+the series. `SMA` performs the same operations over a bounded window. EMAs
+follow `pandas.Series.ewm(alpha=..., adjust=False)`.
+"""
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+NAN = float("nan")
+
+
+def _as_array(values) -> np.ndarray:
+    if isinstance(values, pd.Series):
+        return values.to_numpy(dtype="float64")
+    return np.asarray(values, dtype="float64")
+
+
+def _wrap(result: np.ndarray, like):
+    if isinstance(like, pd.Series):
+        return pd.Series(result, index=like.index)
+    return result
+
+
+def _ema_alpha(period=None, alpha=None) -> float:
+    if alpha is None:
+        if period is None:
+            raise ValueError("Either `period` or `alpha` is required")
+        alpha = 2.0 / (period + 1)
+    return float(alpha)
+
+
+def _sma_array(x: np.ndarray, period: int) -> np.ndarray:
+    return pd.Series(x).rolling(period).mean().to_numpy()
+
+
+def _ema_array(x: np.ndarray, alpha: float, min_periods: int = 1) -> np.ndarray:
+    return pd.Series(x).ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean().to_numpy()
+
+
+def _gains_losses(x: np.ndarray):
+    delta = np.diff(x, prepend=np.nan)
+    # Matches `delta.where(delta > 0, 0)`: the first (NaN) delta counts as 0
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    return gain, loss
+
+
+def _rsi_from_averages(avg_gain, avg_loss, eps):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / (avg_loss + eps)
+        return 100 - (100 / (1 + rs))
+
+
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = np.concatenate(([np.nan], close[:-1]))
+    hl = high - low
+    hc = np.abs(high - prev_close)
+    lc = np.abs(low - prev_close)
+    tr = np.fmax(hl, np.fmax(hc, lc))
+    return tr
+
+
+# --- batch forms -----------------------------------------------------------
+
+def sma(values, period: int):
+    """Simple moving average over `period` bars."""
+    return _wrap(_sma_array(_as_array(values), period), values)
+
+
+def ema(values, period: int = None, alpha: float = None):
+    """Exponential moving average (`alpha` defaults to 2 / (period + 1))."""
+    return _wrap(_ema_array(_as_array(values), _ema_alpha(period, alpha)), values)
+
+
+def rsi(values, period: int = 14, method: str = "simple", eps: float = 0.0):
+    """Relative strength index.
+
+    `method="simple"` averages gains / losses with an SMA (the classic
+    `rolling(period).mean()` form used by the strategies); `method="wilder"`
+    uses Wilder's smoothing (EMA with alpha = 1 / period). `eps` is added to
+    the average loss to avoid division by zero.
+    """
+    gain, loss = _gains_losses(_as_array(values))
+    if method == "simple":
+        avg_gain, avg_loss = _sma_array(gain, period), _sma_array(loss, period)
+    elif method == "wilder":
+        avg_gain = _ema_array(gain, 1.0 / period, min_periods=period)
+        avg_loss = _ema_array(loss, 1.0 / period, min_periods=period)
+    else:
+        raise ValueError(f"Unknown RSI method '{method}'")
+    return _wrap(_rsi_from_averages(avg_gain, avg_loss, eps), values)
+
+
+def atr(high, low, close, period: int = 14, method: str = "wilder"):
+    """Average true range (`method` is "wilder" or "simple")."""
+    tr = _true_range(_as_array(high), _as_array(low), _as_array(close))
+    if method == "wilder":
+        out = _ema_array(tr, 1.0 / period, min_periods=period)
+    elif method == "simple":
+        out = _sma_array(tr, period)
+    else:
+        raise ValueError(f"Unknown ATR method '{method}'")
+    return _wrap(out, close)
+
+
+def rolling_min(values, period: int):
+    """Lowest value over the last `period` bars."""
+    x = _as_array(values)
+    return _wrap(pd.Series(x).rolling(period).min().to_numpy(), values)
+
+
+def rolling_max(values, period: int):
+    """Highest value over the last `period` bars."""
+    x = _as_array(values)
+    return _wrap(pd.Series(x).rolling(period).max().to_numpy(), values)
+
+
+# --- streaming forms -------------------------------------------------------
+
+class SMA:
+    """Streaming simple moving average; matches `sma()` exactly.
+
+    Keeps the last `period` inputs and updates a compensated running sum the
+    way `pandas.Series.rolling(period).mean()` does: the value leaving the
+    window is subtracted, then the new one added, each with its own Kahan
+    compensation term.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self._window = deque()
+        self._sum = 0.0
+        self._add_comp = 0.0
+        self._remove_comp = 0.0
+        self._nobs = 0      # non-NaN values in the window
+        self._neg = 0       # values with the sign bit set
+        self._same = 0      # consecutive equal inputs ending at `_last`
+        self._last = NAN
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        if len(self._window) == self.period:
+            old = self._window.popleft()
+            if old == old:
+                self._nobs -= 1
+                y = -old - self._remove_comp
+                t = self._sum + y
+                self._remove_comp = t - self._sum - y
+                self._sum = t
+                self._neg -= math.copysign(1.0, old) < 0
+        self._window.append(x)
+        if x == x:
+            self._nobs += 1
+            y = x - self._add_comp
+            t = self._sum + y
+            self._add_comp = t - self._sum - y
+            self._sum = t
+            self._neg += math.copysign(1.0, x) < 0
+            self._same = self._same + 1 if x == self._last else 1
+            self._last = x
+        self.value = self._mean()
+        return self.value
+
+    def _mean(self) -> float:
+        nobs = self._nobs
+        if nobs < self.period or nobs == 0:
+            return NAN
+        if self._same >= nobs:
+            return self._last  # a constant window is exactly its value
+        mean = self._sum / nobs
+        if (self._neg == 0 and mean < 0) or (self._neg == nobs and mean > 0):
+            return 0.0  # rounding can't flip the sign of a one-signed window
+        return mean
+
+
+class EMA:
+    """Streaming exponential moving average; matches `ema()` exactly."""
+
+    def __init__(self, period: int = None, alpha: float = None, min_periods: int = 1):
+        alpha = _ema_alpha(period, alpha)
+        # pandas converts `alpha` to a center of mass and back; use the alpha it ends up with
+        self._com = (1.0 - alpha) / alpha
+        self.alpha = 1.0 / (1.0 + self._com)
+        self.min_periods = max(1, min_periods)
+        self._mean = NAN
+        self._old_wt = 1.0
+        self._count = 0
+        self._nobs = 0
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        observed = x == x
+        if self._count == 0:
+            self._mean = x
+        elif self._mean == self._mean:
+            self._old_wt *= 1.0 - self.alpha  # a NaN input still ages the mean
+            if observed:
+                # pandas' weight for the new value, which at com == 1 makes up for NaNs skipped
+                new_wt = 1.0 - self._old_wt if self._com == 1 else self.alpha
+                if self._mean != x:
+                    self._mean = (self._old_wt * self._mean + new_wt * x) / (self._old_wt + new_wt)
+                self._old_wt = 1.0
+        elif observed:
+            self._mean = x
+        self._count += 1
+        self._nobs += observed
+        self.value = self._mean if self._nobs >= self.min_periods else NAN
+        return self.value
+
+
+class RSI:
+    """Streaming RSI; matches `rsi()` exactly for the same arguments."""
+
+    def __init__(self, period: int = 14, method: str = "simple", eps: float = 0.0):
+        if method == "simple":
+            self._gain, self._loss = SMA(period), SMA(period)
+        elif method == "wilder":
+            self._gain = EMA(alpha=1.0 / period, min_periods=period)
+            self._loss = EMA(alpha=1.0 / period, min_periods=period)
+        else:
+            raise ValueError(f"Unknown RSI method '{method}'")
+        self.eps = eps
+        self._prev = None
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        delta = 0.0 if self._prev is None else x - self._prev
+        self._prev = x
+        avg_gain = self._gain.update(delta if delta > 0 else 0.0)
+        avg_loss = self._loss.update(-delta if delta < 0 else 0.0)
+        self.value = float(_rsi_from_averages(np.float64(avg_gain), np.float64(avg_loss), self.eps))
+        return self.value
+
+
+class ATR:
+    """Streaming average true range; matches `atr()` exactly."""
+
+    def __init__(self, period: int = 14, method: str = "wilder"):
+        if method == "wilder":
+            self._avg = EMA(alpha=1.0 / period, min_periods=period)
+        elif method == "simple":
+            self._avg = SMA(period)
+        else:
+            raise ValueError(f"Unknown ATR method '{method}'")
+        self._prev_close = None
+        self.value = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tr = high - low
+        if self._prev_close is not None:
+            tr = max(tr, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self.value = self._avg.update(tr)
+        return self.value
+
+
+class _RollingExtreme:
+    def __init__(self, period: int, better):
+        self.period = period
+        self._better = better
+        self._window = deque()  # (index, value), values monotonic
+        self._last_nan = -period  # index of the newest NaN input
+        self._count = 0
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        if x != x:
+            self._last_nan = self._count
+        else:
+            while self._window and not self._better(self._window[-1][1], x):
+                self._window.pop()
+            self._window.append((self._count, x))
+        if self._window and self._window[0][0] <= self._count - self.period:
+            self._window.popleft()
+        self._count += 1
+        if self._count >= self.period:
+            # like pandas, a window holding a NaN has no value
+            self.value = NAN if self._last_nan > self._count - 1 - self.period else self._window[0][1]
+        return self.value
+
+
+class RollingMin(_RollingExtreme):
+    """Streaming rolling minimum (monotonic deque); matches `rolling_min()`."""
+
+    def __init__(self, period: int):
+        super().__init__(period, lambda kept, new: kept < new)
+
+
+class RollingMax(_RollingExtreme):
+    """Streaming rolling maximum (monotonic deque); matches `rolling_max()`."""
+
+    def __init__(self, period: int):
+        super().__init__(period, lambda kept, new: kept > new)
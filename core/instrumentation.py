@@ -0,0 +1,213 @@
+"""Process-wide timers and counters for the engines.
+
+The engines record into the shared `METRICS` registry::
+
+    from core.instrumentation import METRICS
+
+    with METRICS.timer("signals.generate"):
+        ...
+    METRICS.count("risk.position_size_calls")
+
+The registry starts disabled: `timer()` then hands back a shared no-op
+context manager and `count()` / `observe()` / `gauge()` return after a single
+attribute check, so instrumented hot paths cost next to nothing in normal
+runs. `enable()` it (``main.py --metrics PATH``) to collect, then read
+`snapshot()` or write it with `export_json()`.
+
+`Profiler` is the heavier opt-in capture mode (``main.py --profile DIR``):
+it wraps a run in cProfile and tracemalloc and writes the reports to disk.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from typing import Optional
+
+# Durations kept per timer for percentiles; totals / counts stay exact beyond it
+MAX_SAMPLES = 100_000
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("registry", "name", "start")
+
+    def __init__(self, registry: "MetricsRegistry", name: str):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _Series:
+    """Running count / total / min / max plus a bounded sample of durations."""
+
+    __slots__ = ("count", "total", "min", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.samples = []
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(value)
+
+    def summary(self) -> dict:
+        out = {"count": self.count, "total_s": self.total, "mean_s": self.total / self.count,
+               "min_s": self.min, "max_s": self.max}
+        import numpy as np
+
+        p50, p95, p99 = np.percentile(self.samples, [50, 95, 99])
+        out.update({"p50_s": float(p50), "p95_s": float(p95), "p99_s": float(p99)})
+        return out
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.timers = {}
+            self.counters = {}
+            self.gauges = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def timer(self, name: str):
+        """Context manager recording the wall time of its block under `name`."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def observe(self, name: str, seconds: float):
+        """Record one duration (e.g. a latency measured elsewhere)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            series = self.timers.get(name)
+            if series is None:
+                series = self.timers[name] = _Series()
+            series.add(seconds)
+
+    def count(self, name: str, n: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name: str, value: float):
+        """Set a point-in-time value (last write wins), e.g. a throughput."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.gauges[name] = value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "timers": {name: series.summary() for name, series in sorted(self.timers.items())},
+                "counters": dict(sorted(self.counters.items())),
+                "gauges": dict(sorted(self.gauges.items())),
+            }
+
+    def export_json(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
+
+    def report(self) -> str:
+        """Human-readable one-line-per-metric summary."""
+        snap = self.snapshot()
+        lines = []
+        for name, s in snap["timers"].items():
+            lines.append(f"{name:<32} n={s['count']:<8} total={s['total_s']:.4f}s "
+                         f"p50={s['p50_s'] * 1e3:.3f}ms p99={s['p99_s'] * 1e3:.3f}ms")
+        for name, value in snap["counters"].items():
+            lines.append(f"{name:<32} {value}")
+        for name, value in snap["gauges"].items():
+            lines.append(f"{name:<32} {value:,.2f}")
+        return "\n".join(lines)
+
+
+METRICS = MetricsRegistry()
+
+
+class Profiler:
+    """Capture a cProfile call profile and tracemalloc allocations for a block.
+
+    Writes ``profile.prof`` (load with `pstats` / snakeviz), ``profile.txt``
+    (top functions by cumulative time) and ``memory.txt`` (peak traced memory
+    and the top allocation sites) into `out_dir`.
+    """
+
+    def __init__(self, out_dir: str, top: int = 30, memory: bool = True):
+        self.out_dir = out_dir
+        self.top = top
+        self.memory = memory
+        self._profile: Optional[cProfile.Profile] = None
+
+    def __enter__(self):
+        os.makedirs(self.out_dir, exist_ok=True)
+        if self.memory:
+            tracemalloc.start()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self._profile.disable()
+        if self.memory:
+            # snapshot before the reporting below allocates anything
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        self._profile.dump_stats(os.path.join(self.out_dir, "profile.prof"))
+        text = io.StringIO()
+        pstats.Stats(self._profile, stream=text).sort_stats("cumulative").print_stats(self.top)
+        with open(os.path.join(self.out_dir, "profile.txt"), "w") as f:
+            f.write(text.getvalue())
+        if self.memory:
+            with open(os.path.join(self.out_dir, "memory.txt"), "w") as f:
+                f.write(f"current: {current / 1e6:.1f} MB\npeak: {peak / 1e6:.1f} MB\n\n")
+                for stat in snapshot.statistics("lineno")[:self.top]:
+                    f.write(f"{stat}\n")
+        print(f"Profile written to {self.out_dir}")
+        return False
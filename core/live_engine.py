@@ -0,0 +1,323 @@
+"""Event-driven live trading loop.
+
+`LiveEngine` pulls bars / ticks from an async feed and hands each one to the
+strategy's `on_live_tick(tick, state, system)` hook (see `strategies/base.py`).
+Returned orders are sized and checked by the `RiskEngine`, get SL / TP prices
+(sent as a broker-side bracket) and are queued for a dispatcher task. The
+dispatcher hands everything queued at that moment to an
+`core.order_manager.OrderManager` and flushes it on a worker thread, so
+orders that pile up during a slow broker round-trip go out coalesced and the
+feed loop is never blocked.
+
+With ``data.timeframes`` configured, every tick also updates one
+`core.bars.BarAggregator` per timeframe in O(1); strategies find them in
+``state["timeframes"]`` (completed bars via ``frame()`` / ``last()``, the
+forming bar as ``current``).
+
+`warmup` bars (e.g. the strategy's declared ``LOOKBACK`` of history before
+the feed starts) go through the strategy and the aggregators before the feed;
+orders they produce are dropped.
+
+Every queued order is tracked as an open position in the `RiskEngine`
+(``on_open``), so ``max_position_size`` counts the contracts still open. Each
+later tick checks the open positions' brackets against its high / low the way
+the backtest resolves exits (the stop wins a bar that touches both). A touched
+bracket closes the position (``on_close``) and its realized P&L updates the
+account balance and the RiskEngine's equity / drawdown, which size and gate
+the next orders. Orders the broker doesn't accept are released again.
+
+`ReplayFeed` replays a price file loaded through `load_price_data`, which
+lets the whole path (and its tick-to-order latency) run offline.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from core.bars import BarAggregator, timeframe_ns
+from core.data_loader import load_price_data
+from core.instrumentation import METRICS
+from core.order_manager import OrderManager
+
+
+class ReplayFeed:
+    """Async feed that replays a price file bar by bar.
+
+    `speed` is the number of bars per second to emit (None = as fast as
+    possible, still yielding to the event loop between bars). Each tick is a
+    dict of the row's columns plus its bar index under `idx`.
+    """
+
+    def __init__(self, source: Optional[str] = None, speed: Optional[float] = None, limit: Optional[int] = None, data=None):
+        self.source = source
+        self.speed = speed
+        self.limit = limit
+        self.data = data
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        df = self.data if self.data is not None else load_price_data(self.source)
+        if self.limit is not None:
+            df = df.iloc[:self.limit]
+        delay = 1.0 / self.speed if self.speed else 0.0
+        columns = list(df.columns)
+        for idx, values in enumerate(df.itertuples(index=False, name=None)):
+            tick = dict(zip(columns, values))
+            tick["idx"] = idx
+            yield tick
+            await asyncio.sleep(delay)
+
+
+class LatencyStats:
+    """Collects latency samples (nanoseconds) and summarizes them in microseconds."""
+
+    def __init__(self):
+        self.samples: List[int] = []
+
+    def add(self, ns: int):
+        self.samples.append(ns)
+
+    def summary(self) -> Dict[str, float]:
+        if not self.samples:
+            return {"count": 0}
+        data = sorted(self.samples)
+
+        def pct(p):
+            return data[min(len(data) - 1, int(p * len(data)))] / 1000.0
+
+        return {
+            "count": len(data),
+            "mean_us": sum(data) / len(data) / 1000.0,
+            "p50_us": pct(0.50),
+            "p95_us": pct(0.95),
+            "p99_us": pct(0.99),
+            "max_us": data[-1] / 1000.0,
+        }
+
+
+class LiveEngine:
+    def __init__(self, system, strategy_module, risk_engine, execution_engine, feed, strategy_kwargs: Optional[dict] = None,
+                 account_balance: float = 1000.0, max_workers: int = 4, warmup=None):
+        self.system = system
+        self.strategy_module = strategy_module
+        self.strategy_kwargs = strategy_kwargs or {}
+        self.risk_engine = risk_engine
+        self.execution_engine = execution_engine
+        self.feed = feed
+        self.account_balance = account_balance
+        self.max_workers = max_workers
+        self.order_manager = OrderManager(execution_engine)
+        self.state: Dict[str, Any] = {}
+        data_cfg = getattr(system, "data", None)
+        base = getattr(data_cfg, "base_timeframe", None)
+        self.timeframes = {tf: BarAggregator(tf, timeframe_ns(base) if base else None)
+                           for tf in getattr(data_cfg, "timeframes", None) or ()}
+        if self.timeframes:
+            self.state["timeframes"] = self.timeframes
+        self.warmup = warmup
+        self.positions: List[Dict[str, Any]] = []
+        self.realized_pnl = 0.0
+        self.closed_positions = 0
+        self.ticks = 0
+        self.orders_sent = 0
+        self.orders_rejected = 0
+        self.order_errors = 0
+        # tick received -> order queued, and tick received -> broker call returned
+        self.dispatch_latency = LatencyStats()
+        self.order_latency = LatencyStats()
+
+    def _prepare_order(self, order: dict, price: Optional[float] = None) -> Optional[dict]:
+        """Fill in defaults, bracket levels and size; return None if risk rejects the order.
+
+        Market orders without `sl` / `tp` get them from `price` (the tick's
+        close) as in the backtest: `stop_loss_ticks` away, and
+        `risk_to_reward` times that for the target.
+        """
+        order = dict(order)
+        order.setdefault("symbol", getattr(self.system.exec, "symbol", None))
+        stop_loss_ticks = order.get("stop_loss_ticks", getattr(self.system.risk, "stop_loss_ticks", 20))
+        if price is not None and order.get("orderType", "Market") == "Market":
+            direction = 1 if order.get("action", "Buy") == "Buy" else -1
+            distance = stop_loss_ticks * float(getattr(self.system.exec, "tick_size", 0.25))
+            rr = float(getattr(self.system.risk, "risk_to_reward", 2.0))
+            order.setdefault("sl", price - distance * direction)
+            order.setdefault("tp", price + distance * rr * direction)
+        if "quantity" not in order:
+            tick_value = float(getattr(self.system.exec, "tick_value", 1.25))
+            quantity = self.risk_engine.calculate_position_size(self.account_balance, stop_loss_ticks, tick_value=tick_value)
+            order["quantity"] = self.risk_engine.apply_limits(quantity)
+            if order["quantity"] <= 0:
+                return None
+        if not self.risk_engine.validate_trade(order):
+            return None
+        return order
+
+    def _open_position(self, order: dict, price: Optional[float]):
+        """Count a queued order as an open position (RiskEngine ``on_open``)."""
+        stop_loss_ticks = order.get("stop_loss_ticks", getattr(self.system.risk, "stop_loss_ticks", 20))
+        tick_value = float(getattr(self.system.exec, "tick_value", 1.25))
+        entry = order.get("price", price)
+        position = {
+            "order": order,
+            "direction": 1 if order.get("action", "Buy") == "Buy" else -1,
+            "entry": float(entry) if entry is not None else None,
+            "sl": order.get("sl"),
+            "tp": order.get("tp"),
+            "quantity": order["quantity"],
+            "risk": order["quantity"] * stop_loss_ticks * tick_value,
+        }
+        self.positions.append(position)
+        self.risk_engine.on_open(position["quantity"], position["risk"])
+
+    def _close_position(self, position: dict, exit_price: Optional[float] = None):
+        """Close `position` at `exit_price` (None: released without a fill, no P&L)."""
+        pnl = 0.0
+        if exit_price is not None:
+            tick_size = float(getattr(self.system.exec, "tick_size", 0.25))
+            tick_value = float(getattr(self.system.exec, "tick_value", 1.25))
+            pnl = (exit_price - position["entry"]) * position["direction"] * position["quantity"] * (tick_value / tick_size)
+            self.account_balance += pnl
+            self.realized_pnl += pnl
+            self.closed_positions += 1
+        self.risk_engine.on_close(position["quantity"], pnl, position["risk"])
+
+    def _release(self, order: dict):
+        """Drop the position of an order the broker didn't accept."""
+        for i, position in enumerate(self.positions):
+            if position["order"] is order:
+                del self.positions[i]
+                self._close_position(position)
+                return
+
+    def _check_exits(self, tick: dict):
+        """Close the open positions whose SL / TP the bar `tick` touches."""
+        if not self.positions:
+            return
+        close = tick.get("close")
+        high, low = tick.get("high", close), tick.get("low", close)
+        if high is None or low is None:
+            return
+        still_open = []
+        for position in self.positions:
+            sl, tp, entry = position["sl"], position["tp"], position["entry"]
+            exit_price = None
+            if entry is not None:
+                if position["direction"] > 0:
+                    if sl is not None and low <= sl:
+                        exit_price = sl
+                    elif tp is not None and high >= tp:
+                        exit_price = tp
+                else:
+                    if sl is not None and high >= sl:
+                        exit_price = sl
+                    elif tp is not None and low <= tp:
+                        exit_price = tp
+            if exit_price is None:
+                still_open.append(position)
+            else:
+                self._close_position(position, float(exit_price))
+        self.positions = still_open
+
+    async def _dispatch(self, queue: asyncio.Queue, executor: ThreadPoolExecutor):
+        loop = asyncio.get_running_loop()
+
+        async def send(batch):
+            try:
+                await loop.run_in_executor(executor, self.order_manager.flush, [managed for managed, _, _ in batch])
+            except Exception as e:
+                print(f"Order dispatch failed: {e}")
+            for managed, order, received_ns in batch:
+                if managed.status in ("working", "simulated"):
+                    self.orders_sent += 1
+                else:
+                    self.order_errors += 1
+                    self._release(order)
+                latency_ns = time.perf_counter_ns() - received_ns
+                self.order_latency.add(latency_ns)
+                METRICS.observe("live.tick_to_order", latency_ns / 1e9)
+
+        pending = set()
+        done = False
+        while not done:
+            items = [await queue.get()]
+            # everything queued meanwhile goes out in the same flush
+            while not queue.empty():
+                items.append(queue.get_nowait())
+            if items[-1] is None:
+                done = True
+                items.pop()
+            batch = [(self.order_manager.submit(order), order, received_ns) for order, received_ns in items]
+            if not batch:
+                continue
+            task = asyncio.ensure_future(send(batch))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+
+    def _warm_up(self, on_live_tick) -> int:
+        """Feed the `warmup` bars to the aggregators and the strategy, dropping their orders."""
+        if self.warmup is None or not len(self.warmup):
+            return 0
+        columns = list(self.warmup.columns)
+        n = len(self.warmup)
+        for idx, values in enumerate(self.warmup.itertuples(index=False, name=None)):
+            tick = dict(zip(columns, values))
+            tick["idx"] = idx - n
+            for aggregator in self.timeframes.values():
+                aggregator.update(tick)
+            on_live_tick(tick, self.state, self.system, **self.strategy_kwargs)
+        return n
+
+    async def run(self) -> Dict[str, Any]:
+        """Consume the feed until it ends; returns counters and latency summaries."""
+        on_live_tick = getattr(self.strategy_module, "on_live_tick", None)
+        if not callable(on_live_tick):
+            raise AttributeError(f"Strategy module {self.strategy_module.__name__} does not implement `on_live_tick`")
+        self.risk_engine.reset(self.account_balance)
+        warmup_bars = self._warm_up(on_live_tick)
+
+        queue: asyncio.Queue = asyncio.Queue()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="order") as executor:
+            dispatcher = asyncio.ensure_future(self._dispatch(queue, executor))
+            started = time.perf_counter()
+            async for tick in self.feed:
+                received_ns = time.perf_counter_ns()
+                self.ticks += 1
+                self._check_exits(tick)
+                for aggregator in self.timeframes.values():
+                    aggregator.update(tick)
+                order = on_live_tick(tick, self.state, self.system, **self.strategy_kwargs)
+                if not order:
+                    continue
+                order = self._prepare_order(order, tick.get("close"))
+                if order is None:
+                    self.orders_rejected += 1
+                    continue
+                self._open_position(order, tick.get("close"))
+                queue.put_nowait((order, received_ns))
+                self.dispatch_latency.add(time.perf_counter_ns() - received_ns)
+            queue.put_nowait(None)
+            await dispatcher
+            elapsed = time.perf_counter() - started
+        METRICS.count("live.ticks", self.ticks)
+        if elapsed > 0:
+            METRICS.gauge("live.ticks_per_sec", self.ticks / elapsed)
+
+        return {
+            "ticks": self.ticks,
+            "warmup_bars": warmup_bars,
+            "orders_sent": self.orders_sent,
+            "orders_rejected": self.orders_rejected,
+            "order_errors": self.order_errors,
+            "closed_positions": self.closed_positions,
+            "open_positions": len(self.positions),
+            "realized_pnl": self.realized_pnl,
+            "account_balance": self.account_balance,
+            "max_drawdown_pct": self.risk_engine.max_drawdown_seen,
+            "blocked_entries": self.risk_engine.blocked_entries,
+            "order_book": self.order_manager.stats(),
+            "elapsed_s": elapsed,
+            "ticks_per_sec": self.ticks / elapsed if elapsed > 0 else 0.0,
+            "tick_to_queue": self.dispatch_latency.summary(),
+            "tick_to_order": self.order_latency.summary(),
+        }
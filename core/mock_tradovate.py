@@ -0,0 +1,242 @@
+"""Local stand-in for the Tradovate REST API.
+
+`MockTradovateServer` runs a threaded HTTP/1.1 (keep-alive) server on
+localhost that mimics the endpoints `ExecutionEngine` uses:
+
+- ``POST /v1/auth/accesstokenrequest``
+- ``GET  /v1/auth/renewaccesstoken``
+- ``GET  /v1/account/list``
+- ``POST /v1/order/placeorder``
+- ``POST /v1/order/placeOSO`` (entry with ``bracket1`` / ``bracket2`` exits)
+- ``POST /v1/order/cancelorder``
+
+It records request counts and service times per endpoint (`stats()`), the
+number of TCP connections opened, and every order received, with its state
+in `order_status`. It can also inject latency and transient
+failures, and issue tokens with a short `token_ttl` (or revoke them with
+`expire_tokens()`), so connection reuse, timeouts, retries and token renewal
+can be exercised offline::
+
+    with MockTradovateServer(latency=0.01) as server:
+        engine = ExecutionEngine(mode='paper', base_url=server.base_url)
+        engine.execute({'symbol': 'MESZ5', 'action': 'Buy', 'quantity': 1})
+        print(server.request_counts, server.connections, server.stats())
+"""
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def setup(self):
+        super().setup()
+        self.server.mock._record_connection()
+
+    def log_message(self, format, *args):
+        pass  # keep test output quiet
+
+    def do_GET(self):
+        self.server.mock._handle(self, 'GET')
+
+    def do_POST(self):
+        self.server.mock._handle(self, 'POST')
+
+
+class MockTradovateServer:
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, account_id: int = 12345,
+                 token_ttl: float = 90 * 60):
+        self.latency = latency
+        self.account_id = account_id
+        self.token_ttl = token_ttl
+        self.tokens = {}  # token -> expiry (epoch seconds)
+        self._token_seq = 0
+        self.request_counts = Counter()
+        self.latencies = defaultdict(list)  # endpoint -> service times (seconds)
+        self.connections = 0
+        self.orders = []
+        self.order_status = {}  # orderId -> 'Working' / 'Canceled'
+        self._fail_next = Counter()
+        self._fail_status = 503
+        self._lock = threading.Lock()
+        self._order_seq = 0
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='mock-tradovate', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def fail_next(self, path: str, times: int = 1, status: int = 503):
+        """Answer the next `times` requests to `path` (e.g. '/account/list') with `status`."""
+        with self._lock:
+            self._fail_next[path] += times
+            self._fail_status = status
+
+    def expire_tokens(self):
+        """Invalidate every issued token, as if they had all lapsed."""
+        with self._lock:
+            for token in self.tokens:
+                self.tokens[token] = 0.0
+
+    def stats(self) -> dict:
+        """Per-endpoint request count and service time (ms), including injected latency."""
+        with self._lock:
+            samples = {path: sorted(values) for path, values in self.latencies.items()}
+        out = {}
+        for path, values in sorted(samples.items()):
+            out[path] = {
+                "count": len(values),
+                "mean_ms": sum(values) / len(values) * 1e3,
+                "p50_ms": values[len(values) // 2] * 1e3,
+                "max_ms": values[-1] * 1e3,
+            }
+        return out
+
+    def _record_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str):
+        start = time.perf_counter()
+        length = int(handler.headers.get('Content-Length') or 0)
+        body = handler.rfile.read(length) if length else b''
+        path = handler.path.split('?')[0]
+        if path.startswith('/v1'):
+            path = path[3:]
+        status, data = self._serve(handler, method, path, body)
+        # recorded before replying, so a client that saw the reply also sees the sample
+        with self._lock:
+            self.latencies[path].append(time.perf_counter() - start)
+        self._reply(handler, status, data)
+
+    def _serve(self, handler: BaseHTTPRequestHandler, method: str, path: str, body: bytes):
+        with self._lock:
+            self.request_counts[path] += 1
+            failing = self._fail_next[path] > 0
+            if failing:
+                self._fail_next[path] -= 1
+        if self.latency:
+            time.sleep(self.latency)
+        if failing:
+            return self._fail_status, {'errorText': 'injected failure'}
+
+        payload = json.loads(body) if body else None
+        route = self._routes().get((method, path))
+        if route is None:
+            return 404, {'errorText': f'unknown endpoint {method} {path}'}
+        return route(handler, payload)
+
+    def _routes(self):
+        return {
+            ('POST', '/auth/accesstokenrequest'): self._auth,
+            ('GET', '/auth/renewaccesstoken'): self._renew,
+            ('GET', '/account/list'): self._accounts,
+            ('POST', '/order/placeorder'): self._place_order,
+            ('POST', '/order/placeOSO'): self._place_oso,
+            ('POST', '/order/cancelorder'): self._cancel_order,
+        }
+
+    def _issue_token(self) -> dict:
+        with self._lock:
+            self._token_seq += 1
+            token = f'mock-token-{self._token_seq}'
+            expires = time.time() + self.token_ttl
+            self.tokens[token] = expires
+        expiration = datetime.fromtimestamp(expires, tz=timezone.utc).isoformat().replace('+00:00', 'Z')
+        return {'accessToken': token, 'expirationTime': expiration, 'userId': 1}
+
+    def _auth(self, handler, payload):
+        return 200, dict(self._issue_token(), name=(payload or {}).get('name'))
+
+    def _renew(self, handler, payload):
+        if not self._authorized(handler):
+            return 401, {'errorText': 'Access is denied'}
+        return 200, self._issue_token()
+
+    def _authorized(self, handler) -> bool:
+        header = handler.headers.get('Authorization', '')
+        if not header.startswith('Bearer '):
+            return False
+        with self._lock:
+            return self.tokens.get(header[len('Bearer '):], 0.0) > time.time()
+
+    def _accounts(self, handler, payload):
+        if not self._authorized(handler):
+            return 401, {'errorText': 'Access is denied'}
+        return 200, [{'id': self.account_id, 'name': 'DEMO'}]
+
+    def _place_order(self, handler, payload):
+        if not self._authorized(handler):
+            return 401, {'errorText': 'Access is denied'}
+        with self._lock:
+            order_id = self._new_order(payload)
+        return 200, {'orderId': order_id}
+
+    def _place_oso(self, handler, payload):
+        if not self._authorized(handler):
+            return 401, {'errorText': 'Access is denied'}
+        payload = dict(payload or {})
+        brackets = {key: payload.pop(key) for key in ('bracket1', 'bracket2') if key in payload}
+        if not brackets:
+            return 400, {'errorText': 'placeOSO needs bracket1 and/or bracket2'}
+        with self._lock:
+            reply = {'orderId': self._new_order(payload)}
+            for n, key in enumerate(sorted(brackets), start=1):
+                reply[f'oso{n}Id'] = self._new_order(dict(brackets[key], orderQty=payload.get('orderQty'),
+                                                          parentId=reply['orderId']))
+        return 200, reply
+
+    def _cancel_order(self, handler, payload):
+        if not self._authorized(handler):
+            return 401, {'errorText': 'Access is denied'}
+        order_id = (payload or {}).get('orderId')
+        with self._lock:
+            if self.order_status.get(order_id) != 'Working':
+                return 200, {'failureReason': 'UnknownReason', 'failureText': f'order {order_id} is not working'}
+            # Cancelling an OSO entry takes its brackets with it
+            for order in self.orders:
+                if order['orderId'] == order_id or order.get('parentId') == order_id:
+                    self.order_status[order['orderId']] = 'Canceled'
+        return 200, {'orderId': order_id}
+
+    def _new_order(self, payload) -> int:
+        # caller holds self._lock
+        self._order_seq += 1
+        self.orders.append(dict(payload or {}, orderId=self._order_seq))
+        self.order_status[self._order_seq] = 'Working'
+        return self._order_seq
+
+    def _reply(self, handler, status: int, data):
+        body = json.dumps(data).encode('utf-8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
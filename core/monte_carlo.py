@@ -0,0 +1,270 @@
+"""Batched price paths and a batched single-position simulator for ensembles.
+
+Paths are generated many at a time as ``(n_paths, n_bars)`` arrays from one
+`numpy.random.Generator` the caller owns (no global RNG state):
+
+- `random_walk_paths`: the random-walk OHLCV data `BacktestEngine.run` uses
+  when it is given no data.
+- `bootstrap_paths`: moving-block bootstrap of a real series. Blocks of
+  consecutive close-to-close changes are resampled and every bar keeps its
+  source bar's open / high / low offsets from the close, so paths stay on the
+  tick grid and keep the series' short-range structure.
+
+`simulate_paths` runs the single-position engine over a whole batch at once:
+one NumPy step per trade *across all paths* (next entry, sizing, drawdown
+limits, batched first-touch search for the exit) instead of one backtest per
+path. Its results equal `BacktestEngine` in ``"vectorized"`` mode with exact
+fills, path for path; `core.fill_model` options are not modelled here.
+"""
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+from core.backtest_engine import _column
+
+# First window of the batched first-touch search, doubled on every miss. Smaller
+# than the single-position engine's: each round gathers a window for every path.
+_FIRST_WINDOW = 16
+
+# Upper bound on (paths x bars) cells gathered per first-touch window
+_MAX_WINDOW_CELLS = 1 << 22
+
+PATH_COLUMNS = ("open", "high", "low", "close", "volume")
+
+RESULT_KEYS = ("num_trades", "total_pnl", "win_rate", "avg_pnl", "max_drawdown", "max_drawdown_pct", "exposure",
+               "ending_balance", "blocked_entries")
+
+
+def random_walk_paths(rng: np.random.Generator, n_paths: int, n_bars: int, start: float = 100.0) -> Dict[str, np.ndarray]:
+    """`n_paths` Gaussian random-walk OHLCV paths of `n_bars` bars each."""
+    shape = (n_paths, n_bars)
+    price = start + np.cumsum(rng.standard_normal(shape), axis=1)
+    return {
+        "open": price + rng.uniform(-0.5, 0.5, shape),
+        "high": price + rng.uniform(0, 1, shape),
+        "low": price - rng.uniform(0, 1, shape),
+        "close": price,
+        "volume": rng.integers(100, 1000, shape),
+    }
+
+
+def bootstrap_paths(rng: np.random.Generator, data: pd.DataFrame, n_paths: int, block: int = 100) -> Dict[str, np.ndarray]:
+    """`n_paths` moving-block bootstrap resamples of `data` (same length, same first close).
+
+    Also returns ``source``: the original bar each resampled bar was taken from.
+    """
+    close = _column(data, "close")
+    n = len(close)
+    if n < 2:
+        raise ValueError("Bootstrap needs at least two bars")
+    block = int(max(1, min(block, n - 1)))
+    diffs = np.diff(close)
+    n_blocks = -(-(n - 1) // block)
+    starts = rng.integers(0, n - block, size=(n_paths, n_blocks))
+    src = (starts[:, :, None] + np.arange(block)).reshape(n_paths, -1)[:, :n - 1]
+
+    paths = {"close": np.empty((n_paths, n), dtype="float64")}
+    paths["close"][:, 0] = close[0]
+    np.cumsum(diffs[src], axis=1, out=paths["close"][:, 1:])
+    paths["close"][:, 1:] += close[0]
+    source = np.empty((n_paths, n), dtype="int64")
+    source[:, 0] = 0
+    source[:, 1:] = src + 1  # diffs[k] moves the close from bar k to bar k + 1
+    for col in ("open", "high", "low"):
+        values = _column(data, col)
+        offset = np.where(np.isnan(values), 0.0, values - close)
+        paths[col] = paths["close"] + offset[source]
+    if "volume" in data.columns:
+        paths["volume"] = data["volume"].to_numpy()[source]
+    paths = {col: paths[col] for col in PATH_COLUMNS if col in paths}
+    paths["source"] = source
+    return paths
+
+
+def path_frame(paths: Dict[str, np.ndarray], p: int, dates=None) -> pd.DataFrame:
+    """Path `p` of a batch as an OHLCV DataFrame (column views, no copies)."""
+    columns = {}
+    if dates is not None:
+        columns["date"] = dates
+    for col in PATH_COLUMNS:
+        if col in paths:
+            columns[col] = paths[col][p]
+    return pd.DataFrame(columns, copy=False)
+
+
+def price_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """``close`` / ``high`` / ``low`` of one price frame, for prices shared by every path."""
+    return {col: _column(df, col) for col in ("close", "high", "low")}
+
+
+def stack_signals(frames: Iterable[pd.DataFrame], n_bars: int) -> Dict[str, np.ndarray]:
+    """Entries of per-path strategy outputs, flattened across the batch.
+
+    The engines only read ``sl`` / ``tp`` / ``stop_loss_ticks`` on signal bars,
+    so just those bars are kept: ``key`` (``path * n_bars + bar``, ascending)
+    plus the ``signal`` / ``sl`` / ``tp`` / ``stop_loss_ticks`` values there.
+    Memory grows with the number of entries, not paths x bars.
+    """
+    keys, columns = [], {"signal": [], "sl": [], "tp": [], "stop_loss_ticks": []}
+    n_paths = 0
+    for p, df in enumerate(frames):
+        n_paths += 1
+        if len(df) != n_bars:
+            raise ValueError(f"Strategy returned {len(df)} rows for a {n_bars}-bar path")
+        signal = np.nan_to_num(_column(df, "signal", 0.0), nan=0.0).astype("int64")
+        rows = np.flatnonzero(signal)
+        keys.append(rows + p * n_bars)
+        columns["signal"].append(signal[rows])
+        for col in ("sl", "tp", "stop_loss_ticks"):
+            if col in df.columns:
+                values = np.asarray(pd.to_numeric(df[col].to_numpy()[rows], errors="coerce"), dtype="float64")
+            else:
+                values = np.full(len(rows), np.nan)
+            columns[col].append(values)
+    out = {"n_paths": n_paths, "n_bars": n_bars,
+           "key": np.concatenate(keys) if keys else np.empty(0, dtype="int64")}
+    for col, parts in columns.items():
+        out[col] = np.concatenate(parts) if parts else np.empty(0, dtype="int64" if col == "signal" else "float64")
+    return out
+
+
+def _take(values: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """values[rows, cols] for per-path (2-D) arrays; values[cols] for prices shared by every path (1-D)."""
+    return values[cols] if values.ndim == 1 else values[rows, cols]
+
+
+def first_touch_paths(high: np.ndarray, low: np.ndarray, rows: np.ndarray, start: np.ndarray, sig: np.ndarray,
+                      sl: np.ndarray, tp: np.ndarray):
+    """`core.backtest_engine.first_touch` for many positions at once.
+
+    Position ``k`` lives on path ``rows[k]`` and is scanned from bar
+    ``start[k]``. Returns ``(index, is_sl)`` arrays; index is -1 where neither
+    level is reached. Every round gathers a window of bars for all unresolved
+    positions, and the window doubles each round.
+    """
+    n = high.shape[-1]
+    found = np.full(len(rows), -1, dtype="int64")
+    is_sl = np.zeros(len(rows), dtype=bool)
+    pos = np.asarray(start, dtype="int64").copy()
+    todo = np.flatnonzero(pos < n)
+    block = _FIRST_WINDOW
+    while todo.size:
+        block = max(1, min(block, n, _MAX_WINDOW_CELLS // todo.size))
+        cols = pos[todo, None] + np.arange(block)
+        valid = cols < n
+        np.minimum(cols, n - 1, out=cols)
+        r = rows[todo, None]
+        h, l = _take(high, r, cols), _take(low, r, cols)
+        long = (sig[todo] > 0)[:, None]
+        sl_k, tp_k = sl[todo, None], tp[todo, None]
+        sl_hit = np.where(long, l <= sl_k, h >= sl_k) & valid
+        tp_hit = np.where(long, h >= tp_k, l <= tp_k) & valid
+        hit = sl_hit | tp_hit
+        k = hit.argmax(axis=1)
+        got = hit[np.arange(todo.size), k]
+        done = todo[got]
+        found[done] = pos[done] + k[got]
+        is_sl[done] = sl_hit[got, k[got]]
+        pos[todo] += block
+        todo = todo[~got]
+        todo = todo[pos[todo] < n]
+        block *= 2
+    return found, is_sl
+
+
+def simulate_paths(prices: Dict[str, np.ndarray], signals: Dict[str, np.ndarray], risk_engine, trade_params,
+                   initial_balance: float = 1000.0) -> Dict[str, np.ndarray]:
+    """Single-position backtest of every path in a batch; returns per-path `RESULT_KEYS` arrays.
+
+    `prices` holds ``close`` / ``high`` / ``low`` either per path
+    (``(n_paths, n_bars)``) or shared by all paths (``(n_bars,)``, e.g. one
+    price series under many strategy seeds). `signals` comes from
+    `stack_signals`; `trade_params` is `core.backtest_engine.trade_params(config)`.
+    `risk_engine` sizes entries and applies its drawdown limits per path.
+    """
+    default_ticks, rr, tick_size, tick_value = trade_params
+    n_paths, n = signals["n_paths"], signals["n_bars"]
+    keys = signals["key"]
+    close = prices["close"]
+    high = np.where(np.isnan(prices["high"]), close, prices["high"])
+    low = np.where(np.isnan(prices["low"]), close, prices["low"])
+    last_close = np.broadcast_to(close[..., n - 1], (n_paths,)) if n else np.full(n_paths, np.nan)
+
+    balance = np.full(n_paths, float(initial_balance))
+    pnl_sum = np.zeros(n_paths)
+    peak = np.full(n_paths, float(initial_balance))      # peak of the ledger's equity curve
+    max_dd = np.zeros(n_paths)
+    max_dd_pct = np.zeros(n_paths)
+    risk_peak = np.full(n_paths, float(initial_balance))  # RiskEngine's running equity peak
+    risk_dd = np.zeros(n_paths)
+    trades = np.zeros(n_paths, dtype="int64")
+    wins = np.zeros(n_paths, dtype="int64")
+    held = np.zeros(n_paths, dtype="int64")
+    blocked = np.zeros(n_paths, dtype="int64")
+    next_free = np.zeros(n_paths, dtype="int64")
+
+    active = np.arange(n_paths) if len(keys) else np.empty(0, dtype="int64")
+    while active.size:
+        # next entry of each path at or after its first free bar
+        e = np.searchsorted(keys, active * n + next_free[active])
+        keep = (e < len(keys)) & (keys[np.minimum(e, len(keys) - 1)] < (active + 1) * n)
+        active, e = active[keep], e[keep]
+        if not active.size:
+            break
+        i = keys[e] - active * n
+        sig = signals["signal"][e]
+        direction = np.where(sig > 0, 1, -1)
+        entry = _take(close, active, i)
+        ticks = signals["stop_loss_ticks"][e]
+        ticks = np.trunc(np.where(np.isnan(ticks), default_ticks, ticks)).astype("int64")
+        sl = signals["sl"][e]
+        sl = np.where(np.isnan(sl), entry - ticks * tick_size * direction, sl)
+        tp = signals["tp"][e]
+        tp = np.where(np.isnan(tp), entry + ticks * tick_size * rr * direction, tp)
+
+        size = risk_engine.calculate_position_size(balance[active], ticks, tick_value=tick_value)
+        mult = risk_engine.size_multiplier(risk_dd[active])
+        size = np.where(mult < 1, np.maximum(1, (size * mult).astype("int64")), size)
+        stop = mult <= 0  # drawdown limit: entry blocked, try the next signal
+        blocked[active[stop]] += 1
+        next_free[active[stop]] = i[stop] + 1
+        go = ~stop
+        rows, i, sig, entry, sl, tp, size = active[go], i[go], sig[go], entry[go], sl[go], tp[go], size[go]
+
+        j, is_sl = first_touch_paths(high, low, rows, i + 1, sig, sl, tp)
+        open_at_end = j < 0
+        exit_idx = np.where(open_at_end, n - 1, j)
+        exit_price = np.where(open_at_end, last_close[rows], np.where(is_sl, sl, tp))
+        pnl = (exit_price - entry) * sig * size * (tick_value / tick_size)
+
+        balance[rows] += pnl
+        pnl_sum[rows] += pnl
+        equity = pnl_sum[rows] + initial_balance
+        peak[rows] = np.maximum(peak[rows], equity)
+        dd = peak[rows] - equity
+        worse = dd > max_dd[rows]
+        max_dd[rows[worse]] = dd[worse]
+        max_dd_pct[rows[worse]] = np.where(peak[rows[worse]] > 0, dd[worse] / peak[rows[worse]], 0.0)
+        risk_peak[rows] = np.maximum(risk_peak[rows], balance[rows])
+        risk_dd[rows] = np.where(risk_peak[rows] > 0, (risk_peak[rows] - balance[rows]) / risk_peak[rows], 0.0)
+        trades[rows] += 1
+        wins[rows] += pnl > 0
+        held[rows] += exit_idx - i
+        next_free[rows] = np.where(open_at_end, n, exit_idx + 1)
+        active = active[next_free[active] < n]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        win_rate = np.where(trades > 0, wins / trades, 0.0)
+        avg_pnl = np.where(trades > 0, pnl_sum / trades, 0.0)
+    return {
+        "num_trades": trades,
+        "total_pnl": pnl_sum,
+        "win_rate": win_rate,
+        "avg_pnl": avg_pnl,
+        "max_drawdown": max_dd,
+        "max_drawdown_pct": max_dd_pct,
+        "exposure": held / n if n else np.zeros(n_paths),
+        "ending_balance": balance,
+        "blocked_entries": blocked,
+    }
@@ -0,0 +1,191 @@
+"""Local order book and bracket / coalesced submission on top of `ExecutionEngine`.
+
+`OrderManager.submit(order)` records the order locally as ``pending``;
+`flush()` sends everything pending:
+
+- Orders with ``sl`` / ``tp`` prices go out as one bracket request (entry
+  plus its exits, Tradovate ``placeOSO``), so the protective exits rest at
+  the broker even if this process stops.
+- Pending orders that only differ in quantity (same symbol, side, type,
+  price and bracket levels) are coalesced into one request for the summed
+  quantity. Tradovate has no multi-order endpoint, so that is the only
+  batching available; the remaining requests run concurrently on the
+  engine's order workers over its keep-alive connection pool.
+
+Every order keeps its state locally (see `ORDER_STATES`) together with the
+broker ids, so callers can inspect `orders` / `open_orders()` or `cancel()`
+without asking the broker. Fills are not streamed by the REST API; call
+`mark_filled()` when a fill is known.
+"""
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional
+
+from core.instrumentation import METRICS
+
+# pending: queued locally; working: accepted by the broker; simulated: backtest-mode engine;
+# rejected: refused by the broker (4xx other than 401); failed: transport / auth error; cancelled; filled
+ORDER_STATES = ("pending", "working", "simulated", "rejected", "failed", "cancelled", "filled")
+
+
+class ManagedOrder:
+    __slots__ = ("local_id", "order", "status", "order_id", "bracket_ids", "submitted_at", "acked_at", "error", "batch")
+
+    def __init__(self, local_id: int, order: dict):
+        self.local_id = local_id
+        self.order = order
+        self.status = "pending"
+        self.order_id = None       # broker id of the entry order
+        self.bracket_ids = ()      # broker ids of the take-profit / stop-loss legs
+        self.submitted_at = time.time()
+        self.acked_at = None
+        self.error = None
+        self.batch = None          # local ids sent together in the same request
+
+    @property
+    def is_bracket(self) -> bool:
+        return self.order.get("sl") is not None or self.order.get("tp") is not None
+
+    def __repr__(self) -> str:
+        return f"ManagedOrder({self.local_id}, {self.status}, order_id={self.order_id})"
+
+
+def _coalesce_key(order: dict):
+    return (order.get("symbol"), order.get("action", "Buy"), order.get("orderType", "Market"), order.get("price"),
+            order.get("sl"), order.get("tp"))
+
+
+class OrderManager:
+    def __init__(self, execution_engine, coalesce: bool = True):
+        self.execution_engine = execution_engine
+        self.coalesce = coalesce
+        self.orders: Dict[int, ManagedOrder] = {}
+        self.requests = 0
+        self.coalesced = 0
+        self._pending: List[ManagedOrder] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, order: dict) -> ManagedOrder:
+        """Queue `order` (an `ExecutionEngine.execute` dict) until the next `flush()`."""
+        with self._lock:
+            managed = ManagedOrder(next(self._ids), dict(order))
+            self.orders[managed.local_id] = managed
+            self._pending.append(managed)
+        return managed
+
+    def flush(self, orders: Optional[List[ManagedOrder]] = None) -> List[ManagedOrder]:
+        """Send every pending order, or just the pending ones among `orders`, coalesced where
+        possible; returns them with their new state."""
+        with self._lock:
+            if orders is None:
+                pending, self._pending = self._pending, []
+            else:
+                chosen = {id(m) for m in orders}
+                pending = [m for m in self._pending if id(m) in chosen]
+                self._pending = [m for m in self._pending if id(m) not in chosen]
+        if not pending:
+            return []
+        groups: Dict[object, List[ManagedOrder]] = {}
+        for managed in pending:
+            key = _coalesce_key(managed.order) if self.coalesce else managed.local_id
+            groups.setdefault(key, []).append(managed)
+
+        batches = list(groups.values())
+        if len(batches) == 1 or not hasattr(self.execution_engine, "submit"):
+            for batch in batches:
+                self._send(batch)
+        else:
+            futures = [self.execution_engine.submit(self._request(batch)) for batch in batches]
+            for batch, future in zip(batches, futures):
+                try:
+                    reply = future.result()
+                except Exception as e:
+                    reply = {"errorText": str(e)}
+                self._record(batch, reply)
+        return pending
+
+    def _request(self, batch: List[ManagedOrder]) -> dict:
+        request = dict(batch[0].order)
+        if len(batch) > 1:
+            request["quantity"] = sum(m.order.get("quantity", 1) for m in batch)
+        return request
+
+    def _send(self, batch: List[ManagedOrder]):
+        try:
+            reply = self.execution_engine.execute(self._request(batch))
+        except Exception as e:
+            reply = {"errorText": str(e)}
+        self._record(batch, reply)
+
+    def _record(self, batch: List[ManagedOrder], reply: Optional[dict]):
+        reply = reply or {}
+        now = time.time()
+        if reply.get("simulated"):
+            status = "simulated"
+        elif reply.get("orderId") is not None and not reply.get("failureReason"):
+            status = "working"
+        elif reply.get("failureReason") or (400 <= int(reply.get("status", 0)) < 500 and reply.get("status") != 401):
+            status = "rejected"
+        else:
+            status = "failed"
+        bracket_ids = tuple(reply[k] for k in ("oso1Id", "oso2Id") if reply.get(k) is not None)
+        error = reply.get("errorText") or reply.get("failureText") or reply.get("failureReason")
+        ids = tuple(m.local_id for m in batch)
+        with self._lock:
+            self.requests += 1
+            self.coalesced += len(batch) - 1
+            for managed in batch:
+                managed.status = status
+                managed.order_id = reply.get("orderId")
+                managed.bracket_ids = bracket_ids
+                managed.acked_at = now
+                managed.error = error if status in ("rejected", "failed") else None
+                managed.batch = ids
+        METRICS.count("orders.requests")
+        if len(batch) > 1:
+            METRICS.count("orders.coalesced", len(batch) - 1)
+        if batch[0].is_bracket:
+            METRICS.count("orders.brackets")
+
+    def cancel(self, local_id: int) -> bool:
+        """Cancel a pending or working order; True if it is now cancelled.
+
+        A working order that was coalesced with others shares their broker
+        order, so the whole batch is cancelled.
+        """
+        with self._lock:
+            managed = self.orders[local_id]
+            if managed.status == "pending":
+                if managed not in self._pending:
+                    return False  # already handed to a flush in progress
+                self._pending.remove(managed)
+                managed.status = "cancelled"
+                return True
+            if managed.status not in ("working", "simulated"):
+                return False
+            batch = [self.orders[i] for i in (managed.batch or (local_id,))]
+        reply = self.execution_engine.cancel(managed.order_id) if managed.status == "working" else {"simulated": True}
+        if not reply or reply.get("errorText") or reply.get("failureReason"):
+            return False
+        with self._lock:
+            for m in batch:
+                m.status = "cancelled"
+        return True
+
+    def mark_filled(self, local_id: int):
+        with self._lock:
+            self.orders[local_id].status = "filled"
+
+    def open_orders(self) -> List[ManagedOrder]:
+        """Orders that are pending or resting at the broker."""
+        with self._lock:
+            return [m for m in self.orders.values() if m.status in ("pending", "working")]
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {state: 0 for state in ORDER_STATES}
+            for managed in self.orders.values():
+                counts[managed.status] += 1
+            return {"orders": len(self.orders), "requests": self.requests, "coalesced": self.coalesced, **counts}
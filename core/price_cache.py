@@ -0,0 +1,237 @@
+"""Columnar on-disk cache for parsed price files.
+
+The first `load_price_data(path)` call parses the source file as usual and
+writes every column to its own `.npy` file under ``<cache_dir>/<key>/``. Later
+loads memory-map those arrays (`np.load(mmap_mode="r")`), so a multi-GB file
+is available almost instantly and pages are only read when touched.
+
+Entries are keyed by the source's absolute path, mtime and size, so editing or
+replacing a file invalidates its entry automatically. Cached frames are
+read-only views; copy before modifying them in place.
+
+Several processes (e.g. sweep workers) may share one cache directory. An entry
+is written to a private temporary directory and renamed into place, so it
+appears complete or not at all, and an existing entry is never rewritten.
+Entries are removed by renaming them aside before deleting them. Readers that
+lose a race with a removal retry, then treat the entry as a miss (an entry
+that keeps failing to load is dropped). Frames that
+are already loaded stay valid, because a mapped file outlives its directory
+entry.
+
+Frames computed from a source (e.g. the higher-timeframe aggregates of
+`core.bars`) can be stored next to it as named *derived* entries
+(`get_derived` / `put_derived`); they share the source's fingerprint, so they
+go stale and are invalidated together with it.
+
+Command line helpers::
+
+    python -m core.price_cache list
+    python -m core.price_cache clear [SOURCE]
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_DIR = os.environ.get("FUTURES_PRICE_CACHE", os.path.join("data", "cache"))
+_META_FILE = "meta.json"
+# Bump when parsed frames change shape (e.g. new loader columns) so stale entries miss
+_FORMAT_VERSION = 2
+# Attempts of a read racing a concurrent removal before it counts as a miss
+_READ_ATTEMPTS = 3
+
+
+def _fingerprint(source: str) -> Dict[str, object]:
+    path = os.path.abspath(source)
+    st = os.stat(path)
+    return {"source": path, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def cache_key(source: str) -> str:
+    """Return the cache key for `source` (hash of absolute path, mtime, size and cache format)."""
+    fp = _fingerprint(source)
+    raw = f"{fp['source']}|{fp['mtime_ns']}|{fp['size']}|v{_FORMAT_VERSION}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def derived_key(source: str, name: str) -> str:
+    """Cache key of the derived frame `name` of `source` (changes whenever the source does)."""
+    raw = f"{cache_key(source)}|{name}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def _storable(series: pd.Series) -> Optional[np.ndarray]:
+    """Return a memory-mappable array for `series`, or None if it can't be stored losslessly."""
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufM":
+        return series.to_numpy()
+    if pd.api.types.is_string_dtype(dtype) and not series.isna().any():
+        # Fixed-width unicode keeps string columns (e.g. dates) mmap-able.
+        return np.asarray(series.to_numpy(dtype=object), dtype=str)
+    return None
+
+
+class PriceCache:
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, source: str) -> Optional[pd.DataFrame]:
+        """Return the cached frame for `source` (memory-mapped), or None on a miss."""
+        return self._read(cache_key(source))
+
+    def put(self, source: str, df: pd.DataFrame) -> bool:
+        """Store `df` as the cached copy of `source`. Returns False if it can't be cached."""
+        return self._write(source, cache_key(source), df)
+
+    def get_derived(self, source: str, name: str) -> Optional[pd.DataFrame]:
+        """Return the derived frame `name` of `source` (memory-mapped), or None on a miss."""
+        return self._read(derived_key(source, name))
+
+    def put_derived(self, source: str, name: str, df: pd.DataFrame) -> bool:
+        """Store `df` as the derived frame `name` of the current version of `source`."""
+        return self._write(source, derived_key(source, name), df, name)
+
+    def _read(self, key: str) -> Optional[pd.DataFrame]:
+        entry = self._entry_dir(key)
+        meta_path = os.path.join(entry, _META_FILE)
+        for attempt in range(_READ_ATTEMPTS):
+            if not os.path.exists(meta_path):
+                return None
+            try:
+                with open(meta_path, "r") as f:
+                    meta = json.load(f)
+                columns = {
+                    col["name"]: np.load(os.path.join(entry, col["file"]), mmap_mode="r")
+                    for col in meta["columns"]
+                }
+            except (OSError, ValueError):
+                # Removed (or replaced) by another process while loading
+                time.sleep(0.01 * (attempt + 1))
+                continue
+            return pd.DataFrame(columns, copy=False)
+        # Still unreadable: drop it so the next `put` writes a fresh entry
+        self._remove(key)
+        return None
+
+    def _write(self, source: str, key: str, df: pd.DataFrame, derived: Optional[str] = None) -> bool:
+        if not isinstance(df.index, pd.RangeIndex):
+            return False
+        arrays = {}
+        for name in df.columns:
+            arr = _storable(df[name])
+            if arr is None or not isinstance(name, str):
+                return False
+            arrays[name] = arr
+
+        fp = _fingerprint(source)
+        # Drop entries of older versions of the same file before writing
+        self._drop_stale(fp)
+        entry = self._entry_dir(key)
+        if os.path.exists(os.path.join(entry, _META_FILE)):
+            return True  # another process already wrote this version
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=f"{key}.tmp", dir=self.cache_dir)
+        columns = []
+        for i, (name, arr) in enumerate(arrays.items()):
+            fname = f"col{i}.npy"
+            np.save(os.path.join(tmp, fname), arr, allow_pickle=False)
+            columns.append({"name": name, "file": fname, "dtype": str(arr.dtype)})
+        meta = dict(fp, key=key, rows=len(df), columns=columns, created=time.time())
+        if derived is not None:
+            meta["derived"] = derived
+        with open(os.path.join(tmp, _META_FILE), "w") as f:
+            json.dump(meta, f, indent=2)
+        try:
+            os.replace(tmp, entry)
+        except OSError:
+            # Another process finished the same entry first; keep theirs.
+            shutil.rmtree(tmp, ignore_errors=True)
+        return True
+
+    def _remove(self, key: str):
+        """Delete entry `key`: renamed aside first, so readers never see it half-deleted."""
+        entry = self._entry_dir(key)
+        trash = f"{entry}.del{os.getpid()}_{time.monotonic_ns()}"
+        try:
+            os.rename(entry, trash)
+        except OSError:
+            return  # already gone
+        shutil.rmtree(trash, ignore_errors=True)
+
+    def _drop_stale(self, fp: Dict[str, object]):
+        """Remove the entries (plain and derived) of other versions of `fp`'s source file."""
+        for meta in self.list():
+            if meta["source"] != fp["source"]:
+                continue
+            if meta["mtime_ns"] != fp["mtime_ns"] or meta["size"] != fp["size"]:
+                self._remove(meta["key"])
+
+    def list(self) -> List[Dict[str, object]]:
+        """Return metadata for every cached dataset."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for key in sorted(os.listdir(self.cache_dir)):
+            if "." in key:
+                continue  # an entry being written or removed
+            meta_path = os.path.join(self.cache_dir, key, _META_FILE)
+            try:
+                with open(meta_path, "r") as f:
+                    meta = json.load(f)
+                meta["bytes"] = sum(
+                    os.path.getsize(os.path.join(self.cache_dir, key, c["file"])) for c in meta["columns"]
+                )
+            except (OSError, ValueError):
+                continue  # not an entry, or removed meanwhile
+            entries.append(meta)
+        return entries
+
+    def invalidate(self, source: Optional[str] = None) -> int:
+        """Remove cached entries for `source` (every version of it), or all entries if None.
+
+        Returns the number of entries removed.
+        """
+        target = os.path.abspath(source) if source else None
+        removed = 0
+        for meta in self.list():
+            if target is None or meta["source"] == target:
+                self._remove(meta["key"])
+                removed += 1
+        return removed
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or clear the price data cache")
+    parser.add_argument("--cache-dir", default=None, help="Cache directory (default: data/cache)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List cached datasets")
+    clear = sub.add_parser("clear", help="Invalidate cached datasets")
+    clear.add_argument("source", nargs="?", help="Only clear entries for this source file")
+    args = parser.parse_args(argv)
+
+    cache = PriceCache(args.cache_dir)
+    if args.command == "list":
+        entries = cache.list()
+        if not entries:
+            print("Price cache is empty")
+        for meta in entries:
+            derived = f" [{meta['derived']}]" if meta.get("derived") else ""
+            print(f"{meta['key']}  rows={meta['rows']}  size={meta['bytes'] / 1e6:.1f}MB  {meta['source']}{derived}")
+    else:
+        removed = cache.invalidate(args.source)
+        print(f"Removed {removed} cached dataset(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""Append-only, segmented price history with a time index.
+
+A store is a directory holding one instrument's bars::
+
+    <store>/manifest.json        column schema + one entry per segment
+    <store>/seg000000/<col>.npy  one array per column
+    <store>/seg000001/...
+
+Every `append` writes its new bars as a new segment and then swaps in the
+updated manifest, so existing segments are never rewritten and a reader sees
+either the old or the new set of segments. Bars that aren't newer than the
+store's last bar are skipped, so re-ingesting a grown history file only adds
+its new rows. The bar time column (``date`` or ``timestamp``) is stored as
+``datetime64[ns]``.
+
+The manifest keeps each segment's first / last bar time, so a range query
+binary-searches the segments and then the memory-mapped time column of the
+boundary segments: O(log n) in the number of bars, touching a few pages. Reads
+return memory-mapped, read-only columns; a range inside one segment is a
+zero-copy view, and `iter_chunks` yields zero-copy slices for any range.
+
+`core.data_loader.load_price_data` / `iter_price_chunks` accept a store
+directory as the data source, together with `start` / `end`.
+
+Command line helpers::
+
+    python -m core.price_store ingest STORE FILE [FILE ...]
+    python -m core.price_store info STORE
+
+Only one process should append to a store at a time.
+"""
+import json
+import os
+import shutil
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.price_cache import _storable
+
+MANIFEST_FILE = "manifest.json"
+_FORMAT_VERSION = 1
+
+
+def _to_ns(value) -> Optional[int]:
+    """Bar time bound (str / datetime / Timestamp / int ns) as int64 nanoseconds; None stays None."""
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return pd.Timestamp(value).value
+
+
+class PriceStore:
+    def __init__(self, root: str):
+        self.root = root
+        self._segments: List[Dict[str, object]] = []
+        self._columns: List[str] = []
+        self._time_column: Optional[str] = None
+        self._arrays: Dict[str, Dict[str, np.ndarray]] = {}
+        self._first = np.empty(0, dtype="int64")
+        self._last = np.empty(0, dtype="int64")
+        self._offsets = np.zeros(1, dtype="int64")
+        path = os.path.join(root, MANIFEST_FILE)
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                self._load_manifest(json.load(f))
+
+    @staticmethod
+    def is_store(path: Optional[str]) -> bool:
+        """True if `path` is a price store directory."""
+        return bool(path) and os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+    def _load_manifest(self, manifest: dict):
+        self._segments = manifest["segments"]
+        self._columns = manifest["columns"]
+        self._time_column = manifest["time_column"]
+        self._first = np.array([s["first_ns"] for s in self._segments], dtype="int64")
+        self._last = np.array([s["last_ns"] for s in self._segments], dtype="int64")
+        self._offsets = np.r_[0, np.cumsum([s["rows"] for s in self._segments], dtype="int64")]
+
+    def __len__(self) -> int:
+        return int(self._offsets[-1])
+
+    def __repr__(self) -> str:
+        return f"PriceStore({self.root}, rows={len(self)}, segments={len(self._segments)})"
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    @property
+    def segments(self) -> List[Dict[str, object]]:
+        return [dict(s) for s in self._segments]
+
+    @property
+    def start(self) -> Optional[pd.Timestamp]:
+        """Time of the first stored bar."""
+        return pd.Timestamp(int(self._first[0])) if len(self._first) else None
+
+    @property
+    def end(self) -> Optional[pd.Timestamp]:
+        """Time of the last stored bar."""
+        return pd.Timestamp(int(self._last[-1])) if len(self._last) else None
+
+    def append(self, df: pd.DataFrame) -> int:
+        """Store the bars of `df` that are newer than the last stored bar as a new segment.
+
+        `df` must be in time order and, after the first append, have the
+        store's columns. Returns the number of bars added.
+        """
+        from core.bars import bar_dates
+
+        time_column = "date" if "date" in df.columns else "timestamp"
+        dates = bar_dates(df)
+        if len(dates) > 1 and np.any(np.diff(dates) < 0):
+            raise ValueError("Bars must be in time order to be appended")
+        columns = [c for c in df.columns if c != time_column]
+        if self._segments:
+            if time_column != self._time_column or set(columns) != set(self._columns):
+                raise ValueError(f"Columns {[time_column] + columns} don't match the store's "
+                                 f"{[self._time_column] + self._columns}")
+            columns = self._columns
+        first_new = int(np.searchsorted(dates, self._last[-1], side="right")) if self._segments else 0
+        if first_new >= len(dates):
+            return 0
+
+        arrays = {time_column: dates[first_new:].view("datetime64[ns]")}
+        for col in columns:
+            arr = _storable(df[col])
+            if arr is None or not isinstance(col, str):
+                raise ValueError(f"Column {col!r} can't be stored")
+            arrays[col] = arr[first_new:]
+
+        os.makedirs(self.root, exist_ok=True)
+        name = f"seg{len(self._segments):06d}"
+        entry = os.path.join(self.root, name)
+        tmp = f"{entry}.tmp{os.getpid()}"
+        os.makedirs(tmp, exist_ok=True)
+        files = {}
+        for i, (col, arr) in enumerate(arrays.items()):
+            files[col] = f"col{i}.npy"
+            np.save(os.path.join(tmp, files[col]), arr, allow_pickle=False)
+        if os.path.exists(entry):
+            shutil.rmtree(entry)  # left behind by an append whose manifest update never happened
+        os.replace(tmp, entry)
+
+        segment = {"name": name, "rows": len(arrays[time_column]), "first_ns": int(dates[first_new]),
+                   "last_ns": int(dates[-1]), "files": files, "created": time.time()}
+        manifest = {"version": _FORMAT_VERSION, "time_column": time_column, "columns": columns,
+                    "segments": self._segments + [segment]}
+        tmp_manifest = os.path.join(self.root, f"{MANIFEST_FILE}.tmp{os.getpid()}")
+        with open(tmp_manifest, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_manifest, os.path.join(self.root, MANIFEST_FILE))
+        self._load_manifest(manifest)
+        return segment["rows"]
+
+    def ingest(self, source: str) -> int:
+        """Parse the price file `source` (any `load_price_data` format) and append its new bars."""
+        from core.data_loader import _parse_price_file
+
+        return self.append(_parse_price_file(source))
+
+    def _segment_arrays(self, i: int) -> Dict[str, np.ndarray]:
+        segment = self._segments[i]
+        arrays = self._arrays.get(segment["name"])
+        if arrays is None:
+            entry = os.path.join(self.root, segment["name"])
+            arrays = {col: np.load(os.path.join(entry, fname), mmap_mode="r") for col, fname in segment["files"].items()}
+            self._arrays[segment["name"]] = arrays
+        return arrays
+
+    def locate(self, start=None, end=None) -> List[Tuple[int, int, int]]:
+        """``(segment, lo, hi)`` row ranges holding the bars with ``start <= time < end``."""
+        start_ns, end_ns = _to_ns(start), _to_ns(end)
+        first = int(np.searchsorted(self._last, start_ns, side="left")) if start_ns is not None else 0
+        stop = int(np.searchsorted(self._first, end_ns, side="left")) if end_ns is not None else len(self._segments)
+        ranges = []
+        for i in range(first, stop):
+            rows = self._segments[i]["rows"]
+            lo, hi = 0, rows
+            if (start_ns is not None and start_ns > self._first[i]) or (end_ns is not None and end_ns <= self._last[i]):
+                times = self._segment_arrays(i)[self._time_column]
+                if start_ns is not None and start_ns > self._first[i]:
+                    lo = int(np.searchsorted(times, np.datetime64(start_ns, "ns"), side="left"))
+                if end_ns is not None and end_ns <= self._last[i]:
+                    hi = int(np.searchsorted(times, np.datetime64(end_ns, "ns"), side="left"))
+            if hi > lo:
+                ranges.append((i, lo, hi))
+        return ranges
+
+    def _frame(self, i: int, lo: int, hi: int) -> pd.DataFrame:
+        arrays = self._segment_arrays(i)
+        columns = {col: arrays[col][lo:hi] for col in [self._time_column] + self._columns}
+        return pd.DataFrame(columns, copy=False)
+
+    def read(self, start=None, end=None) -> pd.DataFrame:
+        """Bars with ``start <= time < end`` (either bound optional) as one frame.
+
+        Ranges inside one segment are memory-mapped views; ranges spanning
+        several segments are concatenated from the selected slices only.
+        """
+        ranges = self.locate(start, end)
+        if len(ranges) == 1:
+            return self._frame(*ranges[0])
+        if not ranges:
+            return pd.DataFrame({col: np.empty(0, dtype=self._dtype(col)) for col in [self._time_column] + self._columns})
+        parts = [self._frame(*r) for r in ranges]
+        return pd.DataFrame({col: np.concatenate([p[col].to_numpy() for p in parts]) for col in parts[0].columns})
+
+    def _dtype(self, col: str):
+        if col == self._time_column:
+            return "datetime64[ns]"
+        return self._segment_arrays(0)[col].dtype if self._segments else "float64"
+
+    def iter_chunks(self, start=None, end=None, chunk_size: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Yield the bars with ``start <= time < end`` as zero-copy slices of at most
+        `chunk_size` rows (default: one per segment)."""
+        for i, lo, hi in self.locate(start, end):
+            step = chunk_size or hi - lo
+            for a in range(lo, hi, step):
+                yield self._frame(i, a, min(a + step, hi))
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Append to or inspect a segmented price store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="Append the new bars of price files to a store")
+    ingest.add_argument("store")
+    ingest.add_argument("files", nargs="+")
+    info = sub.add_parser("info", help="List a store's segments")
+    info.add_argument("store")
+    args = parser.parse_args(argv)
+
+    store = PriceStore(args.store)
+    if args.command == "ingest":
+        for path in args.files:
+            added = store.ingest(path)
+            print(f"{path}: appended {added} bars ({len(store)} total)")
+    else:
+        if not PriceStore.is_store(args.store):
+            print(f"{args.store} is not a price store")
+            return
+        print(f"{store}  {store.start} .. {store.end}")
+        for s in store.segments:
+            print(f"  {s['name']}  rows={s['rows']}  {pd.Timestamp(s['first_ns'])} .. {pd.Timestamp(s['last_ns'])}")
+
+
+if __name__ == "__main__":
+    main()
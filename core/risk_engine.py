@@ -1,3 +1,19 @@
+import numpy as np
+
+from core.instrumentation import METRICS
+
+# How `max_drawdown` is enforced (RiskConfig.drawdown_mode):
+# - None: tracked and reported only
+# - "block": no new entries once drawdown from peak equity reaches max_drawdown
+# - "scale": entry size shrinks linearly with drawdown, reaching 0 at max_drawdown
+DRAWDOWN_MODES = (None, "block", "scale")
+
+
+def _bad_stop(stop_loss_ticks, tick_value):
+    raise ValueError(f"Position sizing needs a positive stop distance, got stop_loss_ticks={stop_loss_ticks} "
+                     f"with tick_value={tick_value}")
+
+
 class RiskEngine:
     def __init__(self, risk_config):
         print("Initializing Risk Engine")
@@ -6,15 +22,107 @@ class RiskEngine:
         self.max_position_size = risk_config.max_position_size
         self.risk_to_reward = risk_config.risk_to_reward
         self.stop_loss_ticks = risk_config.stop_loss_ticks
+        self.drawdown_mode = getattr(risk_config, "drawdown_mode", None)
+        if self.drawdown_mode not in DRAWDOWN_MODES:
+            raise ValueError(f"Unknown drawdown_mode '{self.drawdown_mode}', expected one of {DRAWDOWN_MODES}")
+        self.reset()
+
+    def reset(self, equity=None):
+        """Start tracking a new account / run from `equity`."""
+        self.equity = equity
+        self.peak_equity = equity
+        self.drawdown = 0.0          # current fraction below peak equity
+        self.max_drawdown_seen = 0.0
+        self.open_positions = 0
+        self.open_contracts = 0
+        self.open_risk = 0.0         # currency at risk to the stops of open positions
+        self.blocked_entries = 0
+
+    # -- portfolio state ---------------------------------------------------------
+
+    def update_equity(self, equity):
+        if self.peak_equity is None or equity > self.peak_equity:
+            self.peak_equity = equity
+        self.equity = equity
+        self.drawdown = (self.peak_equity - equity) / self.peak_equity if self.peak_equity > 0 else 0.0
+        if self.drawdown > self.max_drawdown_seen:
+            self.max_drawdown_seen = self.drawdown
+
+    def on_open(self, contracts, risk=0.0):
+        self.open_positions += 1
+        self.open_contracts += contracts
+        self.open_risk += risk
+
+    def on_close(self, contracts, pnl, risk=0.0):
+        self.open_positions -= 1
+        self.open_contracts -= contracts
+        self.open_risk -= risk
+        if self.equity is not None:
+            self.update_equity(self.equity + pnl)
+
+    def size_multiplier(self, drawdown=None):
+        """Fraction of the normal size allowed at `drawdown` (default: the current one).
+
+        Accepts scalars or arrays of drawdown fractions.
+        """
+        drawdown = self.drawdown if drawdown is None else drawdown
+        if self.drawdown_mode is None or not self.max_drawdown or self.max_drawdown <= 0:
+            return np.ones_like(drawdown, dtype="float64") if np.ndim(drawdown) else 1.0
+        if self.drawdown_mode == "block":
+            allowed = np.asarray(drawdown) < self.max_drawdown
+            return allowed.astype("float64") if np.ndim(drawdown) else float(allowed)
+        mult = np.clip(1.0 - np.asarray(drawdown, dtype="float64") / self.max_drawdown, 0.0, 1.0)
+        return mult if np.ndim(drawdown) else float(mult)
+
+    def apply_limits(self, contracts):
+        """Scale / block a sized entry for the current drawdown; 0 means no entry."""
+        mult = self.size_multiplier()
+        if mult <= 0:
+            self.blocked_entries += 1
+            METRICS.count("risk.blocked_entries")
+            return 0
+        if mult < 1:
+            contracts = max(1, int(contracts * mult))
+        return contracts
 
     def validate_trade(self, trade):
-        return True  # Simplified placeholder
-    
+        """Reject entries while drawdown limits block trading or when the order would
+        push open contracts past `max_position_size`."""
+        if self.size_multiplier() <= 0:
+            return False
+        quantity = trade.get("quantity", 0) if isinstance(trade, dict) else 0
+        return self.open_contracts + quantity <= self.max_position_size
+
+    # -- sizing ------------------------------------------------------------------
+
     def calculate_position_size(self, account_balance, stop_loss_ticks, tick_value=1.25):
+        """Contracts to trade so a stop-out loses `risk_per_trade` of the balance.
+
+        Scalars return an int. Arrays (of balances and/or stop distances, broadcast
+        together) return an int64 array, sizing many entries in one call. Both
+        raise ValueError unless every stop distance (`stop_loss_ticks *
+        tick_value`) is positive.
+        """
+        if np.ndim(account_balance) or np.ndim(stop_loss_ticks) or np.ndim(tick_value):
+            return self._position_sizes(account_balance, stop_loss_ticks, tick_value)
+        METRICS.count("risk.position_size_calls")
         # For MES: tick_size=0.25, tick_value=1.25, contract size is 1
         # Position size = contracts = floor((account_balance * risk_per_trade) / (stop_loss_ticks * tick_value))
         risk_amount = account_balance * self.risk_per_trade
         stop_loss_value = stop_loss_ticks * tick_value
+        if not stop_loss_value > 0:
+            _bad_stop(stop_loss_ticks, tick_value)
         contracts = int(risk_amount // stop_loss_value)
         contracts = max(1, min(contracts, self.max_position_size))
-        return contracts
\ No newline at end of file
+        return contracts
+
+    def _position_sizes(self, account_balance, stop_loss_ticks, tick_value):
+        risk_amount = np.asarray(account_balance, dtype="float64") * self.risk_per_trade
+        stop_loss_value = np.asarray(stop_loss_ticks, dtype="float64") * tick_value
+        bad = ~(stop_loss_value > 0)  # also catches NaN
+        if bad.any():
+            i = int(bad.ravel().argmax())
+            _bad_stop(np.broadcast_to(stop_loss_ticks, bad.shape).ravel()[i], np.broadcast_to(tick_value, bad.shape).ravel()[i])
+        contracts = np.floor_divide(risk_amount, stop_loss_value)
+        METRICS.count("risk.position_size_calls", int(contracts.size))
+        return np.maximum(1, np.minimum(contracts, self.max_position_size)).astype("int64")
@@ -0,0 +1,102 @@
+"""DataFrame columns published once in shared memory for worker processes.
+
+`SharedFrame.create(df)` copies each storable column (numeric, bool,
+datetime64 and fixed-width strings, as for the price cache) into a single
+`multiprocessing.shared_memory` block. Its small, picklable `spec` is all a
+worker needs to `attach` and build zero-copy DataFrame views with `frame()`,
+so large price frames are never pickled per task.
+
+The creating process owns the block: call `unlink()` there when done.
+Workers only `close()` their mapping.
+"""
+import sys
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.price_cache import _storable
+
+_ALIGN = 64
+
+
+def _attach_block(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Before 3.13 attaching also registers the block with the resource tracker.
+    # Pool workers share the creating process's tracker, where that's a no-op
+    # duplicate; the owner's `unlink()` clears it.
+    return shared_memory.SharedMemory(name=name)
+
+
+class SharedFrame:
+    def __init__(self, shm: shared_memory.SharedMemory, columns: List[dict], length: int, owner: bool):
+        self.shm = shm
+        self.columns = columns
+        self.length = length
+        self.owner = owner
+
+    @classmethod
+    def create(cls, df: pd.DataFrame) -> "SharedFrame":
+        """Copy `df`'s storable columns into a new shared-memory block.
+
+        Columns that can't be stored as fixed-width arrays are skipped with a
+        warning; the index is not kept (views get a fresh RangeIndex).
+        """
+        arrays = {}
+        for name in df.columns:
+            arr = _storable(df[name])
+            if arr is None:
+                print(f"Warning: column '{name}' ({df[name].dtype}) can't be shared; skipping it")
+                continue
+            arrays[str(name)] = np.ascontiguousarray(arr)
+
+        columns = []
+        offset = 0
+        for name, arr in arrays.items():
+            offset = -(-offset // _ALIGN) * _ALIGN
+            columns.append({"name": name, "dtype": arr.dtype.str, "offset": offset})
+            offset += arr.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        shared = cls(shm, columns, len(df), owner=True)
+        for col, arr in zip(columns, arrays.values()):
+            shared._array(col)[:] = arr
+        return shared
+
+    @classmethod
+    def attach(cls, spec: Dict) -> "SharedFrame":
+        return cls(_attach_block(spec["name"]), spec["columns"], spec["length"], owner=False)
+
+    @property
+    def spec(self) -> Dict:
+        """Picklable description used by `attach` in another process."""
+        return {"name": self.shm.name, "columns": self.columns, "length": self.length}
+
+    @property
+    def nbytes(self) -> int:
+        return self.shm.size
+
+    def __len__(self) -> int:
+        return self.length
+
+    def _array(self, col: dict) -> np.ndarray:
+        return np.ndarray((self.length,), dtype=np.dtype(col["dtype"]), buffer=self.shm.buf, offset=col["offset"])
+
+    def frame(self, start: int = 0, stop: Optional[int] = None) -> pd.DataFrame:
+        """Read-only DataFrame over rows `start:stop`, backed by the shared block (no copy)."""
+        columns = {}
+        for col in self.columns:
+            arr = self._array(col)[start:stop]
+            arr.flags.writeable = False
+            columns[col["name"]] = arr
+        return pd.DataFrame(columns, copy=False)
+
+    def close(self):
+        self.shm.close()
+
+    def unlink(self):
+        """Close and free the block (owner only)."""
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,266 @@
+"""Content-addressed on-disk cache for strategy signals.
+
+`generate_signals` only depends on the price data, the strategy code, its
+config and the seed, so its output columns (``signal``, ``sl``, ``tp`` and
+``stop_loss_ticks``) are cached under a hash of exactly those inputs:
+
+- the contents of the price columns handed to the strategy (its
+  ``REQUIRED_COLUMNS`` when declared, else every column; not the file they
+  came from)
+- the source of the strategy module and of the project modules it imports from
+- ``strategy`` config (name and ``params``), ``entry_prob`` and ``seed``
+- the higher-timeframe views handed to the strategy (timeframes and base bar
+  width; the views themselves are derived from the price frame)
+- the config paths listed in the module's ``CONFIG_DEPENDENCIES`` (e.g.
+  ``("exec.tick_size",)``); without that declaration the whole ``risk`` /
+  ``exec`` config is part of the key
+
+so a sweep over risk settings generates signals once. Strategies that set
+``RANDOM_SIGNALS = True`` are only cached when a seed is given.
+
+Entries are single uncompressed ``.npz`` files holding the rows where any
+signal column is set (entries are sparse) plus those rows' values. Hits
+refresh the file's mtime; once the cache grows past `max_bytes` the least
+recently used entries are evicted.
+
+Command line helpers::
+
+    python -m core.signal_cache list
+    python -m core.signal_cache clear
+"""
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.instrumentation import METRICS
+
+DEFAULT_CACHE_DIR = os.environ.get("FUTURES_SIGNAL_CACHE", os.path.join("data", "signal_cache"))
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+SIGNAL_COLUMNS = ("signal", "sl", "tp", "stop_loss_ticks")
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def data_fingerprint(df: pd.DataFrame) -> str:
+    """Hash of the frame's column names, dtypes and values (the index is ignored)."""
+    h = hashlib.sha256(f"{len(df)}".encode("utf-8"))
+    for name in df.columns:
+        series = df[name]
+        h.update(f"|{name}:{series.dtype}".encode("utf-8"))
+        dtype = series.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in "biufM":
+            h.update(np.ascontiguousarray(series.to_numpy()).view("uint8"))
+        else:
+            h.update(pd.util.hash_pandas_object(series, index=False).to_numpy().view("uint8"))
+    return h.hexdigest()
+
+
+def strategy_fingerprint(module) -> str:
+    """Hash of `module`'s source file and of the project modules its globals come from."""
+    modules = {module.__name__: module}
+    for obj in vars(module).values():
+        owner = obj if inspect.ismodule(obj) else sys.modules.get(getattr(obj, "__module__", None) or "")
+        if owner is not None:
+            modules.setdefault(owner.__name__, owner)
+    h = hashlib.sha256()
+    for name in sorted(modules):
+        path = getattr(modules[name], "__file__", None)
+        if not path or not os.path.abspath(path).startswith(_PROJECT_ROOT + os.sep):
+            continue
+        h.update(name.encode("utf-8"))
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _dump(value):
+    return value.model_dump() if hasattr(value, "model_dump") else value
+
+
+def _config_inputs(module, system) -> Dict[str, object]:
+    if system is None:
+        return {}
+    deps = getattr(module, "CONFIG_DEPENDENCIES", None)
+    if deps is None:
+        return {"risk": _dump(getattr(system, "risk", None)), "exec": _dump(getattr(system, "exec", None))}
+    inputs = {}
+    for path in deps:
+        value = system
+        for part in path.split("."):
+            value = getattr(value, part, None)
+        inputs[path] = _dump(value)
+    return inputs
+
+
+def signal_key(data: pd.DataFrame, module, system=None, params: Optional[dict] = None, seed: Optional[int] = None,
+               entry_prob: Optional[float] = None, timeframes: Optional[dict] = None) -> Optional[str]:
+    """Cache key for `module.generate_signals` on `data`, or None when its output isn't reproducible."""
+    if seed is None and getattr(module, "RANDOM_SIGNALS", False):
+        return None
+    strategy = getattr(system, "strategy", None)
+    payload = {
+        "data": data_fingerprint(data),
+        "module": module.__name__,
+        "source": strategy_fingerprint(module),
+        "strategy": _dump(strategy),
+        "params": params or {},
+        "config": _config_inputs(module, system),
+        "seed": seed,
+        "entry_prob": entry_prob,
+    }
+    if timeframes:
+        payload["timeframes"] = {tf: view.base_ns for tf, view in timeframes.items()}
+    raw = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class SignalCache:
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def get(self, key: str, n: int) -> Optional[Dict[str, np.ndarray]]:
+        """Dense signal columns for `key` (length `n`), or None on a miss."""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as entry:
+                if int(entry["n"]) != n:
+                    return None
+                rows = entry["rows"]
+                columns = {}
+                for name in SIGNAL_COLUMNS:
+                    if name not in entry.files:
+                        continue
+                    if name == "signal":
+                        dense = np.zeros(n, dtype="int64")
+                    else:
+                        dense = np.full(n, np.nan)
+                    dense[rows] = entry[name]
+                    columns[name] = dense
+            os.utime(path)  # LRU clock
+        except (OSError, KeyError, ValueError):
+            return None  # also if another process evicted the entry after it was read
+        return columns
+
+    def put(self, key: str, frame: pd.DataFrame) -> bool:
+        """Store the signal columns of `frame` under `key`. Returns False if there is nothing to store."""
+        if "signal" not in frame.columns:
+            return False
+        columns = {}
+        for name in SIGNAL_COLUMNS:
+            if name not in frame.columns:
+                continue
+            values = pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+            columns[name] = np.nan_to_num(values, nan=0.0).astype("int64") if name == "signal" else values
+        mask = columns["signal"] != 0
+        for name, values in columns.items():
+            if name != "signal":
+                mask |= ~np.isnan(values)
+        rows = np.flatnonzero(mask)
+        entry = {name: values[rows] for name, values in columns.items()}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp = f"{path}.tmp{os.getpid()}.npz"
+        np.savez(tmp, n=np.int64(len(frame)), rows=rows, **entry)
+        os.replace(tmp, path)
+        self.evict()
+        return True
+
+    def signals(self, module, data: pd.DataFrame, generate: Callable[[], pd.DataFrame], system=None,
+                params: Optional[dict] = None, seed: Optional[int] = None, entry_prob: Optional[float] = None,
+                timeframes: Optional[dict] = None, inputs: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """`generate()` (i.e. `module.generate_signals` on `data`) through the cache.
+
+        `inputs` are the columns of `data` the strategy actually reads (default:
+        all of `data`); only they are hashed. On a hit the cached signal
+        columns are returned on a shallow copy of `data`, on a miss the
+        strategy's own output; callers attach either to their frame with
+        `core.signal_engine.attach_signals`.
+        """
+        key = signal_key(data if inputs is None else inputs, module, system, params, seed, entry_prob, timeframes)
+        if key is not None:
+            cached = self.get(key, len(data))
+            if cached is not None:
+                METRICS.count("signals.cache_hits")
+                out = data.copy(deep=False)
+                for name, values in cached.items():
+                    out[name] = values
+                return out
+        out = generate()
+        if key is not None:
+            METRICS.count("signals.cache_misses")
+            self.put(key, out)
+        return out
+
+    def list(self) -> List[Dict[str, object]]:
+        """Return `{key, bytes, last_used}` for every entry, most recently used first."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".npz") or ".tmp" in name:
+                continue
+            try:
+                st = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append({"key": name[:-4], "bytes": st.st_size, "last_used": st.st_mtime})
+        return sorted(entries, key=lambda e: e["last_used"], reverse=True)
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Drop least recently used entries until the cache fits `max_bytes`; returns the number removed."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.list()
+        total = sum(e["bytes"] for e in entries)
+        removed = 0
+        while entries and total > limit:
+            oldest = entries.pop()
+            try:
+                os.remove(self._path(oldest["key"]))
+            except OSError:
+                pass
+            total -= oldest["bytes"]
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        return self.evict(0)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or clear the signal cache")
+    parser.add_argument("--cache-dir", default=None, help="Cache directory (default: data/signal_cache)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List cached signal sets")
+    sub.add_parser("clear", help="Remove every cached signal set")
+    args = parser.parse_args(argv)
+
+    cache = SignalCache(args.cache_dir)
+    if args.command == "list":
+        entries = cache.list()
+        if not entries:
+            print("Signal cache is empty")
+        for e in entries:
+            used = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(e["last_used"]))
+            print(f"{e['key']}  size={e['bytes'] / 1e3:.1f}kB  last used {used}")
+        print(f"{len(entries)} entries, {sum(e['bytes'] for e in entries) / 1e6:.1f}MB")
+    else:
+        print(f"Removed {cache.clear()} cached signal set(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,45 @@
-import importlib
+import inspect
+import numpy as np
 import pandas as pd
 from typing import Optional
 
+from core.indicators import sma
+from core.instrumentation import METRICS
+from core.signal_cache import SIGNAL_COLUMNS
+from strategies.registry import ENGINE_ARGUMENTS, get_strategy, strategy_handle
+
+
+def accepts(func, name: str) -> bool:
+    """True if `func` takes a `name` keyword argument (or arbitrary **kwargs)."""
+    params = inspect.signature(func).parameters
+    return name in params or any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values())
+
+
+def strategy_inputs(data: pd.DataFrame, handle) -> pd.DataFrame:
+    """The part of `data` a strategy is handed: its ``REQUIRED_COLUMNS`` when declared, else all of it."""
+    if handle is None or handle.required_columns is None:
+        return data
+    missing = [c for c in handle.required_columns if c not in data.columns]
+    if missing:
+        raise ValueError(f"Strategy '{handle.name}' needs columns {missing} the price data doesn't have")
+    return data[list(handle.required_columns)]
+
+
+def attach_signals(data: pd.DataFrame, out) -> pd.DataFrame:
+    """`data` plus the signal columns of the strategy output `out` (a frame or a dict of arrays).
+
+    `data` itself is never modified and its columns are not copied; the
+    result is a shallow frame sharing them.
+    """
+    frame = data.copy(deep=False)
+    for name in SIGNAL_COLUMNS:
+        if name in out:
+            values = np.asarray(out[name])
+            if len(values) != len(data):
+                raise ValueError(f"Strategy returned {len(values)} rows of '{name}' for {len(data)} bars")
+            frame[name] = pd.Series(values, index=frame.index, copy=False)  # assigning an ndarray would copy it
+    return frame
+
 
 class SignalEngine:
     def __init__(self, strategy: Optional[object] = None):
@@ -11,14 +49,15 @@ class SignalEngine:
         - a string strategy module name (e.g. "simple_random")
         - or a config/object describing strategy parameters (pydantic model or dict).
 
-        If a module name is provided the engine will import `strategies.<name>` and
-        delegate `generate_signals` to that module. If a config object is provided
+        If a module name is provided the engine will load `strategies.<name>` through
+        `strategies.registry` (imported and validated once per process) and delegate `generate_signals` to that module. If a config object is provided
         we will *not* attempt to import using its string representation (which caused
         ModuleNotFoundError in some cases); instead we store the params for use by
         callers or by live wiring.
         """
         print("Initializing Signal Engine")
         self.strategy_name = None
+        self.strategy = None
         self.strategy_module = None
         self.strategy_params = None
 
@@ -29,7 +68,8 @@ class SignalEngine:
         if isinstance(strategy, str):
             self.strategy_name = strategy
             try:
-                self.strategy_module = importlib.import_module(f"strategies.{strategy}")
+                self.strategy = get_strategy(strategy)
+                self.strategy_module = self.strategy.module
             except ModuleNotFoundError:
                 # Don't crash here; keep engine functional with fallback behavior.
                 print(f"Warning: strategy module 'strategies.{strategy}' not found. Using fallback signals.")
@@ -41,7 +81,8 @@ class SignalEngine:
         if isinstance(name, str) and name:
             self.strategy_name = name
             try:
-                self.strategy_module = importlib.import_module(f"strategies.{name}")
+                self.strategy = get_strategy(name)
+                self.strategy_module = self.strategy.module
             except ModuleNotFoundError:
                 print(f"Warning: strategy module 'strategies.{name}' not found. Using fallback signals.")
                 self.strategy_module = None
@@ -53,18 +94,54 @@ class SignalEngine:
         # We won't attempt to import a module using its repr (which caused the ModuleNotFoundError).
         self.strategy_params = strategy
 
-    def generate_signals(self, data: pd.DataFrame, system=None, entry_prob: float = 0.02, seed: Optional[int] = None) -> pd.DataFrame:
+    def generate_signals(self, data: pd.DataFrame, system=None, entry_prob: float = 0.02, seed: Optional[int] = None,
+                         timeframes: Optional[dict] = None) -> pd.DataFrame:
         """Return dataframe with `signal` column. If a strategy module is configured,
         delegate to its `generate_signals` function so the same strategy files can be used
         for both backtest and live (when appropriate).
+
+        `timeframes` (``core.bars.TimeframeView`` by name) is passed on to
+        strategies whose `generate_signals` accepts it. Strategies that declare
+        ``REQUIRED_COLUMNS`` only see those columns. `data` is handed over
+        read-only, without a copy; the strategy returns its new columns, which
+        are attached to a shallow frame of `data` for the result.
         """
-        if self.strategy_module and hasattr(self.strategy_module, "generate_signals"):
-            # Delegate to the strategy module's signal generator
-            return self.strategy_module.generate_signals(data.copy(), system=system, entry_prob=entry_prob, seed=seed)
+        METRICS.count("signals.bars", len(data))
+        with METRICS.timer("signals.generate"):
+            handle = self.handle
+            if handle is not None:
+                # Delegate to the strategy module's signal generator
+                kwargs = handle.kwargs(self.params())
+                if timeframes and handle.accepts_timeframes:
+                    kwargs["timeframes"] = timeframes
+                out = handle.generate_signals(strategy_inputs(data, handle), system=system, entry_prob=entry_prob,
+                                              seed=seed, **kwargs)
+                return attach_signals(data, out)
+
+            close = data['close'].to_numpy(dtype='float64')
+            ma = sma(close, 5)
+            return attach_signals(data, {'signal': (close > ma).astype('int64') - (close < ma).astype('int64')})
+
+    @property
+    def handle(self):
+        """Registry handle of the current strategy module (None without one)."""
+        if self.strategy_module is None:
+            return None
+        if self.strategy is None or self.strategy.module is not self.strategy_module:
+            self.strategy = strategy_handle(self.strategy_module)
+        return self.strategy
 
-        df = data.copy()
-        df['signal'] = 0
-        df.loc[df['close'] > df['close'].rolling(window=5).mean(), 'signal'] = 1
-        df.loc[df['close'] < df['close'].rolling(window=5).mean(), 'signal'] = -1
-        return df
+    def params(self) -> dict:
+        """The configured ``strategy.params`` (empty without any)."""
+        params = getattr(self.strategy_params, "params", None)
+        if params is None and isinstance(self.strategy_params, dict):
+            params = self.strategy_params.get("params")
+        return params or {}
 
+    def strategy_kwargs(self, func) -> dict:
+        """Return the `strategy.params` entries that `func` accepts as keyword arguments."""
+        params = self.params()
+        if not params:
+            return {}
+        accepted = inspect.signature(func).parameters
+        return {k: v for k, v in params.items() if k in accepted and k not in ENGINE_ARGUMENTS}
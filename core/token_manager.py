@@ -0,0 +1,139 @@
+"""Access-token lifecycle for the Tradovate API.
+
+`TokenManager` authenticates once, caches the access token, its expiry and
+the account id, and renews the token on a background thread `renew_margin`
+seconds before it lapses (via ``GET /auth/renewaccesstoken``, falling back to
+a full ``/auth/accesstokenrequest`` if renewal fails). Order code only reads
+`token` / `account_id`, which never touch the network, so concurrent orders
+don't pay for an auth round-trip on the hot path.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from core.instrumentation import METRICS
+
+# Tradovate tokens last ~90 minutes; used when a response has no expirationTime
+DEFAULT_TOKEN_TTL = 80 * 60
+DEFAULT_RENEW_MARGIN = 5 * 60
+RETRY_DELAY = 5.0
+
+
+def parse_expiration(value: Optional[str], now: float) -> float:
+    """Convert Tradovate's ISO `expirationTime` to an epoch timestamp."""
+    if not value:
+        return now + DEFAULT_TOKEN_TTL
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return now + DEFAULT_TOKEN_TTL
+
+
+class TokenManager:
+    def __init__(self, client, auth_payload: Callable[[], dict], renew_margin: float = DEFAULT_RENEW_MARGIN):
+        self.client = client
+        self.auth_payload = auth_payload
+        self.renew_margin = renew_margin
+        self.token: Optional[str] = None
+        self.expires_at: float = 0.0
+        self.issued_at: float = 0.0
+        self.account_id = None
+        self.renewals = 0
+        self.authentications = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def seconds_left(self) -> float:
+        return self.expires_at - time.time()
+
+    def start(self) -> bool:
+        """Authenticate, cache the account id and start background renewal.
+
+        Returns False (and starts nothing) if the initial authentication fails.
+        """
+        if not self.authenticate():
+            return False
+        if self.account_id is None:
+            self.account_id = self.fetch_account_id()
+        self._thread = threading.Thread(target=self._renew_loop, name='tradovate-token', daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def refresh_soon(self):
+        """Ask the background thread to renew now (e.g. after a 401); doesn't block."""
+        with self._lock:
+            self.expires_at = min(self.expires_at, time.time())
+        self._wake.set()
+
+    def authenticate(self) -> bool:
+        """Full credential authentication (blocking)."""
+        with METRICS.timer("auth.authenticate"):
+            response = self.client.authenticate(self.auth_payload())
+        if response.status_code != 200:
+            print(f"Tradovate authentication failed: {response.status_code} {response.text}")
+            return False
+        data = response.json()
+        if not data.get('accessToken'):
+            print(f"Tradovate authentication failed: {data.get('errorText', data)}")
+            return False
+        self._store(data)
+        self.authentications += 1
+        return True
+
+    def renew(self) -> bool:
+        """Renew the current token (blocking); falls back to full authentication."""
+        try:
+            with METRICS.timer("auth.renew"):
+                response = self.client.request('GET', '/auth/renewaccesstoken', token=self.token)
+            if response.status_code == 200 and response.json().get('accessToken'):
+                self._store(response.json())
+                self.renewals += 1
+                return True
+        except Exception as e:
+            print(f"Tradovate token renewal error: {e}")
+        try:
+            return self.authenticate()
+        except Exception as e:
+            print(f"Tradovate authentication error: {e}")
+            return False
+
+    def _store(self, data: dict):
+        with self._lock:
+            now = time.time()
+            self.token = data['accessToken']
+            self.issued_at = now
+            self.expires_at = parse_expiration(data.get('expirationTime'), now)
+
+    def fetch_account_id(self):
+        response = self.client.list_accounts(self.token)
+        if response.status_code == 200:
+            accounts = response.json()
+            if accounts:
+                print(f"Tradovate accounts: {accounts}")
+                return accounts[0]['id']
+        else:
+            print(f"Failed to get Tradovate accounts: {response.status_code} {response.text}")
+        return None
+
+    def _renew_loop(self):
+        while not self._stop.is_set():
+            # Never renew later than halfway through a (short-lived) token
+            margin = min(self.renew_margin, (self.expires_at - self.issued_at) / 2)
+            wait = self.expires_at - margin - time.time()
+            if wait > 0:
+                self._wake.wait(wait)
+                self._wake.clear()
+                continue
+            if not self.renew():
+                self._stop.wait(RETRY_DELAY)
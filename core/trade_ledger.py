@@ -0,0 +1,169 @@
+"""Columnar trade ledger.
+
+`TradeLedger` stores closed trades in a preallocated typed NumPy record
+array that doubles in capacity as it fills (~50 bytes per trade instead of a
+~600 byte dict). It still behaves like the list of trade dicts the engines
+used to return -- ``len``, indexing, iteration and ``==`` against a list all
+work on dicts with the same keys -- while stats are computed over whole
+columns and `to_frame()` wraps the column views in a DataFrame without
+copying them.
+
+It is not a list, though, so backtest results keep ``trades`` as the plain
+list of trade dicts (`tolist()`, JSON serializable) and carry the ledger
+itself under ``ledger``.
+"""
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+TRADE_FIELDS = ("entry_idx", "exit_idx", "entry", "exit", "pnl", "pos_size", "win", "exit_reason")
+
+# `exit_reason` is stored as a code into this tuple; -1 means None (closed at end of data)
+EXIT_REASONS = ("sl", "tp")
+
+_DTYPE = np.dtype([
+    ("entry_idx", "int64"),
+    ("exit_idx", "int64"),
+    ("entry", "float64"),
+    ("exit", "float64"),
+    ("pnl", "float64"),
+    ("pos_size", "int64"),
+    ("win", "bool"),
+    ("exit_reason", "int8"),
+])
+_REASON_CODES = {reason: code for code, reason in enumerate(EXIT_REASONS)}
+
+_INITIAL_CAPACITY = 1024
+
+
+class TradeLedger:
+    __slots__ = ("_rows", "_size")
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY):
+        # One packed record per trade: a single tuple store per append, and
+        # each field is still available as a (strided) column view.
+        self._rows = np.empty(max(1, int(capacity)), dtype=_DTYPE)
+        self._size = 0
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "TradeLedger":
+        """Build a ledger from trade dicts (e.g. the reference loop's output)."""
+        records = list(records)
+        ledger = cls(len(records))
+        for t in records:
+            ledger.append(t["entry_idx"], t["exit_idx"], t["entry"], t["exit"], t["pnl"], t["pos_size"], t["exit_reason"])
+        return ledger
+
+    @property
+    def capacity(self) -> int:
+        return len(self._rows)
+
+    def _grow(self):
+        grown = np.empty(self.capacity * 2, dtype=_DTYPE)
+        grown[:self._size] = self._rows[:self._size]
+        self._rows = grown
+
+    def append(self, entry_idx: int, exit_idx: int, entry: float, exit: float, pnl: float, pos_size: int,
+               exit_reason: Optional[str] = None):
+        if self._size == len(self._rows):
+            self._grow()
+        self._rows[self._size] = (entry_idx, exit_idx, entry, exit, pnl, pos_size, pnl > 0,
+                                  _REASON_CODES.get(exit_reason, -1))
+        self._size += 1
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only view of one field over the recorded trades."""
+        view = self._rows[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    # -- list-of-dicts compatibility -------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _record(self, i: int) -> dict:
+        record = dict(zip(TRADE_FIELDS, self._rows[i].item()))
+        code = record["exit_reason"]
+        record["exit_reason"] = None if code < 0 else EXIT_REASONS[code]
+        return record
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self._record(i) for i in range(*key.indices(self._size))]
+        i = int(key)
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("trade index out of range")
+        return self._record(i)
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self._record(i)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TradeLedger):
+            return len(self) == len(other) and bool(np.array_equal(self._rows[:self._size], other._rows[:other._size]))
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TradeLedger({self._size} trades)"
+
+    def tolist(self) -> list:
+        return list(self)
+
+    # -- vectorized views ------------------------------------------------------------
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame over the ledger's arrays (no copy); `exit_reason` is categorical."""
+        columns = {name: self.column(name) for name in TRADE_FIELDS if name != "exit_reason"}
+        columns["exit_reason"] = pd.Categorical.from_codes(self.column("exit_reason"), categories=list(EXIT_REASONS))
+        return pd.DataFrame(columns, copy=False)
+
+    def equity(self, initial_balance: float) -> np.ndarray:
+        """Equity after each trade, starting with `initial_balance` (length = trades + 1)."""
+        curve = np.empty(self._size + 1, dtype="float64")
+        curve[0] = initial_balance
+        # cumsum adds left to right, so totals match summing the trades in order
+        np.cumsum(self.column("pnl"), out=curve[1:])
+        curve[1:] += initial_balance
+        return curve
+
+    def total_pnl(self) -> float:
+        return float(np.cumsum(self.column("pnl"))[-1]) if self._size else 0.0
+
+    def win_rate(self) -> float:
+        return float(np.count_nonzero(self.column("win")) / self._size) if self._size else 0.0
+
+    def drawdown(self, initial_balance: float) -> Dict[str, float]:
+        """Largest peak-to-trough equity decline, in currency and as a fraction of the peak."""
+        equity = self.equity(initial_balance)
+        peak = np.maximum.accumulate(equity)
+        dd = peak - equity
+        i = int(dd.argmax())
+        return {"max_drawdown": float(dd[i]), "max_drawdown_pct": float(dd[i] / peak[i]) if peak[i] > 0 else 0.0}
+
+    def bars_held(self) -> np.ndarray:
+        return self.column("exit_idx") - self.column("entry_idx")
+
+    def exposure(self, total_bars: int) -> float:
+        """Fraction of `total_bars` spent in a position."""
+        return float(self.bars_held().sum() / total_bars) if total_bars > 0 else 0.0
+
+    def stats(self, initial_balance: float, total_bars: Optional[int] = None) -> dict:
+        n = self._size
+        total = self.total_pnl()
+        out = {
+            "num_trades": n,
+            "total_pnl": total,
+            "win_rate": self.win_rate(),
+            "avg_pnl": total / n if n else 0.0,
+        }
+        out.update(self.drawdown(initial_balance))
+        if total_bars is not None:
+            out["exposure"] = self.exposure(total_bars)
+        return out
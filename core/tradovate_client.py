@@ -0,0 +1,118 @@
+"""Connection-pooled HTTP clients for the Tradovate REST API.
+
+`TradovateClient` keeps one `requests.Session` with a keep-alive connection
+pool, so consecutive calls reuse the same TCP+TLS connection. Every call has
+a timeout. Transient failures are retried a bounded number of times with
+backoff: GETs on connection errors, read errors and 429/5xx responses, and
+POSTs (e.g. order placement) only when the connection could not be
+established, so an order is never sent twice.
+
+`AsyncTradovateClient` exposes the same calls as coroutines by running them on
+a small thread pool that shares the pooled session.
+
+`requests` is imported when the first client is created, so importing this
+module (and `core.execution_engine`) stays cheap for backtests.
+"""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+DEMO_URL = 'https://demo.tradovateapi.com/v1'
+LIVE_URL = 'https://live.tradovateapi.com/v1'
+
+DEFAULT_TIMEOUT = (3.05, 10.0)  # (connect, read) seconds
+DEFAULT_RETRIES = 3
+
+
+def tradovate_base_url(demo: bool = True) -> str:
+    return DEMO_URL if demo else LIVE_URL
+
+
+class TradovateClient:
+    def __init__(self, base_url: str, timeout=DEFAULT_TIMEOUT, max_retries: int = DEFAULT_RETRIES,
+                 backoff_factor: float = 0.1, pool_maxsize: int = 10):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS'}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(self, method: str, path: str, token: Optional[str] = None, json: Any = None) -> requests.Response:
+        headers = {'Authorization': f'Bearer {token}'} if token else None
+        return self.session.request(method, f'{self.base_url}{path}', json=json, headers=headers, timeout=self.timeout)
+
+    def authenticate(self, payload: dict) -> requests.Response:
+        return self.request('POST', '/auth/accesstokenrequest', json=payload)
+
+    def list_accounts(self, token: str) -> requests.Response:
+        return self.request('GET', '/account/list', token=token)
+
+    def place_order(self, token: str, payload: dict) -> requests.Response:
+        return self.request('POST', '/order/placeorder', token=token, json=payload)
+
+    def place_oso(self, token: str, payload: dict) -> requests.Response:
+        """Entry order with attached `bracket1` / `bracket2` exit orders (one-sends-other)."""
+        return self.request('POST', '/order/placeOSO', token=token, json=payload)
+
+    def cancel_order(self, token: str, order_id: int) -> requests.Response:
+        return self.request('POST', '/order/cancelorder', token=token, json={'orderId': order_id})
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncTradovateClient:
+    """Coroutine wrapper around `TradovateClient` (calls run on a thread pool)."""
+
+    def __init__(self, client: TradovateClient, max_workers: int = 4):
+        self.client = client
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tradovate')
+
+    async def request(self, method: str, path: str, token: Optional[str] = None, json: Any = None) -> requests.Response:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: self.client.request(method, path, token=token, json=json))
+
+    async def authenticate(self, payload: dict) -> requests.Response:
+        return await self.request('POST', '/auth/accesstokenrequest', json=payload)
+
+    async def list_accounts(self, token: str) -> requests.Response:
+        return await self.request('GET', '/account/list', token=token)
+
+    async def place_order(self, token: str, payload: dict) -> requests.Response:
+        return await self.request('POST', '/order/placeorder', token=token, json=payload)
+
+    async def place_oso(self, token: str, payload: dict) -> requests.Response:
+        return await self.request('POST', '/order/placeOSO', token=token, json=payload)
+
+    async def cancel_order(self, token: str, order_id: int) -> requests.Response:
+        return await self.request('POST', '/order/cancelorder', token=token, json={'orderId': order_id})
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.client.close()
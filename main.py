@@ -1,14 +1,55 @@
 import argparse
-from config.loader import load_config
-from app.runner import TradingSystemRunner
+import contextlib
+
+# Heavy dependencies (pandas, matplotlib, requests) are imported by the code
+# paths that need them, so `--help` and `--dry-run` start fast. Check with
+#   python -X importtime main.py --dry-run
+
+# Live mode is replay-only until a broker market data feed exists
+LIVE_NEEDS_DATA = "live mode only replays a price file (no broker market data feed yet); pass one with --data"
 
 def main():
     parser = argparse.ArgumentParser(description="Futures Trading Bot")
-    parser.add_argument("--mode", choices=["backtest", "live"], help="Run mode")
+    parser.add_argument("--mode", choices=["backtest", "live", "sweep", "batch", "ensemble"], help="Run mode")
     parser.add_argument("--config", default="config/settings.yaml", help="Path to config file")
-    parser.add_argument("--data", help="Path to price data CSV (for backtest)")
+    parser.add_argument("--data", help="Path to price data CSV or price store directory (for backtest)")
+    parser.add_argument("--simulation", choices=["vectorized", "loop", "multi"], default="vectorized",
+                        help="Backtest simulation mode ('multi' allows concurrent positions, see risk.max_open_positions)")
+    parser.add_argument("--start", help="Only backtest / replay bars at or after this time (e.g. 2024-01-01)")
+    parser.add_argument("--end", help="Only backtest / replay bars before this time")
+    parser.add_argument("--chunk-size", type=int, help="Stream the backtest data in blocks of this many bars")
+    parser.add_argument("--grid", default="config/sweep_grid.yaml", help="Path to parameter grid YAML (for sweep)")
+    parser.add_argument("--batch", default="config/batch.yaml", help="Path to batch spec YAML (instruments / walk-forward windows)")
+    parser.add_argument("--workers", type=int, help="Worker processes for sweep / batch / ensemble (default: all cores)")
+    parser.add_argument("--ensemble", choices=["seeds", "bootstrap", "random_walk"], default="seeds",
+                        help="Ensemble kind: strategy seeds on fixed data (random-signal strategies; others run as "
+                             "bootstrap), bootstrap resamples of --data, or random walks")
+    parser.add_argument("--runs", type=int, default=1000, help="Number of ensemble runs")
+    parser.add_argument("--seed", type=int, help="Root seed of an ensemble (default: fresh entropy)")
+    parser.add_argument("--no-plot", action="store_true", help="Skip equity chart rendering (headless reports)")
+    parser.add_argument("--no-signal-cache", action="store_true", help="Always regenerate strategy signals (skip data/signal_cache)")
+    parser.add_argument("--no-report", action="store_true", help="Don't write trades / stats / charts after a backtest")
+    parser.add_argument("--metrics", help="Collect engine timers / counters and write them to this JSON file")
+    parser.add_argument("--profile", help="Capture a cProfile + tracemalloc profile of the run into this directory")
+    parser.add_argument("--dry-run", action="store_true", help="Validate the config and referenced files, then exit")
     args = parser.parse_args()
 
+    if args.dry_run:
+        raise SystemExit(0 if dry_run(args) else 1)
+
+    if args.metrics or args.profile:
+        from core.instrumentation import METRICS, Profiler
+    if args.metrics:
+        METRICS.enable()
+    try:
+        with Profiler(args.profile) if args.profile else contextlib.nullcontext():
+            run(args)
+    finally:
+        if args.metrics:
+            print(f"\nMetrics:\n{METRICS.report()}")
+            print(f"Metrics saved to {METRICS.export_json(args.metrics)}")
+
+def run(args):
     print("-----------------------------")
     print("Starting Futures Trading Bot")
     print("-----------------------------")
@@ -16,20 +57,130 @@ def main():
     print(f"Config file: {args.config}")
 
     # Load config
+    from config.loader import load_config
+
     cfg = load_config(args.config)
+    if args.mode == "sweep":
+        run_sweep_mode(cfg, args)
+        return
+    if args.mode == "batch":
+        run_batch_mode(cfg, args)
+        return
+    if args.mode == "ensemble":
+        run_ensemble_mode(cfg, args)
+        return
     if args.mode:
         cfg.exec.mode = args.mode
+    if cfg.exec.mode == "live" and not args.data:
+        raise SystemExit(f"Config error: {LIVE_NEEDS_DATA}")
 
     print("Loaded configuration")
 
-
     # Initialize system
-    system = TradingSystemRunner(cfg)
+    from app.runner import TradingSystemRunner
+
+    system = TradingSystemRunner(cfg, signal_cache=not args.no_signal_cache)
 
     if cfg.exec.mode == "backtest":
-        system.run_backtest(args.data)
+        system.run_backtest(args.data, chunk_size=args.chunk_size, report=not args.no_report, plot=not args.no_plot,
+                            simulation=args.simulation, start=args.start, end=args.end)
+        system.close()
     elif cfg.exec.mode == "live":
-        system.run_live()
+        system.run_live(args.data, start=args.start, end=args.end)
+
+def run_sweep_mode(cfg, args):
+    from app.sweep import load_grid, run_sweep, save_sweep
+
+    grid = load_grid(args.grid)
+    table = run_sweep(cfg, grid, data_source=args.data, max_workers=args.workers, signal_cache=not args.no_signal_cache)
+    print(f"\nTop results:\n{table.head(10)}")
+    csv_path = save_sweep(table, getattr(cfg.strategy, 'name', None) or 'unknown')
+    print(f"Sweep results saved to {csv_path}")
+
+def run_batch_mode(cfg, args):
+    from app.batch import load_batch_spec, run_batch, save_batch
+
+    spec = load_batch_spec(args.batch)
+    results = run_batch(cfg, spec, data_source=args.data, max_workers=args.workers, signal_cache=not args.no_signal_cache)
+    print(f"\nPer instrument:\n{results['by_instrument']}")
+    run_dir = save_batch(results, getattr(cfg.strategy, 'name', None) or 'unknown')
+    print(f"Batch results saved to {run_dir}")
+
+def run_ensemble_mode(cfg, args):
+    from app.ensemble import run_ensemble, save_ensemble
+
+    results = run_ensemble(cfg, args.runs, kind=args.ensemble, data_source=args.data, seed=args.seed,
+                           max_workers=args.workers)
+    print(f"\nDistribution over {args.runs} {results['kind']} runs:\n{results['distribution'].to_string()}")
+    print(f"Probability of a loss: {results['loss_probability']:.1%}")
+    run_dir = save_ensemble(results, getattr(cfg.strategy, 'name', None) or 'unknown')
+    print(f"Ensemble results saved to {run_dir}")
+
+def _yaml_problems(path, required_key=None):
+    import yaml
+
+    try:
+        with open(path, "r") as f:
+            data = yaml.safe_load(f)
+    except (OSError, yaml.YAMLError) as e:
+        return [f"can't read {path}: {e}"], None
+    if not isinstance(data, dict) or (required_key and not isinstance(data.get(required_key), dict)):
+        what = f"an `{required_key}` mapping" if required_key else "a mapping"
+        return [f"{path} must contain {what}"], None
+    return [], data
+
+def dry_run(args):
+    """Validate the config and the files the run would use, without importing pandas or matplotlib."""
+    import os
+    from datetime import datetime
+    import yaml
+    from pydantic import ValidationError
+    from config.loader import load_config
+    from strategies.registry import available
+
+    try:
+        cfg = load_config(args.config)
+    except (OSError, yaml.YAMLError, ValidationError) as e:
+        print(f"Config error in {args.config}:\n{e}")
+        return False
+
+    problems = []
+    name = cfg.strategy.name
+    if name and name not in available():
+        problems.append(f"strategy module 'strategies.{name}' not found (available: {', '.join(available())})")
+    if args.data and not os.path.exists(args.data):
+        problems.append(f"data file {args.data} not found")
+    if cfg.fill.intrabar_data and not os.path.exists(cfg.fill.intrabar_data):
+        problems.append(f"intrabar data file {cfg.fill.intrabar_data} not found")
+    for flag, value in (("--start", args.start), ("--end", args.end)):
+        try:
+            if value:
+                datetime.fromisoformat(value)
+        except ValueError:
+            problems.append(f"{flag} {value!r} is not an ISO date / time")
+    if args.mode == "ensemble" and args.ensemble == "bootstrap" and not args.data:
+        problems.append("a bootstrap ensemble needs --data")
+    if (args.mode or cfg.exec.mode) == "live" and not args.data:
+        problems.append(LIVE_NEEDS_DATA)
+    if args.mode == "sweep":
+        problems += _yaml_problems(args.grid)[0]
+    elif args.mode == "batch":
+        spec_problems, spec = _yaml_problems(args.batch, "instruments")
+        problems += spec_problems
+        for symbol, entry in (spec or {}).get("instruments", {}).items():
+            source = (entry or {}).get("data", args.data)
+            if not source:
+                problems.append(f"instrument {symbol} has no data path (set `data` or pass --data)")
+            elif not os.path.exists(source):
+                problems.append(f"instrument {symbol}: data file {source} not found")
+
+    if problems:
+        print("Dry run found problems:")
+        for problem in problems:
+            print(f"  - {problem}")
+        return False
+    print(f"Config OK: {args.config} (mode: {args.mode or cfg.exec.mode}, strategy: {name or 'fallback'})")
+    return True
 
 if __name__ == "__main__":
     main()
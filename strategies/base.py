@@ -4,11 +4,30 @@ Standard requirements for a strategy module (minimal):
 - A callable `generate_signals(df: pandas.DataFrame, system, entry_prob: float = 0.02, seed: Optional[int] = None)`
   that returns a DataFrame with a `signal` column containing 1 (long), -1 (short), or 0 (no entry).
   It may optionally populate `sl`, `tp`, and `stop_loss_ticks` columns per-entry.
+  `df` is shared with the engine, not a copy: treat its columns as read-only arrays and return
+  only the new columns (a DataFrame with `df`'s index, or a dict of arrays of `len(df)`).
+  The engine attaches them to its frame; returning `df` with the columns added still works.
+  Randomness must come from a local `numpy.random.default_rng(seed)`, never from reseeding the
+  global `random` / `np.random` state, so runs (e.g. `app.ensemble`) can execute concurrently.
+  With `data.timeframes` configured, a `timeframes` keyword (if accepted) receives the
+  `core.bars.TimeframeView`s of the bars; read them through `view.align(col)` to stay causal.
 
 Optional live hooks:
 - `on_live_tick(tick: dict, state: dict, system) -> Optional[dict]` — called by a live wrapper when
   a new tick/bar arrives; should return an order dict or None. This is optional so the same strategy
-  file can be used for backtest and live.
+  file can be used for backtest and live. `core.live_engine.LiveEngine` drives this hook; entries of
+  `strategy.params` that match its keyword arguments are passed through, and orders without a
+  `quantity` are sized by the RiskEngine. With `data.timeframes`, `state["timeframes"]` holds one
+  `core.bars.BarAggregator` per timeframe, already updated with the current bar.
+
+Optional signal-cache hints (see `core.signal_cache`):
+- `CONFIG_DEPENDENCIES`: dotted config paths besides `strategy` that `generate_signals` reads.
+- `RANDOM_SIGNALS = True`: output is random unless a `seed` is passed.
+
+Optional declarations used by `strategies.registry` and the engines:
+- `REQUIRED_COLUMNS`: input columns `generate_signals` reads (it is handed only these).
+- `LOOKBACK`: bars of history a signal depends on (int, or a callable of the strategy params).
+- `PARAMS`: tunable `strategy.params` with their defaults.
 
 This module provides a `validate_strategy` helper to check the minimal requirements.
 """
@@ -27,3 +46,19 @@ def validate_strategy(module) -> None:
     if hasattr(module, "on_live_tick") and not callable(module.on_live_tick):
         raise AttributeError("`on_live_tick` exists but is not callable")
 
+    # optional declarations
+    required = getattr(module, "REQUIRED_COLUMNS", None)
+    if required is not None and (isinstance(required, str) or not all(isinstance(c, str) for c in required)):
+        raise AttributeError("`REQUIRED_COLUMNS` must be a sequence of column names")
+    lookback = getattr(module, "LOOKBACK", None)
+    if lookback is not None and not callable(lookback) and not (isinstance(lookback, int) and lookback >= 0):
+        raise AttributeError("`LOOKBACK` must be a non-negative int or a callable of the strategy params")
+    params = getattr(module, "PARAMS", None)
+    if params is not None:
+        if not isinstance(params, dict):
+            raise AttributeError("`PARAMS` must map parameter names to defaults")
+        accepted = inspect.signature(module.generate_signals).parameters
+        unknown = [k for k in params if k not in accepted]
+        if unknown:
+            raise AttributeError(f"`PARAMS` names {unknown} that `generate_signals` doesn't accept")
+
@@ -0,0 +1,128 @@
+"""Strategy registry: discovers `strategies/` modules and caches validated handles.
+
+`get_strategy(name)` imports ``strategies.<name>`` once, checks it with
+`strategies.base.validate_strategy` and returns a `StrategyHandle` holding the
+module, its hooks and what it declares about itself. Later calls (from any
+engine) return the same handle, so neither the import nor the validation or
+signature inspection is repeated per run.
+
+Optional module declarations read into the handle:
+
+- ``REQUIRED_COLUMNS``: input columns `generate_signals` reads, e.g.
+  ``("close",)``. Engines hand the strategy just these columns, and the signal
+  cache only hashes them. Without it the strategy sees every column.
+- ``LOOKBACK``: bars of history a signal depends on, either an int or a
+  callable taking the strategy params as keyword arguments (e.g.
+  ``lambda rsi_period=14, **_: rsi_period + 1``). Sizes the warm-up of chunked
+  backtests and live runs; without it the engines' defaults apply.
+- ``PARAMS``: tunable ``strategy.params`` and their defaults. Without it they
+  are the keyword arguments of `generate_signals` other than the engine's.
+
+This module stays free of pandas / numpy so `main.py --dry-run` can use it.
+"""
+import importlib
+import inspect
+import pkgutil
+import threading
+from typing import Dict, List, Optional
+
+from strategies.base import validate_strategy
+
+# Arguments engines pass to `generate_signals` themselves (never taken from `strategy.params`)
+ENGINE_ARGUMENTS = ("system", "entry_prob", "seed", "timeframes")
+
+# Modules under `strategies/` that are helpers, not strategies
+_HELPER_MODULES = ("base", "registry")
+
+_HANDLES: Dict[str, "StrategyHandle"] = {}
+_LOCK = threading.Lock()
+
+
+class StrategyHandle:
+    """A validated strategy module plus its declarations (see the module docstring)."""
+
+    def __init__(self, name: str, module):
+        validate_strategy(module)
+        self.name = name
+        self.module = module
+        self.generate_signals = module.generate_signals
+        on_live_tick = getattr(module, "on_live_tick", None)
+        self.on_live_tick = on_live_tick if callable(on_live_tick) else None
+        required = getattr(module, "REQUIRED_COLUMNS", None)
+        self.required_columns = tuple(required) if required is not None else None
+        self.random_signals = bool(getattr(module, "RANDOM_SIGNALS", False))
+        self._lookback = getattr(module, "LOOKBACK", None)
+
+        params = inspect.signature(module.generate_signals).parameters
+        self.accepts_timeframes = "timeframes" in params or any(
+            p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values())
+        self._keywords = {k for k, p in params.items()
+                          if p.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)}
+        declared = getattr(module, "PARAMS", None)
+        if declared is not None:
+            self.params = dict(declared)
+        else:
+            self.params = {k: p.default for k, p in list(params.items())[1:]
+                           if k in self._keywords and k not in ENGINE_ARGUMENTS and p.default is not inspect.Parameter.empty}
+
+    def __repr__(self) -> str:
+        return f"StrategyHandle({self.name})"
+
+    def kwargs(self, params: Optional[dict]) -> dict:
+        """Entries of `params` (``strategy.params``) that `generate_signals` takes as keyword arguments."""
+        if not params:
+            return {}
+        return {k: v for k, v in params.items() if k in self._keywords and k not in ENGINE_ARGUMENTS}
+
+    def lookback(self, params: Optional[dict] = None) -> Optional[int]:
+        """Declared bars of history for `params` (defaults filled in), or None when undeclared."""
+        if self._lookback is None:
+            return None
+        if callable(self._lookback):
+            merged = dict(self.params)
+            merged.update({k: v for k, v in (params or {}).items() if k in self.params})
+            return max(0, int(self._lookback(**merged)))
+        return int(self._lookback)
+
+
+def available() -> List[str]:
+    """Names of the strategy modules under `strategies/` (without importing them)."""
+    import strategies
+
+    return sorted(m.name for m in pkgutil.iter_modules(strategies.__path__)
+                  if m.name not in _HELPER_MODULES and not m.name.startswith("_"))
+
+
+def get_strategy(name: str) -> StrategyHandle:
+    """The handle of ``strategies.<name>``, imported and validated on first use.
+
+    Raises ModuleNotFoundError for unknown names and AttributeError for
+    modules that don't meet `strategies.base` requirements.
+    """
+    handle = _HANDLES.get(name)
+    if handle is not None:
+        return handle
+    with _LOCK:
+        handle = _HANDLES.get(name)
+        if handle is None:
+            handle = StrategyHandle(name, importlib.import_module(f"strategies.{name}"))
+            _HANDLES[name] = handle
+    return handle
+
+
+def strategy_handle(module) -> StrategyHandle:
+    """The handle of an already imported strategy `module` (cached while it stays the same object)."""
+    name = module.__name__.rpartition(".")[2]
+    handle = _HANDLES.get(name)
+    if handle is not None and handle.module is module:
+        return handle
+    with _LOCK:
+        handle = StrategyHandle(name, module)
+        _HANDLES[name] = handle
+    return handle
+
+
+def clear_registry():
+    """Forget every cached handle (e.g. after editing a strategy in a long-lived session)."""
+    with _LOCK:
+        _HANDLES.clear()
@@ -1,72 +1,79 @@
+import math
+
 import pandas as pd
 import numpy as np
 
-def generate_signals(df, system=None, entry_prob=0.02, seed=None):
+from core.indicators import rsi
+
+# Config values `generate_signals` reads besides `strategy.params` (signal cache key, see core.signal_cache)
+CONFIG_DEPENDENCIES = ("exec.tick_size",)
+
+# Declarations read by strategies.registry. No LOOKBACK: the cooldown after a stop chains back
+# through earlier entries, so chunked runs keep the engine's default warm-up.
+REQUIRED_COLUMNS = ("close",)
+PARAMS = {"rsi_period": 14, "rsi_entry": 30, "rsi_exit": 70, "sl_type": "ticks", "sl_value": 1, "tp_type": "ticks",
+          "tp_value": 2, "cooldown_bars": 10}
+
+def _level(entry, value, kind, tick_size, side):
+    """Vectorized SL (side=-1) / TP (side=+1) price for each entry."""
+    if kind == 'percent':
+        return entry * (1 + side * value / 100)
+    if kind == 'dollar':
+        return entry + side * value
+    # 'ticks' and unknown types
+    return entry + side * value * tick_size
+
+
+def _active_bars(n, trigger, cooldown_bars):
+    """Bars the strategy evaluates, given the cooldown that follows each stop loss.
+
+    A bar `t` that enters and is already at/below its stop triggers the
+    cooldown on bar `t + 1`, which then skips bars `t + 2 .. t + 1 + cooldown_bars`.
+    Skipped bars can't enter, so they can't re-trigger; the scan below only
+    visits the (rare) trigger bars.
+    """
+    active = np.ones(n, dtype=bool)
+    active[:1] = False  # the first bar has no RSI history
+    if cooldown_bars < 1 or n < 3:
+        return active
+    span = int(math.floor(cooldown_bars))
+    blocked_until = 0
+    for t in np.flatnonzero(trigger[1:n - 1]) + 1:
+        if t <= blocked_until:
+            continue
+        active[t + 2:t + 2 + span] = False
+        blocked_until = t + 1 + span
+    return active
+
+
+def generate_signals(df, system=None, entry_prob=0.02, seed=None, rsi_period=14, rsi_entry=30, rsi_exit=70,
+                     sl_type='ticks', sl_value=1, tp_type='ticks', tp_value=2, cooldown_bars=10):
     """
     Generate entry signals based on RSI reversal logic, but add a cooldown period after a stop loss before allowing new buys.
+
+    The thresholds, SL / TP levels (`sl_type` / `tp_type`: 'ticks', 'percent' or 'dollar') and
+    `cooldown_bars` come from `strategy.params`; only `exec.tick_size` is read from `system`.
     """
-    np.random.seed(seed or 42)
-    df = df.copy()
-    df['rsi'] = compute_rsi(df['close'], period=14)
-    df['signal'] = 0
-    df['sl'] = np.nan
-    df['tp'] = np.nan
-
-    # Configurable parameters
-    rsi_entry = getattr(system, 'rsi_entry', 30) if system else 30
-    rsi_exit = getattr(system, 'rsi_exit', 70) if system else 70
-    sl_type = getattr(system, 'sl_type', 'ticks') if system else 'ticks'
-    sl_value = getattr(system, 'sl_value', 1) if system else 1
-    tp_type = getattr(system, 'tp_type', 'ticks') if system else 'ticks'
-    tp_value = getattr(system, 'tp_value', 2) if system else 2
+    close = df['close'].to_numpy(dtype='float64')
+    rsi_values = rsi(close, period=rsi_period)
+
     tick_size = getattr(system.exec, 'tick_size', 0.25) if system and hasattr(system, 'exec') else 0.25
-    cooldown_bars = getattr(system, 'cooldown_bars', 10) if system else 10
 
-    last_sl_idx = -cooldown_bars - 1
+    sl = _level(close, sl_value, sl_type, tick_size, -1)
+    tp = _level(close, tp_value, tp_type, tick_size, 1)
 
-    for i in range(1, len(df)):
-        # Cooldown logic: skip if within cooldown_bars after last stop loss
-        if i - last_sl_idx <= cooldown_bars:
-            continue
-        # Entry signal: RSI below entry threshold
-        if df.loc[i, 'rsi'] < rsi_entry:
-            df.at[i, 'signal'] = 1
-            entry = df.loc[i, 'close']
-            # Stop loss
-            if sl_type == 'ticks':
-                sl = entry - sl_value * tick_size
-            elif sl_type == 'percent':
-                sl = entry * (1 - sl_value / 100)
-            elif sl_type == 'dollar':
-                sl = entry - sl_value
-            else:
-                sl = entry - sl_value * tick_size
-            # Take profit
-            if tp_type == 'ticks':
-                tp = entry + tp_value * tick_size
-            elif tp_type == 'percent':
-                tp = entry * (1 + tp_value / 100)
-            elif tp_type == 'dollar':
-                tp = entry + tp_value
-            else:
-                tp = entry + tp_value * tick_size
-            df.at[i, 'sl'] = sl
-            df.at[i, 'tp'] = tp
-        # Exit signal: RSI above exit threshold
-        if df.loc[i, 'rsi'] > rsi_exit:
-            df.at[i, 'signal'] = 0
-        # If a stop loss was hit on the previous bar, set cooldown
-        if i > 1 and df.at[i-1, 'signal'] == 1 and df.at[i-1, 'close'] <= df.at[i-1, 'sl']:
-            last_sl_idx = i
-    return df
-
-def compute_rsi(series, period=14):
-    delta = series.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+    # Entry: RSI below entry threshold; an RSI above the exit threshold on the same bar cancels it
+    wants_entry = rsi_values < rsi_entry
+    signal = wants_entry & ~(rsi_values > rsi_exit)
+    # An entry already at/below its stop starts the cooldown on the next bar
+    active = _active_bars(len(df), signal & (close <= sl), cooldown_bars)
+
+    entered = wants_entry & active
+    return pd.DataFrame({
+        'signal': (signal & active).astype('int64'),
+        'sl': np.where(entered, sl, np.nan),
+        'tp': np.where(entered, tp, np.nan),
+    }, index=df.index, copy=False)
 
 def strategy_name():
     return "rsi_cooldown"
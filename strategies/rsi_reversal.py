@@ -1,21 +1,41 @@
 import pandas as pd
 import numpy as np
 
-def compute_rsi(series, period=14):
-    delta = series.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / (loss + 1e-9)
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+from core.indicators import RSI, rsi
+
+# Signals only depend on `strategy.params` (signal cache key, see core.signal_cache)
+CONFIG_DEPENDENCIES = ()
+
+# Declarations read by strategies.registry: the RSI only looks at `close`, over the previous `rsi_period` bars
+REQUIRED_COLUMNS = ("close",)
+LOOKBACK = lambda rsi_period=14, **params: rsi_period
+PARAMS = {"rsi_period": 14, "rsi_entry": 30}
 
 def generate_signals(df, system=None, rsi_period=14, rsi_entry=30, entry_prob=1.0, seed=None, **kwargs):
     # entry_prob is kept for interface compatibility, but not used here
-    df = df.copy()
-    df['rsi'] = compute_rsi(df['close'], period=rsi_period)
-    df['signal'] = 0
+    values = rsi(df['close'].to_numpy(dtype='float64'), period=rsi_period, eps=1e-9)
     # Buy when RSI is below rsi_entry threshold
-    df.loc[df['rsi'] < rsi_entry, 'signal'] = 1
+    return pd.DataFrame({'signal': (values < rsi_entry).astype('int64')}, index=df.index, copy=False)
+
 
+def on_live_tick(tick, state, system=None, rsi_period=14, rsi_entry=30, **kwargs):
+    """Live counterpart of `generate_signals` using a streaming RSI.
 
-    return df
+    Returns a market buy order when RSI crosses below `rsi_entry` (only on
+    the crossing bar, so a long oversold stretch doesn't send one order per
+    bar), otherwise None.
+    """
+    if "rsi" not in state:
+        state["rsi"] = RSI(rsi_period, eps=1e-9)
+        state["below"] = False
+    value = state["rsi"].update(float(tick["close"]))
+    below = value < rsi_entry
+    crossed = below and not state["below"]
+    state["below"] = below
+    if not crossed:
+        return None
+    return {
+        "action": "Buy",
+        "symbol": getattr(system.exec, "symbol", None) if system is not None else None,
+        "orderType": "Market",
+    }
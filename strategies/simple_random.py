@@ -1,46 +1,55 @@
-import random
+import numpy as np
 import pandas as pd
 from typing import Optional
 
+# Signal cache hints (see core.signal_cache): the sl / tp columns follow these
+# config values, and entries are random unless a seed is given.
+CONFIG_DEPENDENCIES = ("risk.stop_loss_ticks", "risk.risk_to_reward", "exec.tick_size")
+RANDOM_SIGNALS = True
+
+# Declarations read by strategies.registry: entries only price off `close` and need no history
+REQUIRED_COLUMNS = ("close",)
+LOOKBACK = 0
+PARAMS = {}
 
 def generate_signals(data: pd.DataFrame, system=None, entry_prob: float = 0.02, seed: Optional[int] = None) -> pd.DataFrame:
     """
     Simple random strategy:
     - Randomly opens a long position with probability `entry_prob` when not already in a position.
-    - Marks the entry row with `signal` == 1 and writes `sl`, `tp`, and `stop_loss_ticks` based
-      on `system.risk` settings (if provided).
+    - Returns `signal` (1 on the entry row) plus `sl`, `tp` and `stop_loss_ticks` on that row,
+      based on `system.risk` settings (if provided); only those columns, `data` is not copied.
+
+    Draws come from a private `numpy.random.Generator` seeded with `seed` (fresh
+    entropy when None), so concurrent calls never share or reseed global RNG state.
+    Each call places at most one entry, so a chunked run (one call per chunk,
+    see `BacktestEngine.run_chunked`) isn't comparable to a single-frame run.
 
     Note: the backtest engine will perform the forward-scan to determine whether SL or TP is hit.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = np.random.default_rng(seed)
 
-    df = data.copy()
-    df = df.reset_index(drop=True)
-    df["signal"] = 0
-    df["sl"] = pd.NA
-    df["tp"] = pd.NA
-    df["stop_loss_ticks"] = pd.NA
+    n = len(data)
+    signal = np.zeros(n, dtype="int64")
+    sl_col = np.full(n, np.nan)
+    tp_col = np.full(n, np.nan)
+    ticks_col = np.full(n, np.nan)
 
-    in_position = False
     stop_loss_ticks_cfg = getattr(system.risk, "stop_loss_ticks", 20) if system is not None else 20
     rr_cfg = getattr(system.risk, "risk_to_reward", 2.0) if system is not None else 2.0
     tick_size = getattr(system.exec, "tick_size", 0.25) if system is not None else 0.25
 
-    for i, row in df.iterrows():
-        if in_position:
-            # wait for backtest engine to resolve exits; strategy doesn't place multiple overlapping entries
-            continue
-
-        if random.random() < entry_prob:
-            entry = float(row.close)
-            sl = entry - stop_loss_ticks_cfg * tick_size
-            tp = entry + stop_loss_ticks_cfg * tick_size * rr_cfg
-
-            df.at[i, "signal"] = 1
-            df.at[i, "sl"] = sl
-            df.at[i, "tp"] = tp
-            df.at[i, "stop_loss_ticks"] = stop_loss_ticks_cfg
-            in_position = True
-
-    return df
+    # The strategy never places overlapping entries and waits for the backtest
+    # engine to resolve exits, so only the first successful per-row draw
+    # matters. Its index is geometrically distributed: draw it directly
+    # instead of one uniform per row.
+    if entry_prob > 0 and n:
+        i = int(rng.geometric(min(entry_prob, 1.0))) - 1
+        if i < n:
+            entry = float(data["close"].iat[i])
+            signal[i] = 1
+            sl_col[i] = entry - stop_loss_ticks_cfg * tick_size
+            tp_col[i] = entry + stop_loss_ticks_cfg * tick_size * rr_cfg
+            ticks_col[i] = stop_loss_ticks_cfg
+
+    return pd.DataFrame({"signal": signal, "sl": sl_col, "tp": tp_col, "stop_loss_ticks": ticks_col}, index=data.index,
+                        copy=False)
@@ -0,0 +1,18 @@
+"""Shared fixtures; run ``pytest`` from the repository root."""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.sweep import apply_overrides  # noqa: E402
+from config.loader import load_config  # noqa: E402
+
+
+@pytest.fixture
+def config():
+    """`config/settings.yaml` with the single-position engine."""
+    return apply_overrides(load_config(os.path.join(ROOT, "config", "settings.yaml")), {"risk.max_open_positions": 1})
@@ -0,0 +1,118 @@
+"""The vectorized and multi simulations against the per-bar ``"loop"`` reference."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.sweep import apply_overrides
+from benchmarks.synthetic import generate_ohlcv
+from core.backtest_engine import BacktestEngine
+from core.risk_engine import RiskEngine
+from core.signal_engine import SignalEngine, attach_signals
+from strategies.registry import available
+
+RISK_MODES = {
+    "report": {},
+    "block": {"risk.max_drawdown": 0.3, "risk.drawdown_mode": "block"},
+    "scale": {"risk.max_drawdown": 0.3, "risk.drawdown_mode": "scale"},
+}
+
+
+class FixedSignals:
+    """Signal engine handing out prebuilt signal columns."""
+
+    handle = None
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    def generate_signals(self, data, **kwargs):
+        return attach_signals(data, self.columns)
+
+
+def run_modes(config, data, strategy=None, signal_engine=None, seed=1, modes=("loop", "vectorized", "multi")):
+    results = {}
+    for mode in modes:
+        engine = BacktestEngine(config, signal_engine or SignalEngine(config.strategy if strategy else None),
+                                RiskEngine(config.risk), None)
+        results[mode] = engine.run(data, strategy=strategy, seed=seed, simulation=mode)
+    return results
+
+
+def assert_same(results):
+    (reference_mode, reference), *others = results.items()
+    for mode, result in others:
+        assert result["trades"] == reference["trades"], f"{mode} trades differ from {reference_mode}"
+        assert result["ledger"] == reference["ledger"], f"{mode} ledger differs from {reference_mode}"
+        assert {k: v for k, v in result.items() if k not in ("trades", "ledger")} == \
+               {k: v for k, v in reference.items() if k not in ("trades", "ledger")}, \
+            f"{mode} summary differs from {reference_mode}"
+
+
+@pytest.fixture(scope="module")
+def data():
+    return generate_ohlcv(3000, seed=7, with_dates=True)
+
+
+@pytest.mark.parametrize("risk_mode", list(RISK_MODES))
+@pytest.mark.parametrize("strategy", available() + [None])
+def test_modes_agree(config, data, strategy, risk_mode):
+    results = run_modes(apply_overrides(config, RISK_MODES[risk_mode]), data, strategy)
+    assert_same(results)
+
+
+def test_drawdown_limits_take_effect(config, data):
+    # Losing streaks in the synthetic data hit the limit, so the parity above covers blocked / scaled entries
+    trades = {}
+    for risk_mode, overrides in RISK_MODES.items():
+        results = run_modes(apply_overrides(config, overrides), data, "rsi_reversal")
+        assert_same(results)
+        trades[risk_mode] = results["loop"]
+    assert trades["block"]["blocked_entries"] > 0
+    assert trades["block"]["num_trades"] < trades["report"]["num_trades"]
+    assert [t["pos_size"] for t in trades["scale"]["trades"]] != [t["pos_size"] for t in trades["report"]["trades"]]
+
+
+def hand_bars(rows):
+    """OHLC frame from ``(open, high, low, close)`` rows."""
+    return pd.DataFrame(rows, columns=["open", "high", "low", "close"], dtype="float64")
+
+
+@pytest.mark.parametrize("sig", [1, -1])
+def test_same_bar_sl_and_tp(config, sig):
+    # Bar 2 spans both the stop and the target of the entry on bar 0: the stop wins in every mode
+    data = hand_bars([(100, 100, 100, 100), (100, 100.5, 99.5, 100), (100, 110, 90, 100), (100, 100, 100, 100)])
+    signal = np.array([sig, 0, 0, 0])
+    sl = np.array([100 - 2 * sig, np.nan, np.nan, np.nan])
+    tp = np.array([100 + 4 * sig, np.nan, np.nan, np.nan])
+    results = run_modes(config, data, signal_engine=FixedSignals({"signal": signal, "sl": sl, "tp": tp}))
+    assert_same(results)
+    (trade,) = results["loop"]["trades"]
+    assert (trade["exit_idx"], trade["exit_reason"], trade["exit"]) == (2, "sl", 100 - 2 * sig)
+
+
+def test_entries_wait_for_the_previous_exit(config):
+    # The entry on bar 1 overlaps the open trade; the one on bar 3 comes after its exit on bar 2
+    data = hand_bars([(100, 100, 100, 100), (100, 101, 99.5, 100), (100, 105, 99, 104), (104, 104, 104, 104),
+                      (104, 104, 98, 99)])
+    signal = np.array([1, 1, 0, 1, 0])
+    results = run_modes(config, data, signal_engine=FixedSignals({"signal": signal}))
+    assert_same(results)
+    assert [(t["entry_idx"], t["exit_idx"], t["exit_reason"]) for t in results["loop"]["trades"]] == \
+           [(0, 2, "tp"), (3, 4, "sl")]
+
+
+def test_open_position_closes_on_the_last_bar(config):
+    data = hand_bars([(100, 100, 100, 100), (100, 100.5, 99.75, 100.25), (100.25, 100.5, 100, 100.5)])
+    results = run_modes(config, data, signal_engine=FixedSignals({"signal": np.array([-1, 0, 0])}))
+    assert_same(results)
+    (trade,) = results["loop"]["trades"]
+    assert (trade["exit_idx"], trade["exit_reason"], trade["exit"]) == (2, None, 100.5)
+
+
+def test_chunked_run_matches_single_frame(config, data):
+    engine = BacktestEngine(config, SignalEngine(config.strategy), RiskEngine(config.risk), None)
+    single = engine.run(data, strategy="rsi_cooldown", simulation="loop")
+    chunks = (data.iloc[i:i + 700] for i in range(0, len(data), 700))
+    chunked = engine.run_chunked(chunks, strategy="rsi_cooldown")
+    assert chunked["trades"] == single["trades"]
+    assert chunked["ending_balance"] == single["ending_balance"]
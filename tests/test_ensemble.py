@@ -0,0 +1,42 @@
+"""`app.ensemble.run_ensemble` kinds and members against single engine runs."""
+import pytest
+
+from app.ensemble import random_signals, run_ensemble
+from app.sweep import apply_overrides
+from benchmarks.check_ensemble import check
+from benchmarks.synthetic import generate_ohlcv
+
+
+@pytest.fixture(scope="module")
+def data():
+    return generate_ohlcv(1500, seed=2, with_dates=True)
+
+
+def test_random_signals(config):
+    assert random_signals(apply_overrides(config, {"strategy.name": "simple_random"}))
+    assert not random_signals(apply_overrides(config, {"strategy.name": "rsi_cooldown"}))
+    assert not random_signals(apply_overrides(config, {"strategy.name": "no_such_strategy"}))
+
+
+def test_seeds_of_a_random_strategy_vary(config, data):
+    config = apply_overrides(config, {"strategy.name": "simple_random"})
+    results = run_ensemble(config, 8, kind="seeds", data=data, seed=3, batch_size=3)
+    assert results["kind"] == "seeds"
+    assert results["runs"]["exposure"].nunique() > 1  # each seed enters on its own bar
+
+
+@pytest.mark.parametrize("with_data, fallback", [(True, "bootstrap"), (False, "random_walk")])
+def test_seeds_of_a_deterministic_strategy_fall_back(capsys, config, data, with_data, fallback):
+    config = apply_overrides(config, {"strategy.name": "rsi_reversal"})
+    results = run_ensemble(config, 6, kind="seeds", data=data if with_data else None, seed=3, bars=1500)
+    assert f"running a {fallback} ensemble instead" in capsys.readouterr().out
+    assert results["kind"] == fallback
+    assert results["distribution"].loc["total_pnl", "std"] > 0
+
+
+@pytest.mark.parametrize("kind", ["seeds", "bootstrap", "random_walk"])
+@pytest.mark.parametrize("strategy", ["simple_random", "rsi_reversal"])
+def test_members_match_engine_runs(config, data, strategy, kind):
+    trades, ran = check(apply_overrides(config, {"strategy.name": strategy}), data, kind, runs=5, batch_size=2, seed=4)
+    assert trades > 0
+    assert ran == ("bootstrap" if (strategy, kind) == ("rsi_reversal", "seeds") else kind)
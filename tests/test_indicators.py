@@ -0,0 +1,97 @@
+"""`core.indicators` against the pandas code it replaced, and streaming against batch forms."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.indicators import ATR, EMA, RSI, SMA, RollingMax, RollingMin, atr, ema, rolling_max, rolling_min, rsi, sma
+from core.signal_engine import SignalEngine
+
+
+def pandas_rsi(series, period=14, eps=None):
+    """The strategies' original `compute_rsi` (rsi_reversal added 1e-9 to the losses)."""
+    delta = series.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    rs = gain / loss if eps is None else gain / (loss + eps)
+    return 100 - (100 / (1 + rs))
+
+
+def assert_identical(actual, expected):
+    actual, expected = np.asarray(actual, dtype="float64"), np.asarray(expected, dtype="float64")
+    assert np.array_equal(np.isnan(actual), np.isnan(expected))
+    assert np.array_equal(actual[~np.isnan(actual)], expected[~np.isnan(expected)])
+
+
+@pytest.fixture(scope="module")
+def cents():
+    """1M cent-priced closes: not multiples of a binary fraction, so sums round on every step."""
+    rng = np.random.default_rng(11)
+    return pd.Series(25 + np.round(np.cumsum(rng.standard_normal(1_000_000)) * 0.01, 2).clip(0.01))
+
+
+@pytest.fixture(scope="module")
+def raw():
+    rng = np.random.default_rng(12)
+    close = 1e4 + np.cumsum(rng.standard_normal(20_000)) * 1.37
+    close[rng.random(len(close)) < 0.01] = np.nan
+    return close
+
+
+@pytest.mark.parametrize("period", [5, 14, 50])
+def test_sma_matches_pandas_rolling(cents, period):
+    assert_identical(sma(cents, period), cents.rolling(period).mean())
+
+
+@pytest.mark.parametrize("period", [14, 21])
+def test_rsi_matches_pandas(cents, period):
+    assert_identical(rsi(cents, period), pandas_rsi(cents, period))
+    assert_identical(rsi(cents, period, eps=1e-9), pandas_rsi(cents, period, eps=1e-9))
+
+
+@pytest.mark.parametrize("threshold", [30, 40])
+def test_rsi_threshold_decisions_match_pandas(cents, threshold):
+    assert np.array_equal(rsi(cents.to_numpy(), 14) < threshold, (pandas_rsi(cents, 14) < threshold).to_numpy())
+
+
+def test_fallback_signals_match_pandas(cents):
+    df = pd.DataFrame({"close": cents})
+    ma = df["close"].rolling(window=5).mean()
+    expected = np.where(df["close"] > ma, 1, np.where(df["close"] < ma, -1, 0))
+    assert np.array_equal(SignalEngine(None).generate_signals(df)["signal"].to_numpy(), expected)
+
+
+def test_nan_only_affects_its_windows(raw):
+    out = sma(raw, 10)
+    gap = int(np.flatnonzero(np.isnan(raw))[0])
+    assert np.isnan(out[gap:gap + 10]).all()
+    assert not np.isnan(out[-1]) or np.isnan(raw[-10:]).any()
+    assert_identical(out, pd.Series(raw).rolling(10).mean())
+
+
+@pytest.mark.parametrize("period", [1, 2, 14])
+@pytest.mark.parametrize("data", ["cents", "raw"])
+def test_streaming_matches_batch(request, data, period):
+    x = np.asarray(request.getfixturevalue(data), dtype="float64")[:50_000]
+    high, low = x + 0.37, x - 0.41
+    streams = [
+        (SMA(period), sma(x, period)),
+        (EMA(period), ema(x, period)),
+        (EMA(alpha=0.5), ema(x, alpha=0.5)),
+        (RSI(period), rsi(x, period)),
+        (RSI(period, method="wilder", eps=1e-9), rsi(x, period, method="wilder", eps=1e-9)),
+        (RollingMin(period), rolling_min(x, period)),
+        (RollingMax(period), rolling_max(x, period)),
+    ]
+    for indicator, expected in streams:
+        assert_identical([indicator.update(v) for v in x], expected)
+    for method in ("wilder", "simple"):
+        indicator = ATR(period, method)
+        assert_identical([indicator.update(*bar) for bar in zip(high, low, x)], atr(high, low, x, period, method))
+
+
+def test_streaming_sma_keeps_a_bounded_window(cents):
+    indicator = SMA(20)
+    for value in cents[:10_000]:
+        indicator.update(value)
+    assert len(indicator._window) == 20
+    assert indicator.value == cents[:10_000].rolling(20).mean().iloc[-1]
@@ -0,0 +1,58 @@
+"""Live mode: replay-only runs through `TradingSystemRunner.run_live` and the CLI checks."""
+import argparse
+import os
+
+import pytest
+
+import main
+from app.runner import TradingSystemRunner
+from app.sweep import apply_overrides
+from benchmarks.synthetic import generate_ohlcv
+
+
+@pytest.fixture
+def live_config(config):
+    return apply_overrides(config, {"strategy.name": "rsi_reversal", "strategy.params": {"rsi_period": 14, "rsi_entry": 30},
+                                    "exec.mode": "live"})
+
+
+@pytest.fixture
+def prices(tmp_path):
+    path = tmp_path / "bars.csv"
+    generate_ohlcv(2000, seed=5, with_dates=True).to_csv(path, index=False)
+    return str(path)
+
+
+def test_live_without_data_is_rejected(live_config):
+    runner = TradingSystemRunner(live_config, signal_cache=False)
+    with pytest.raises(ValueError, match="only replays a price file"):
+        runner.run_live(None)
+
+
+def test_live_replays_a_price_file(live_config, prices):
+    runner = TradingSystemRunner(live_config, signal_cache=False)
+    stats = runner.run_live(prices, start="2020-01-01 10:00")
+    assert stats["warmup_bars"] == 14
+    assert stats["ticks"] == 2000 - 600
+    assert stats["orders_sent"] > 0
+    assert stats["account_balance"] == pytest.approx(1000.0 + stats["realized_pnl"])
+
+
+def _args(**overrides):
+    args = dict(config="config/settings.yaml", mode="live", data=None, start=None, end=None, ensemble="seeds",
+                grid="config/sweep_grid.yaml", batch="config/batch.yaml")
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+def test_dry_run_flags_live_without_data(capsys, monkeypatch, prices):
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(main.__file__)))
+    assert not main.dry_run(_args())
+    assert "only replays a price file" in capsys.readouterr().out
+    assert main.dry_run(_args(data=prices))
+
+
+def test_cli_rejects_live_without_data(monkeypatch):
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(main.__file__)))
+    with pytest.raises(SystemExit, match="Config error: live mode only replays a price file"):
+        main.run(_args())
@@ -0,0 +1,134 @@
+"""`core.order_manager.OrderManager` brackets, coalescing and cancels against `MockTradovateServer`."""
+import pytest
+
+pytest.importorskip("requests")
+
+from core.execution_engine import ExecutionEngine
+from core.mock_tradovate import MockTradovateServer
+from core.order_manager import OrderManager
+
+BUY = {"symbol": "MESZ5", "action": "Buy", "quantity": 1}
+
+
+@pytest.fixture
+def server():
+    with MockTradovateServer() as server:
+        yield server
+
+
+@pytest.fixture
+def engine(server):
+    engine = ExecutionEngine(mode="paper", base_url=server.base_url, order_workers=4)
+    yield engine
+    engine.close()
+
+
+def test_bracket_goes_out_as_one_oso_request(server, engine):
+    manager = OrderManager(engine)
+    order = manager.submit(dict(BUY, sl=4990.0, tp=5020.0))
+    assert order.status == "pending" and not server.orders
+    manager.flush()
+    assert order.status == "working"
+    assert server.request_counts["/order/placeOSO"] == 1
+    assert "/order/placeorder" not in server.request_counts
+    entry, take_profit, stop_loss = server.orders
+    assert (order.order_id, order.bracket_ids) == (entry["orderId"], (take_profit["orderId"], stop_loss["orderId"]))
+    assert (take_profit["action"], take_profit["orderType"], take_profit["price"]) == ("Sell", "Limit", 5020.0)
+    assert (stop_loss["action"], stop_loss["orderType"], stop_loss["stopPrice"]) == ("Sell", "Stop", 4990.0)
+    assert take_profit["parentId"] == stop_loss["parentId"] == entry["orderId"]
+
+
+def test_short_bracket_exits_buy_back(server, engine):
+    manager = OrderManager(engine)
+    manager.submit({"symbol": "MESZ5", "action": "Sell", "quantity": 2, "sl": 5010.0})
+    manager.flush()
+    entry, stop_loss = server.orders
+    assert (stop_loss["action"], stop_loss["stopPrice"], stop_loss["orderQty"]) == ("Buy", 5010.0, 2)
+
+
+def test_orders_differing_only_in_quantity_are_coalesced(server, engine):
+    manager = OrderManager(engine)
+    buys = [manager.submit(dict(BUY, quantity=q)) for q in (1, 2, 3)]
+    sell = manager.submit(dict(BUY, action="Sell"))
+    bracket = manager.submit(dict(BUY, sl=4990.0))
+    manager.flush()
+    assert manager.stats()["requests"] == 3 and manager.coalesced == 2
+    assert server.request_counts["/order/placeorder"] == 2
+    assert server.request_counts["/order/placeOSO"] == 1
+    assert len({m.order_id for m in buys}) == 1
+    assert buys[0].batch == tuple(m.local_id for m in buys)
+    quantities = {o["orderId"]: o["orderQty"] for o in server.orders}
+    assert quantities[buys[0].order_id] == 6 and quantities[sell.order_id] == 1
+    assert bracket.status == sell.status == "working"
+
+
+def test_without_coalescing_every_order_is_a_request(server, engine):
+    manager = OrderManager(engine, coalesce=False)
+    for _ in range(3):
+        manager.submit(BUY)
+    manager.flush()
+    assert server.request_counts["/order/placeorder"] == 3
+    assert manager.coalesced == 0
+
+
+def test_cancelling_a_bracket_entry_cancels_its_exits(server, engine):
+    manager = OrderManager(engine)
+    order = manager.submit(dict(BUY, sl=4990.0, tp=5020.0))
+    manager.flush()
+    assert manager.cancel(order.local_id)
+    assert order.status == "cancelled" and not manager.open_orders()
+    assert set(server.order_status.values()) == {"Canceled"}
+
+
+def test_cancel_covers_the_whole_coalesced_batch(server, engine):
+    manager = OrderManager(engine)
+    first, second = manager.submit(BUY), manager.submit(BUY)
+    manager.flush()
+    assert manager.cancel(second.local_id)
+    assert first.status == second.status == "cancelled"
+    assert server.request_counts["/order/cancelorder"] == 1
+
+
+def test_filled_and_pending_orders_are_not_cancelled_at_the_broker(server, engine):
+    manager = OrderManager(engine)
+    filled = manager.submit(BUY)
+    manager.flush()
+    manager.mark_filled(filled.local_id)
+    assert not manager.cancel(filled.local_id)
+    assert filled.status == "filled"
+    pending = manager.submit(BUY)
+    assert manager.cancel(pending.local_id)
+    assert manager.flush() == []
+    assert "/order/cancelorder" not in server.request_counts
+    assert server.order_status == {filled.order_id: "Working"}
+
+
+def test_broker_side_cancel_refusal_keeps_the_order_working(server, engine):
+    manager = OrderManager(engine)
+    order = manager.submit(BUY)
+    manager.flush()
+    server.order_status[order.order_id] = "Filled"  # filled at the broker before the cancel arrived
+    assert not manager.cancel(order.local_id)
+    assert order.status == "working"
+
+
+def test_rejected_and_failed_orders(server, engine):
+    manager = OrderManager(engine)
+    server.fail_next("/order/placeorder", status=400)
+    rejected = manager.submit(BUY)
+    manager.flush()
+    server.fail_next("/order/placeorder", status=503)
+    failed = manager.submit(BUY)
+    manager.flush()
+    assert (rejected.status, failed.status) == ("rejected", "failed")
+    assert rejected.error and failed.error
+    assert manager.stats()["working"] == 0
+
+
+def test_backtest_engine_orders_are_simulated():
+    engine = ExecutionEngine(mode="backtest")
+    manager = OrderManager(engine)
+    order = manager.submit(dict(BUY, sl=4990.0))
+    manager.flush()
+    assert order.status == "simulated" and order.order_id is None
+    assert manager.cancel(order.local_id)
@@ -0,0 +1,111 @@
+"""`core.price_cache.PriceCache` entries, invalidation and concurrent readers / writers."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from benchmarks.synthetic import generate_ohlcv
+from core.data_loader import load_price_data
+from core.price_cache import PriceCache, cache_key
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "bars.csv"
+    generate_ohlcv(500, seed=3, with_dates=True).to_csv(path, index=False)
+    return str(path)
+
+
+def rewrite(path, seed):
+    """Replace the file (atomically, with a later mtime), as a saving editor would."""
+    mtime_ns = os.stat(path).st_mtime_ns + 1_000_000_000
+    tmp = f"{path}.new"
+    generate_ohlcv(500, seed=seed, with_dates=True).to_csv(tmp, index=False)
+    os.utime(tmp, ns=(mtime_ns, mtime_ns))
+    os.replace(tmp, path)
+
+
+def test_round_trip_is_read_only(tmp_path, source):
+    cache = PriceCache(str(tmp_path / "cache"))
+    parsed = load_price_data(source, cache_dir=cache.cache_dir)
+    cached = cache.get(source)
+    assert_frame_equal(cached.copy(), parsed, check_dtype=False)
+    assert not cached["close"].to_numpy().flags.writeable
+
+
+def test_put_keeps_an_existing_entry(tmp_path, source):
+    cache = PriceCache(str(tmp_path / "cache"))
+    df = load_price_data(source, cache_dir=cache.cache_dir)
+    first = cache.get(source)
+    entry = os.path.join(cache.cache_dir, cache_key(source))
+    inode = os.stat(entry).st_ino
+    assert cache.put(source, df)
+    assert os.stat(entry).st_ino == inode
+    assert_frame_equal(cache.get(source).copy(), first.copy())
+
+
+def test_stale_versions_are_dropped(tmp_path, source):
+    cache = PriceCache(str(tmp_path / "cache"))
+    old = load_price_data(source, cache_dir=cache.cache_dir)
+    cache.put_derived(source, "bars_5m", old[["close"]])
+    held = cache.get(source)  # mapped before the file changes
+    expected = held.copy()
+    rewrite(source, seed=4)
+    new = load_price_data(source, cache_dir=cache.cache_dir)
+    assert not new["close"].equals(old["close"])
+    assert [meta["key"] for meta in cache.list()] == [cache_key(source)]
+    assert cache.get_derived(source, "bars_5m") is None
+    assert_frame_equal(held.copy(), expected)  # removing an entry doesn't invalidate frames already loaded
+
+
+def test_list_skips_entries_in_flight(tmp_path, source):
+    cache = PriceCache(str(tmp_path / "cache"))
+    load_price_data(source, cache_dir=cache.cache_dir)
+    key = cache_key(source)
+    os.makedirs(os.path.join(cache.cache_dir, f"{key}.tmpabc"))
+    os.makedirs(os.path.join(cache.cache_dir, f"{key}.del1_2"))
+    assert [meta["key"] for meta in cache.list()] == [key]
+
+
+def test_unreadable_entry_is_a_miss(tmp_path, source):
+    cache = PriceCache(str(tmp_path / "cache"))
+    parsed = load_price_data(source, cache_dir=cache.cache_dir)
+    entry = os.path.join(cache.cache_dir, cache_key(source))
+    os.remove(os.path.join(entry, "col1.npy"))  # as if removed while being read
+    assert cache.get(source) is None
+    assert not os.path.exists(entry)
+    assert_frame_equal(load_price_data(source, cache_dir=cache.cache_dir), parsed)
+    assert cache.get(source) is not None
+
+
+def _load_repeatedly(source, cache_dir, rounds):
+    closes = []
+    for _ in range(rounds):
+        df = load_price_data(source, cache_dir=cache_dir)
+        closes.append(float(np.asarray(df["close"]).sum()))
+    return closes
+
+
+def test_concurrent_workers_on_a_cold_cache(tmp_path, source):
+    cache_dir = str(tmp_path / "cache")
+    expected = float(pd.read_csv(source)["close"].sum())
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(_load_repeatedly, source, cache_dir, 20) for _ in range(4)]
+        results = [f.result() for f in futures]
+    assert all(total == pytest.approx(expected) for closes in results for total in closes)
+    assert len(PriceCache(cache_dir).list()) == 1
+
+
+def test_concurrent_workers_while_the_source_changes(tmp_path, source):
+    cache_dir = str(tmp_path / "cache")
+    load_price_data(source, cache_dir=cache_dir)
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(_load_repeatedly, source, cache_dir, 20) for _ in range(3)]
+        rewrite(source, seed=5)
+        for f in futures:
+            f.result()  # no worker fails on an entry another one drops
+    expected = float(pd.read_csv(source)["close"].sum())
+    assert _load_repeatedly(source, cache_dir, 1) == [pytest.approx(expected)]
@@ -0,0 +1,48 @@
+"""`core.signal_cache.SignalCache` entries and eviction races."""
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.signal_cache import SignalCache
+
+
+def signals(n=50):
+    signal = np.zeros(n, dtype="int64")
+    signal[[3, 20]] = [1, -1]
+    sl = np.full(n, np.nan)
+    sl[[3, 20]] = [99.0, 101.0]
+    return pd.DataFrame({"signal": signal, "sl": sl})
+
+
+def test_round_trip(tmp_path):
+    cache = SignalCache(str(tmp_path))
+    frame = signals()
+    assert cache.put("k", frame)
+    cached = cache.get("k", len(frame))
+    assert np.array_equal(cached["signal"], frame["signal"].to_numpy())
+    assert np.array_equal(cached["sl"], frame["sl"].to_numpy(), equal_nan=True)
+    assert cache.get("k", len(frame) + 1) is None
+
+
+def test_entry_evicted_while_read_is_a_miss(tmp_path, monkeypatch):
+    cache = SignalCache(str(tmp_path))
+    cache.put("k", signals())
+
+    def evicted(path, *args, **kwargs):
+        raise FileNotFoundError(path)  # another process removed the entry after it was loaded
+
+    monkeypatch.setattr(os, "utime", evicted)
+    assert cache.get("k", 50) is None
+
+
+def test_eviction_keeps_recently_used_entries(tmp_path):
+    cache = SignalCache(str(tmp_path))
+    for key in "abc":
+        cache.put(key, signals())
+    old = os.stat(cache._path("a")).st_mtime - 10
+    for key in "ab":
+        os.utime(cache._path(key), (old, old))
+    cache.get("a", 50)  # touches the entry
+    assert cache.evict(max_bytes=cache.list()[0]["bytes"] * 2) == 1
+    assert sorted(e["key"] for e in cache.list()) == ["a", "c"]
@@ -0,0 +1,64 @@
+"""Array strategies against the original per-row implementations in `benchmarks.bench_strategies`."""
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_strategies import (_assert_columns_equal, _cooldown_params, _cooldown_systems,
+                                         reference_rsi_cooldown, reference_simple_random)
+from benchmarks.synthetic import generate_ohlcv
+from strategies import rsi_cooldown, simple_random
+
+SYSTEMS = _cooldown_systems()
+
+
+def float_walk(n, seed):
+    """Closes that aren't on any tick grid."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"close": 4000 + np.cumsum(rng.standard_normal(n)) * 0.731})
+
+
+@pytest.fixture(scope="module", params=["cents", "float"])
+def prices(request):
+    if request.param == "cents":
+        return generate_ohlcv(4000, seed=2, tick_size=0.01)
+    return float_walk(4000, seed=3)
+
+
+@pytest.mark.parametrize("label", list(SYSTEMS))
+def test_rsi_cooldown_matches_the_row_loop(prices, label):
+    system = SYSTEMS[label]
+    new = rsi_cooldown.generate_signals(prices, system=system, **_cooldown_params(system))
+    _assert_columns_equal(new, reference_rsi_cooldown(prices, system=system))
+    assert new["signal"].any()
+
+
+def test_simple_random_without_entries_matches_the_row_loop(prices):
+    _assert_columns_equal(simple_random.generate_signals(prices, entry_prob=0.0, seed=1),
+                          reference_simple_random(prices, entry_prob=0.0, seed=1))
+
+
+def test_simple_random_places_one_reproducible_entry(prices):
+    system = SYSTEMS["percent sl/tp"]
+    random.seed(5)
+    state = random.getstate()
+    new = simple_random.generate_signals(prices, system=system, entry_prob=0.02, seed=7)
+    pd.testing.assert_frame_equal(new, simple_random.generate_signals(prices, system=system, entry_prob=0.02, seed=7))
+    assert random.getstate() == state
+    (i,) = np.flatnonzero(new["signal"].to_numpy())
+    risk = system.risk.stop_loss_ticks * system.exec.tick_size
+    entry = float(prices["close"].iat[i])
+    assert (new.at[i, "sl"], new.at[i, "tp"]) == (entry - risk, entry + risk * system.risk.risk_to_reward)
+
+
+def test_simple_random_entry_bar_follows_the_per_row_draws():
+    # A per-row Bernoulli(p) scan first enters on bar k with probability (1 - p)^k * p
+    prob, n = 0.05, 60
+    df = float_walk(n, seed=4)
+    first = [np.flatnonzero(simple_random.generate_signals(df, entry_prob=prob, seed=s)["signal"].to_numpy())
+             for s in range(4000)]
+    assert np.mean([len(f) == 0 for f in first]) == pytest.approx((1 - prob) ** n, abs=0.02)
+    bars = np.array([f[0] for f in first if len(f)])
+    expected = [(1 - prob) ** k * prob for k in range(n)]
+    assert np.mean(bars) == pytest.approx(np.dot(range(n), expected) / sum(expected), rel=0.05)
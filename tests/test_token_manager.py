@@ -0,0 +1,98 @@
+"""`core.token_manager.TokenManager` expiry and background renewal against `MockTradovateServer`."""
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from core.execution_engine import ExecutionEngine
+from core.mock_tradovate import MockTradovateServer
+from core.token_manager import TokenManager
+from core.tradovate_client import TradovateClient
+
+ORDER = {"symbol": "MESZ5", "action": "Buy", "quantity": 1}
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def server():
+    with MockTradovateServer() as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    with TradovateClient(server.base_url, backoff_factor=0) as client:
+        yield client
+
+
+def test_start_caches_the_token_and_account(server, client):
+    tokens = TokenManager(client, lambda: {"name": "test"})
+    assert tokens.start()
+    try:
+        assert tokens.account_id == server.account_id
+        assert tokens.seconds_left == pytest.approx(server.token_ttl, abs=5)
+        for _ in range(5):
+            assert tokens.token and tokens.account_id  # reads never touch the network
+    finally:
+        tokens.stop()
+    assert server.request_counts == {"/auth/accesstokenrequest": 1, "/account/list": 1}
+
+
+def test_failed_authentication_starts_nothing(server, client):
+    server.fail_next("/auth/accesstokenrequest", status=401)
+    tokens = TokenManager(client, lambda: {"name": "test"})
+    assert not tokens.start()
+    assert tokens.token is None and tokens._thread is None
+
+
+def test_short_lived_tokens_are_renewed_before_they_lapse(client, server):
+    server.token_ttl = 0.6
+    tokens = TokenManager(client, lambda: {"name": "test"})
+    assert tokens.start()
+    try:
+        first = tokens.token
+        assert wait_for(lambda: tokens.renewals >= 3)
+        assert tokens.token != first and tokens.authentications == 1
+        assert tokens.seconds_left > 0
+        assert client.list_accounts(tokens.token).status_code == 200
+    finally:
+        tokens.stop()
+    assert server.request_counts["/auth/renewaccesstoken"] >= 3
+
+
+def test_revoked_token_falls_back_to_authentication(client, server):
+    tokens = TokenManager(client, lambda: {"name": "test"})
+    assert tokens.start()
+    try:
+        server.expire_tokens()
+        tokens.refresh_soon()
+        assert wait_for(lambda: tokens.authentications == 2)
+        assert tokens.renewals == 0  # the revoked token can't be renewed
+        assert client.list_accounts(tokens.token).status_code == 200
+    finally:
+        tokens.stop()
+
+
+def test_engine_recovers_from_an_expired_token(server):
+    engine = ExecutionEngine(mode="paper", base_url=server.base_url)
+    try:
+        assert engine.account_id == server.account_id
+        assert engine.execute(ORDER)["orderId"] == 1
+        server.expire_tokens()
+        rejected = engine.execute(ORDER)
+        assert rejected["status"] == 401  # ... which asks the token manager to renew in the background
+        assert wait_for(lambda: engine.tokens.authentications == 2)
+        assert engine.execute(ORDER)["orderId"] == 2
+    finally:
+        engine.close()
+    assert server.request_counts["/auth/accesstokenrequest"] == 2
+    assert server.request_counts["/account/list"] == 1
@@ -0,0 +1,61 @@
+"""`core.trade_ledger.TradeLedger` and the trades in backtest results."""
+import json
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import generate_ohlcv
+from core.backtest_engine import BacktestEngine
+from core.risk_engine import RiskEngine
+from core.signal_engine import SignalEngine
+from core.trade_ledger import TRADE_FIELDS, TradeLedger
+
+TRADES = [
+    {"entry_idx": 0, "exit_idx": 3, "entry": 100.0, "exit": 101.5, "pnl": 9.0, "pos_size": 1, "win": True, "exit_reason": "tp"},
+    {"entry_idx": 5, "exit_idx": 6, "entry": 101.0, "exit": 100.5, "pnl": -6.0, "pos_size": 2, "win": False, "exit_reason": "sl"},
+    {"entry_idx": 8, "exit_idx": 9, "entry": 100.0, "exit": 100.0, "pnl": 0.0, "pos_size": 1, "win": False, "exit_reason": None},
+]
+
+
+@pytest.fixture
+def result(config):
+    engine = BacktestEngine(config, SignalEngine(config.strategy), RiskEngine(config.risk), None)
+    return engine.run(generate_ohlcv(3000, seed=7, with_dates=True), strategy="rsi_reversal")
+
+
+def test_ledger_reads_back_as_trade_dicts():
+    ledger = TradeLedger.from_records(TRADES)
+    assert len(ledger) == 3 and ledger == TRADES
+    assert ledger[-1] == TRADES[-1] and ledger[1:] == TRADES[1:]
+    assert ledger.tolist() == TRADES
+    with pytest.raises(IndexError):
+        ledger[3]
+
+
+def test_ledger_grows_past_its_capacity():
+    ledger = TradeLedger(capacity=1)
+    for t in TRADES * 100:
+        ledger.append(t["entry_idx"], t["exit_idx"], t["entry"], t["exit"], t["pnl"], t["pos_size"], t["exit_reason"])
+    assert len(ledger) == 300 and ledger.capacity >= 300
+    assert ledger[::3] == [TRADES[0]] * 100
+
+
+def test_ledger_stats_are_columnar():
+    ledger = TradeLedger.from_records(TRADES)
+    assert ledger.to_frame().columns.tolist() == list(TRADE_FIELDS)
+    assert np.array_equal(ledger.equity(1000.0), [1000.0, 1009.0, 1003.0, 1003.0])
+    assert ledger.stats(1000.0, total_bars=10) == {
+        "num_trades": 3, "total_pnl": 3.0, "win_rate": 1 / 3, "avg_pnl": 1.0,
+        "max_drawdown": 6.0, "max_drawdown_pct": 6.0 / 1009.0, "exposure": 0.5,
+    }
+
+
+def test_result_trades_are_a_plain_list(result):
+    trades = result["trades"]
+    assert type(trades) is list and trades
+    assert all(type(t) is dict and tuple(t) == TRADE_FIELDS for t in trades)
+    assert json.loads(json.dumps(trades)) == trades
+    trades.append(dict(trades[-1]))  # callers can extend it as before
+    assert isinstance(result["ledger"], TradeLedger)
+    assert result["ledger"] == trades[:-1]
+    assert result["num_trades"] == len(result["ledger"])
@@ -0,0 +1,88 @@
+"""`core.tradovate_client` connection reuse, retries and timeouts against `MockTradovateServer`."""
+import asyncio
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from core.mock_tradovate import MockTradovateServer
+from core.tradovate_client import AsyncTradovateClient, TradovateClient
+
+ORDER = {"accountId": 12345, "action": "Buy", "symbol": "MESZ5", "orderQty": 1, "orderType": "Market"}
+
+
+@pytest.fixture
+def server():
+    with MockTradovateServer() as server:
+        yield server
+
+
+def token(client):
+    return client.authenticate({"name": "test"}).json()["accessToken"]
+
+
+def test_calls_share_one_keep_alive_connection(server):
+    with TradovateClient(server.base_url, backoff_factor=0) as client:
+        access = token(client)
+        for _ in range(10):
+            assert client.list_accounts(access).status_code == 200
+            assert client.place_order(access, ORDER).status_code == 200
+    assert server.request_counts["/order/placeorder"] == 10
+    assert server.connections == 1
+
+
+def test_get_is_retried_on_server_errors(server):
+    with TradovateClient(server.base_url, max_retries=3, backoff_factor=0) as client:
+        access = token(client)
+        server.fail_next("/account/list", times=2, status=503)
+        response = client.list_accounts(access)
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == server.account_id
+    assert server.request_counts["/account/list"] == 3
+
+
+def test_get_retries_are_bounded(server):
+    with TradovateClient(server.base_url, max_retries=2, backoff_factor=0) as client:
+        access = token(client)
+        server.fail_next("/account/list", times=5, status=503)
+        assert client.list_accounts(access).status_code == 503
+    assert server.request_counts["/account/list"] == 3
+
+
+def test_orders_are_not_resent_after_a_server_error(server):
+    with TradovateClient(server.base_url, max_retries=3, backoff_factor=0) as client:
+        access = token(client)
+        server.fail_next("/order/placeorder", times=1, status=503)
+        assert client.place_order(access, ORDER).status_code == 503
+        assert client.place_order(access, ORDER).status_code == 200
+    assert server.request_counts["/order/placeorder"] == 2
+    assert len(server.orders) == 1
+
+
+def test_slow_replies_time_out(server):
+    with TradovateClient(server.base_url, timeout=(1.0, 0.05), max_retries=2, backoff_factor=0) as client:
+        access = token(client)
+        server.latency = 0.3
+        with pytest.raises(requests.Timeout):
+            client.place_order(access, ORDER)
+        assert server.request_counts["/order/placeorder"] == 1  # a POST that may have arrived isn't resent
+        with pytest.raises(requests.RequestException):
+            client.list_accounts(access)
+        assert server.request_counts["/account/list"] == 3  # GETs are retried on read timeouts
+
+
+def test_async_client_runs_calls_concurrently(server):
+    server.latency = 0.05
+    client = TradovateClient(server.base_url, pool_maxsize=4)
+    async_client = AsyncTradovateClient(client, max_workers=4)
+
+    async def place_all():
+        access = (await async_client.authenticate({"name": "test"})).json()["accessToken"]
+        return await asyncio.gather(*(async_client.place_order(access, dict(ORDER)) for _ in range(8)))
+
+    try:
+        replies = asyncio.run(place_all())
+    finally:
+        async_client.close()  # closes `client` too
+    assert sorted(r.json()["orderId"] for r in replies) == list(range(1, 9))
+    assert server.connections <= 4